@@ -0,0 +1,46 @@
+"""
+Compare encode/decode time and output size of the JSON backends in src.utils.
+
+Usage:
+    python -m benchmarks.bench_json_backend [days]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.generators import generate_weather_document
+from src.utils import JSON_BACKENDS, get_json_backend, load_json, save_to_json
+
+
+def best_of(func, repeat: int = 3) -> float:
+    """Return the best wall time of ``repeat`` calls to ``func()``."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(days: int = 500_000) -> None:
+    document = generate_weather_document(days)
+    print(f"Payload: {days} daily entries")
+    print(f"{'backend':<10} {'mode':<8} {'encode':>9} {'decode':>9} {'size':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "weather.json")
+        for backend in JSON_BACKENDS:
+            try:
+                get_json_backend(backend)
+            except ImportError:
+                print(f"{backend:<10} (not installed)")
+                continue
+            for pretty in (True, False):
+                encode = best_of(lambda: save_to_json(document, path, pretty=pretty, backend=backend))
+                decode = best_of(lambda: load_json(path, backend=backend))
+                mode = "pretty" if pretty else "compact"
+                print(f"{backend:<10} {mode:<8} {encode:8.2f}s {decode:8.2f}s {os.path.getsize(path) / 1e6:7.1f}MB")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000)
@@ -0,0 +1,44 @@
+"""
+Compare the BeautifulSoup extractors of task1 with the incremental fast path.
+
+Usage:
+    python -m benchmarks.bench_task1_extract [paragraphs]
+"""
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+from benchmarks.generators import generate_article_html
+from src.task1_scrape import extract_first_sentence, extract_page_fields, extract_title
+
+
+def soup_extract(html: str) -> dict:
+    """Extract both fields through a full BeautifulSoup tree."""
+    soup = BeautifulSoup(html, 'html.parser')
+    return {"title": extract_title(soup), "first_sentence": extract_first_sentence(soup)}
+
+
+def best_of(func, html: str, repeat: int = 5) -> float:
+    """Return the best wall time of ``repeat`` runs of ``func(html)``."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(html)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(paragraphs: int = 2000) -> None:
+    html = generate_article_html(paragraphs)
+    assert soup_extract(html) == extract_page_fields(html)
+
+    soup_time = best_of(soup_extract, html)
+    fast_time = best_of(extract_page_fields, html)
+    print(f"Article size: {len(html) / 1e6:.2f} MB")
+    print(f"BeautifulSoup:  {soup_time * 1000:9.2f} ms")
+    print(f"Fast path:      {fast_time * 1000:9.2f} ms ({soup_time / fast_time:.0f}x faster)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,43 @@
+"""
+Measure the throughput of the task6 extractors on a synthetic report.
+
+Usage:
+    python -m benchmarks.bench_task6_extract [days]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.generators import write_report_file
+from src.task6_extract_weather_data import extract_weather_data, iter_weather_records
+
+
+def throughput(label: str, run, size: int, repeat: int = 3) -> None:
+    """Time the best of ``repeat`` calls to ``run()`` and print MB/s and records/s."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = run()
+        timings.append(time.perf_counter() - start)
+    elapsed = min(timings)
+    print(f"{label:<28} {elapsed:7.2f} s  {size / 1e6 / elapsed:7.1f} MB/s  {count / elapsed / 1e6:5.2f} M records/s")
+
+
+def main(days: int = 1_000_000) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_report_file(os.path.join(tmp, "weather_report.txt"), days)
+        size = os.path.getsize(path)
+        print(f"Report: {days} lines, {size / 1e6:.1f} MB")
+
+        def consume(records) -> int:
+            # Drain the iterator without keeping the records
+            return sum(1 for _ in records)
+
+        throughput("extract_weather_data", lambda: len(extract_weather_data(path)), size)
+        throughput("iter_weather_records (lines)", lambda: consume(iter_weather_records(path, use_mmap=False)), size)
+        throughput("iter_weather_records (mmap)", lambda: consume(iter_weather_records(path)), size)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
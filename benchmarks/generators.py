@@ -0,0 +1,204 @@
+"""
+Deterministic synthetic data generators for the benchmarks.
+"""
+import datetime
+import json
+import random
+
+
+def generate_article_html(paragraphs: int = 2000, seed: int = 0) -> str:
+    """
+    Generate a large Wikipedia-like article page.
+
+    The page has a site header with navigation links, a title heading, a body
+    with many cited paragraphs inside ``mw-parser-output`` and a long footer.
+
+    Args:
+        paragraphs (int): The number of body paragraphs.
+        seed (int): The random seed, so the same arguments give the same page.
+
+    Returns:
+        str: The HTML of the page.
+    """
+    rng = random.Random(seed)
+    words = ["data", "web", "scraping", "extraction", "content", "bots", "pages", "server",
+             "parser", "markup", "crawler", "index", "archive", "request", "response"]
+
+    def sentence() -> str:
+        text = " ".join(rng.choice(words) for _ in range(rng.randint(8, 20)))
+        return text.capitalize() + "." + f"<sup class=\"reference\"><a href=\"#cite_note-{rng.randint(1, 99)}\">[{rng.randint(1, 99)}]</a></sup>"
+
+    nav = "".join(f'<li><a href="/wiki/Link_{i}">Link {i}</a></li>' for i in range(500))
+    body = "".join(f"<p>{' '.join(sentence() for _ in range(5))}</p>\n" for _ in range(paragraphs))
+    footer = "".join(f'<li><a href="/wiki/Category:{i}">Category {i}</a></li>' for i in range(500))
+    return (
+        "<!DOCTYPE html><html><head><title>Web scraping - Wikipedia</title>"
+        "<style>.mw-parser-output .hatnote{font-style:italic}</style></head><body>"
+        f"<nav><ul>{nav}</ul></nav>"
+        '<h1 id="firstHeading" class="firstHeading"><span class="mw-page-title-main">Web scraping</span></h1>'
+        '<div id="bodyContent"><div class="mw-content-ltr mw-parser-output" lang="en">'
+        '<div class="hatnote">For broader coverage, see <a href="/wiki/Data_scraping">Data scraping</a>.</div>'
+        '<p class="mw-empty-elt">\n</p>'
+        "<p><b>Web scraping</b>, <b>web harvesting</b>, or <b>web data extraction</b> is "
+        '<a href="/wiki/Data_scraping">data scraping</a> used for extracting data from websites.'
+        '<sup class="reference"><a href="#cite_note-1">[1]</a></sup> Web scraping software may directly access the '
+        "World Wide Web.</p>\n"
+        f"{body}</div></div>"
+        f"<footer><ul>{footer}</ul></footer></body></html>"
+    )
+
+
+_FIRST_DAY = datetime.date(1900, 1, 1).toordinal()
+# 10M days run past 9999-12-31, so long series start over at 1900-01-01
+_DAY_SPAN = datetime.date.max.toordinal() - _FIRST_DAY + 1
+
+
+def _iso_date(offset: int) -> str:
+    """Return the ISO date ``offset`` days after 1900-01-01, wrapping after 9999-12-31."""
+    return datetime.date.fromordinal(_FIRST_DAY + offset % _DAY_SPAN).isoformat()
+
+
+def generate_report_lines(days: int, seed: int = 0):
+    """
+    Generate ``weather_report.txt``-shaped lines, one per day from 1900-01-01.
+
+    Args:
+        days (int): The number of lines to generate.
+        seed (int): The random seed, so the same arguments give the same lines.
+
+    Yields:
+        str: One report line, including the trailing newline.
+    """
+    rng = random.Random(seed)
+    for offset in range(days):
+        date = _iso_date(offset)
+        max_temp = round(rng.uniform(5, 38), 1)
+        min_temp = round(max_temp - rng.uniform(2, 12), 1)
+        yield (f"Date: {date}, Max Temp: {max_temp}°C, Min Temp: {min_temp}°C, "
+               f"Humidity: {rng.randint(30, 95)}%, Precipitation: {round(rng.choice([0.0, 0.0, rng.uniform(0, 30)]), 1)}mm\n")
+
+
+def write_report_file(path: str, days: int, seed: int = 0) -> str:
+    """
+    Write a synthetic text report with ``days`` lines to ``path``.
+
+    Args:
+        path (str): The file to write.
+        days (int): The number of lines.
+        seed (int): The random seed.
+
+    Returns:
+        str: The path of the written file.
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        f.writelines(generate_report_lines(days, seed))
+    return path
+
+
+DESCRIPTIONS = ("Clear sky", "Sunny", "Partly cloudy", "Overcast", "Light rain", "Moderate rain", "Heavy rain")
+
+
+def generate_daily_records(days: int, seed: int = 0):
+    """
+    Generate ``daily`` entries shaped like those in ``tokyo_weather_complex.json``.
+
+    Args:
+        days (int): The number of days, starting at 1900-01-01.
+        seed (int): The random seed, so the same arguments give the same records.
+
+    Yields:
+        dict: One day of weather data.
+    """
+    rng = random.Random(seed)
+    for offset in range(days):
+        max_temp = round(rng.uniform(5, 38), 1)
+        precipitation = round(rng.choice([0.0, 0.0, rng.uniform(0, 30)]), 1)
+        yield {
+            "date": _iso_date(offset),
+            "max_temperature": max_temp,
+            "min_temperature": round(max_temp - rng.uniform(2, 12), 1),
+            "precipitation": precipitation,
+            "wind_speed": round(rng.uniform(0, 30), 1),
+            "humidity": rng.randint(30, 95),
+            "weather_description": rng.choice(DESCRIPTIONS[4:] if precipitation else DESCRIPTIONS[:4]),
+        }
+
+
+def generate_weather_document(days: int, seed: int = 0) -> dict:
+    """
+    Generate a ``tokyo_weather_complex.json``-shaped document.
+
+    Args:
+        days (int): The number of entries in ``daily``.
+        seed (int): The random seed.
+
+    Returns:
+        dict: The document.
+    """
+    return {
+        "city": "Tokyo",
+        "latitude": 35.6895,
+        "longitude": 139.6917,
+        "timezone": "Asia/Tokyo",
+        "daily": list(generate_daily_records(days, seed)),
+    }
+
+
+def write_weather_json(path: str, days: int, seed: int = 0) -> str:
+    """
+    Write a ``tokyo_weather_complex.json``-shaped file with ``days`` entries.
+
+    Entries are written one at a time, so documents larger than memory can be generated.
+
+    Args:
+        path (str): The file to write.
+        days (int): The number of entries in ``daily``.
+        seed (int): The random seed.
+
+    Returns:
+        str: The path of the written file.
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{"city": "Tokyo", "latitude": 35.6895, "longitude": 139.6917, '
+                '"timezone": "Asia/Tokyo", "daily": [')
+        for index, record in enumerate(generate_daily_records(days, seed)):
+            f.write((",\n" if index else "\n") + json.dumps(record))
+        f.write("\n]}\n")
+    return path
+
+
+def generate_weather_xml_days(days: int, seed: int = 0):
+    """
+    Generate the ``<day>`` elements of a ``weather_data.xml``-shaped document.
+
+    Args:
+        days (int): The number of days, starting at 1900-01-01.
+        seed (int): The random seed, so the same arguments give the same elements.
+
+    Yields:
+        str: One ``<day>`` element, including the trailing newline.
+    """
+    for record in generate_daily_records(days, seed):
+        yield (f"    <day>\n        <date>{record['date']}</date>\n"
+               f"        <temperature>{record['max_temperature']}</temperature>\n"
+               f"        <humidity>{record['humidity']}</humidity>\n"
+               f"        <precipitation>{record['precipitation']}</precipitation>\n    </day>\n")
+
+
+def write_weather_xml(path: str, days: int, seed: int = 0) -> str:
+    """
+    Write a ``weather_data.xml``-shaped file with ``days`` days.
+
+    Args:
+        path (str): The file to write.
+        days (int): The number of days.
+        seed (int): The random seed.
+
+    Returns:
+        str: The path of the written file.
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("<weather>\n")
+        f.writelines(generate_weather_xml_days(days, seed))
+        f.write("</weather>\n")
+    return path
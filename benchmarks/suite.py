@@ -0,0 +1,307 @@
+"""
+Benchmark suite covering the hot path of every task, with recorded baselines.
+
+Each benchmark is timed at one or more sizes (the number of days, or of
+paragraphs for the task1 HTML extractors) on deterministic synthetic data.
+Results can be recorded as baselines and later checked against them: a
+benchmark that gets slower than its baseline by more than the tolerance
+makes the run exit with status 1.
+
+Usage:
+    python -m benchmarks.suite                      # 1K and 1M, print timings
+    python -m benchmarks.suite --sizes 1K 1M 10M    # include the 10M run
+    python -m benchmarks.suite --sizes 100K --only task1   # the largest size of the HTML extractors
+    python -m benchmarks.suite --check              # fail on regressions
+    python -m benchmarks.suite --record             # update the baselines
+    python -m benchmarks.suite --only task5 task6   # benchmarks whose name starts with a prefix
+
+Every benchmark that streams its input runs at 10M. Those that hold all
+days (or the whole parsed page) in memory stop at a ``max_size``, where
+they still have a baseline. Baselines are wall-clock times from one
+machine, so record them on the machine that runs the checks.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.generators import (generate_article_html, generate_daily_records, write_report_file,
+                                   write_weather_json, write_weather_xml)
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+SIZES = {"1K": 1_000, "100K": 100_000, "1M": 1_000_000, "10M": 10_000_000}
+DEFAULT_SIZES = ("1K", "1M")
+DEFAULT_TOLERANCE = 0.5
+# Absolute slack in seconds, so sub-millisecond benchmarks do not fail on timer noise
+NOISE_FLOOR = 0.005
+
+# name -> (setup, max_size); setup(size, workdir) returns the callable to time
+BENCHMARKS: Dict[str, tuple] = {}
+
+
+def benchmark(name: str, max_size: Optional[int] = None):
+    """
+    Register a benchmark.
+
+    Args:
+        name (str): The name of the benchmark, prefixed with its task.
+        max_size (int, optional): The largest size the benchmark runs at, for
+            benchmarks whose input does not fit in memory at 10M.
+    """
+    def register(setup: Callable[[int, str], Callable[[], object]]):
+        BENCHMARKS[name] = (setup, max_size)
+        return setup
+    return register
+
+
+class _Inputs:
+    """Synthetic input files and in-memory days, generated once per size."""
+
+    def __init__(self, workdir: str) -> None:
+        self.workdir = workdir
+        self._days: Dict[int, list] = {}
+
+    def path(self, kind: str, size: int) -> str:
+        writers = {"txt": write_report_file, "xml": write_weather_xml, "json": write_weather_json}
+        path = os.path.join(self.workdir, f"weather_{size}.{kind}")
+        if not os.path.exists(path):
+            writers[kind](path, size)
+        return path
+
+    def days(self, size: int) -> list:
+        if size not in self._days:
+            self._days = {size: list(generate_daily_records(size))}
+        return self._days[size]
+
+
+_inputs: Optional[_Inputs] = None
+
+
+# BeautifulSoup's tree takes about 17 KB per paragraph
+@benchmark("task1.extract_bs4", max_size=100_000)
+def _bench_extract_bs4(size: int, workdir: str):
+    from bs4 import BeautifulSoup
+    from src.task1_scrape import extract_first_sentence, extract_title
+    html = generate_article_html(paragraphs=size)
+
+    def run():
+        soup = BeautifulSoup(html, 'html.parser')
+        return extract_title(soup), extract_first_sentence(soup)
+    return run
+
+
+# The page alone is about 800 bytes per paragraph
+@benchmark("task1.extract_page_fields", max_size=1_000_000)
+def _bench_extract_page_fields(size: int, workdir: str):
+    from src.task1_scrape import extract_page_fields
+    html = generate_article_html(paragraphs=size)
+    return lambda: extract_page_fields(html)
+
+
+@benchmark("task3.analyze_daily_weather", max_size=1_000_000)
+def _bench_analyze_daily_weather(size: int, workdir: str):
+    from src.task3_complex_weather_analysis import analyze_daily_weather
+    days = _inputs.days(size)
+    return lambda: [analyze_daily_weather(day) for day in days]
+
+
+@benchmark("task4.summarize_weather_data", max_size=1_000_000)
+def _bench_summarize_weather_data(size: int, workdir: str):
+    from src.task4_weather_summary_export import summarize_weather_data
+    days = _inputs.days(size)
+    return lambda: summarize_weather_data(days)
+
+
+@benchmark("task4.export_to_csv")
+def _bench_export_to_csv(size: int, workdir: str):
+    from src.task4_weather_summary_export import export_to_csv
+    path = os.path.join(workdir, "summary.csv")
+    if size > 1_000_000:
+        # Too many days to hold in memory: the timing includes generating them
+        return lambda: export_to_csv(generate_daily_records(size), path)
+    days = _inputs.days(size)
+    return lambda: export_to_csv(days, path)
+
+
+@benchmark("task4.summarize_weather_data.stream")
+def _bench_summarize_weather_data_stream(size: int, workdir: str):
+    from src.task4_weather_summary_export import summarize_weather_data
+    # The single-pass summary never holds the days: the timing includes generating them
+    return lambda: summarize_weather_data(generate_daily_records(size))
+
+
+@benchmark("task5.iter_weather_xml")
+def _bench_iter_weather_xml(size: int, workdir: str):
+    from src.task5_parse_weather_xml import iter_weather_xml
+    path = _inputs.path("xml", size)
+    return lambda: deque(iter_weather_xml(path), maxlen=0)
+
+
+@benchmark("task5.parse_weather_xml", max_size=1_000_000)
+def _bench_parse_weather_xml(size: int, workdir: str):
+    from src.task5_parse_weather_xml import parse_weather_xml
+    path = _inputs.path("xml", size)
+    return lambda: parse_weather_xml(path)
+
+
+@benchmark("task6.extract_weather_data", max_size=1_000_000)
+def _bench_extract_weather_data(size: int, workdir: str):
+    from src.task6_extract_weather_data import extract_weather_data
+    path = _inputs.path("txt", size)
+    return lambda: extract_weather_data(path)
+
+
+@benchmark("task6.iter_weather_records")
+def _bench_iter_weather_records(size: int, workdir: str):
+    from src.task6_extract_weather_data import iter_weather_records
+    path = _inputs.path("txt", size)
+    return lambda: deque(iter_weather_records(path), maxlen=0)
+
+
+@benchmark("utils.load_json", max_size=1_000_000)
+def _bench_load_json(size: int, workdir: str):
+    from src.utils import load_json
+    path = _inputs.path("json", size)
+    return lambda: load_json(path)
+
+
+@benchmark("utils.save_to_json", max_size=1_000_000)
+def _bench_save_to_json(size: int, workdir: str):
+    from src.utils import save_to_json
+    document = {"city": "Tokyo", "daily": _inputs.days(size)}
+    path = os.path.join(workdir, "saved.json")
+    return lambda: save_to_json(document, path)
+
+
+def time_benchmark(run: Callable[[], object], repeat: int) -> float:
+    """Return the best wall time of ``repeat`` calls to ``run()``."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run_suite(sizes: List[str], only: Optional[List[str]] = None, repeat: int = 5,
+              workdir: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+    """
+    Run the selected benchmarks at the given sizes.
+
+    Sizes of 1M and more are timed once instead of ``repeat`` times.
+
+    Args:
+        sizes (list of str): Size labels from ``SIZES``.
+        only (list of str, optional): Run only benchmarks whose name starts with one of these prefixes.
+        repeat (int): The number of timed calls at small sizes.
+        workdir (str, optional): The directory for generated inputs; a temporary one by default.
+
+    Returns:
+        dict: Maps each benchmark name to ``{size label: seconds}``.
+    """
+    global _inputs
+    results: Dict[str, Dict[str, float]] = {}
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        _inputs = _Inputs(tmp)
+        try:
+            for label in sizes:
+                size = SIZES[label]
+                for name, (setup, max_size) in BENCHMARKS.items():
+                    if only and not any(name.startswith(prefix) for prefix in only):
+                        continue
+                    if max_size is not None and size > max_size:
+                        continue
+                    run = setup(size, tmp)
+                    elapsed = time_benchmark(run, repeat if size < 1_000_000 else 1)
+                    results.setdefault(name, {})[label] = elapsed
+                    print(f"{name:<36} {label:>4} {elapsed:10.4f} s", flush=True)
+        finally:
+            _inputs = None
+    return results
+
+
+def load_baselines(path: str = BASELINE_FILE) -> Dict[str, Dict[str, float]]:
+    """Load the recorded baselines, or an empty dict if none were recorded."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)["results"]
+    except FileNotFoundError:
+        return {}
+
+
+def _size_of(label: str) -> int:
+    return SIZES.get(label, 0)
+
+
+def save_baselines(results: Dict[str, Dict[str, float]], path: str = BASELINE_FILE) -> None:
+    """Merge ``results`` into the baseline file, recording the machine they come from."""
+    baselines = load_baselines(path)
+    for name, timings in results.items():
+        baselines.setdefault(name, {}).update({label: round(seconds, 6) for label, seconds in timings.items()})
+    document = {
+        "machine": {"python": platform.python_version(), "platform": platform.platform(),
+                    "processor": platform.processor() or platform.machine(), "cpus": os.cpu_count()},
+        "results": {name: {label: baselines[name][label] for label in sorted(baselines[name], key=_size_of)}
+                    for name in sorted(baselines)},
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=2)
+        f.write("\n")
+
+
+def find_regressions(results: Dict[str, Dict[str, float]], baselines: Dict[str, Dict[str, float]],
+                     tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """
+    Compare results with the baselines.
+
+    Args:
+        results (dict): The output of ``run_suite``.
+        baselines (dict): The output of ``load_baselines``.
+        tolerance (float): The allowed slowdown, e.g. 0.5 for 50%.
+
+    Returns:
+        list of str: One message per benchmark slower than its baseline allows.
+    """
+    regressions = []
+    for name, timings in results.items():
+        for label, seconds in timings.items():
+            baseline = baselines.get(name, {}).get(label)
+            if baseline is not None and seconds > baseline * (1 + tolerance) + NOISE_FLOOR:
+                regressions.append(f"{name} @ {label}: {seconds:.4f} s vs baseline {baseline:.4f} s "
+                                   f"({seconds / baseline:.2f}x)")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the benchmark suite.")
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(DEFAULT_SIZES))
+    parser.add_argument("--only", nargs="+", help="run only benchmarks whose name starts with these prefixes")
+    parser.add_argument("--repeat", type=int, default=5, help="timed calls per benchmark below 1M")
+    parser.add_argument("--check", action="store_true", help="exit with status 1 on a regression")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown before --check fails (default: 0.5 = 50%%)")
+    parser.add_argument("--record", action="store_true", help="save the results as the new baselines")
+    parser.add_argument("--baselines", default=BASELINE_FILE, help="the baseline file")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.sizes, args.only, args.repeat)
+    if args.record:
+        save_baselines(results, args.baselines)
+        print(f"Baselines saved to {args.baselines}")
+    if args.check:
+        regressions = find_regressions(results, load_baselines(args.baselines), args.tolerance)
+        for message in regressions:
+            print(f"REGRESSION {message}", file=sys.stderr)
+        if regressions:
+            return 1
+        print("No regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,29 @@
 """
 MLDS Week 1 - Data Collection and Processing
 Python package for web scraping, API data collection, and weather data analysis.
+
+Submodules are imported on first attribute access (PEP 562), so
+``import src`` stays cheap and ``src.task1_scrape`` only pays for requests
+and bs4 when it is actually used.
 """
+import importlib
 
 __version__ = "1.0.0"
+
+_SUBMODULES = (
+    "arrow_export", "async_http", "async_pipeline", "climatology", "downsampling", "http_cache",
+    "http_client", "incremental", "instrumentation", "multi_station", "parse_cache", "pipeline", "records",
+    "utils",
+    "task1_scrape", "task2_fetch_tokyo_weather", "task3_complex_weather_analysis",
+    "task4_weather_summary_export", "task5_parse_weather_xml", "task6_extract_weather_data",
+)
+
+
+def __getattr__(name: str):
+    if name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_SUBMODULES))
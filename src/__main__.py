@@ -0,0 +1,80 @@
+"""
+Command-line entry point: ``python -m src run`` runs tasks 1-6 as one pipeline.
+"""
+import argparse
+import sys
+import time
+from typing import List, Optional
+
+from .incremental import DEFAULT_STATE_FILE
+from .pipeline import default_tasks, dependencies, format_timings, run_pipeline
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Parse the command line and run the requested command.
+
+    Args:
+        argv (list of str, optional): The arguments. Defaults to ``sys.argv[1:]``.
+
+    Returns:
+        int: The exit status, 1 if any task failed.
+    """
+    parser = argparse.ArgumentParser(prog="python -m src", description="Run the data collection tasks.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the tasks as a dependency graph")
+    run_parser.add_argument("tasks", nargs="*", help="the tasks to run (default: all)")
+    run_parser.add_argument("--output-dir", default=".", help="directory the outputs are written to")
+    run_parser.add_argument("--workers", type=int, default=4, help="maximum number of tasks running at once")
+    run_parser.add_argument("--force", action="store_true", help="run tasks even if their outputs are up to date")
+    run_parser.add_argument("--incremental", action="store_true", help="only process days added since the last run")
+    run_parser.add_argument("--state-file", default=DEFAULT_STATE_FILE, help="progress file for incremental runs")
+    run_parser.add_argument("--no-cache", action="store_true", help="do not use the on-disk HTTP cache")
+    run_parser.add_argument("--no-parse-cache", action="store_true", help="re-parse the input files on every run")
+    run_parser.add_argument("--async", dest="use_async", action="store_true",
+                            help="fetch on an asyncio event loop with aiohttp (bypasses the HTTP cache)")
+
+    commands.add_parser("list", help="list the tasks and their dependencies")
+    args = parser.parse_args(argv)
+
+    tasks = default_tasks(getattr(args, "output_dir", "."))
+    if args.command == "list":
+        for name, depends_on in dependencies(tasks).items():
+            print(f"{name}: {', '.join(depends_on) or '-'}")
+        return 0
+
+    if args.tasks:
+        unknown = sorted(set(args.tasks) - {task.name for task in tasks})
+        if unknown:
+            parser.error(f"unknown task(s): {', '.join(unknown)}")
+        tasks = [task for task in tasks if task.name in args.tasks]
+
+    cache = None
+    if not args.no_cache:
+        from .http_cache import HTTPCache
+        cache = HTTPCache()
+    parse_cache = None
+    if not args.no_parse_cache:
+        from .parse_cache import ParseCache
+        parse_cache = ParseCache()
+
+    start = time.perf_counter()
+    if args.use_async:
+        import asyncio
+        from concurrent.futures import ThreadPoolExecutor
+        from .async_pipeline import run_pipeline_async
+
+        with ThreadPoolExecutor(args.workers) as executor:
+            results = asyncio.run(run_pipeline_async(
+                tasks, force=args.force, incremental=args.incremental, state_file=args.state_file,
+                parse_cache=parse_cache, executor=executor))
+    else:
+        results = run_pipeline(tasks, max_workers=args.workers, force=args.force, incremental=args.incremental,
+                               state_file=args.state_file, cache=cache, parse_cache=parse_cache)
+    print(format_timings(results, time.perf_counter() - start))
+    return 1 if any(result.status in ("failed", "blocked") for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""
+Typed columnar export (Parquet and Arrow IPC / Feather) shared by the task exporters.
+
+pyarrow is an optional dependency: it is only imported when a columnar file
+is written, and ``arrow_available`` lets callers check for it up front.
+"""
+import datetime
+from itertools import islice
+from typing import Any, Iterable, List, Sequence, Tuple
+
+FILE_FORMATS = ("parquet", "feather")
+
+# Column types understood by write_table; each names a pyarrow type factory
+_COLUMN_TYPES = ("date32", "float32", "int32", "bool_", "string")
+
+
+def arrow_available() -> bool:
+    """
+    Check whether pyarrow is installed.
+
+    Returns:
+        bool: True if columnar files can be written.
+    """
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError("Parquet and Feather export require the 'pyarrow' package")
+    return pyarrow
+
+
+def _to_array(pa, values: List[Any], name: str, column_type: str):
+    """Convert one column of Python values into a typed pyarrow array."""
+    if column_type == "date32":
+        values = [datetime.date.fromisoformat(value) if isinstance(value, str) else value for value in values]
+    elif column_type == "int32":
+        # pyarrow would silently truncate 65.5 to 65
+        bad = next((value for value in values if isinstance(value, float) and not value.is_integer()), None)
+        if bad is not None:
+            raise ValueError(f"Column '{name}' is int32 but has the non-integral value {bad}")
+    return pa.array(values, type=getattr(pa, column_type)())
+
+
+def write_table(rows: Iterable[Sequence[Any]], columns: Sequence[Tuple[str, str]], filename: str,
+                file_format: str = "parquet", batch_size: int = 65536) -> None:
+    """
+    Write rows to a Parquet or Arrow IPC (Feather v2) file with typed columns.
+
+    Rows are converted and written in record batches of ``batch_size``, so any
+    iterable can be exported with bounded memory.
+
+    Args:
+        rows (iterable of sequence): The rows to write, one value per column.
+        columns (list of tuple): ``(name, type)`` pairs, where type is one of
+            ``date32``, ``float32``, ``int32``, ``bool_`` or ``string``.
+        filename (str): The name of the file to write.
+        file_format (str): Either ``parquet`` or ``feather``.
+        batch_size (int): The number of rows per record batch.
+
+    Raises:
+        ValueError: If the file format or a column type is unknown, or an
+            ``int32`` column has a non-integral value.
+        ImportError: If pyarrow is not installed.
+        IOError: If there is an error writing to the file.
+    """
+    if file_format not in FILE_FORMATS:
+        raise ValueError(f"Unknown file format '{file_format}', expected one of {', '.join(FILE_FORMATS)}")
+    for name, column_type in columns:
+        if column_type not in _COLUMN_TYPES:
+            raise ValueError(f"Unknown type '{column_type}' for column '{name}'")
+
+    pa = _import_pyarrow()
+    schema = pa.schema([(name, getattr(pa, column_type)()) for name, column_type in columns])
+    if file_format == "parquet":
+        import pyarrow.parquet as pq
+        writer = pq.ParquetWriter(filename, schema)
+    else:
+        import pyarrow.ipc
+        writer = pyarrow.ipc.new_file(filename, schema)
+
+    rows = iter(rows)
+    try:
+        with writer:
+            while True:
+                batch = list(islice(rows, batch_size))
+                if not batch:
+                    break
+                arrays = [_to_array(pa, list(values), name, column_type)
+                          for values, (name, column_type) in zip(zip(*batch), columns)]
+                writer.write_batch(pa.record_batch(arrays, schema=schema))
+    except OSError as e:
+        raise IOError(f"Error writing to file '{filename}': {e}")
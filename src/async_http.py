@@ -0,0 +1,158 @@
+"""
+Shared asyncio HTTP client for the network-bound tasks: one pooled
+``aiohttp`` session, a semaphore bounding the requests in flight and the same
+retry policy as ``http_client.get_with_retry``.
+
+aiohttp is an optional dependency: it is only imported when a client is
+opened, and ``aiohttp_available`` lets callers check for it up front.
+"""
+import json
+from typing import TYPE_CHECKING, Any, Optional, Tuple
+
+if __package__:
+    from .http_client import RETRY_STATUSES, USER_AGENT
+else:
+    from http_client import RETRY_STATUSES, USER_AGENT
+
+# asyncio alone costs more to import than the rest of a task module
+if TYPE_CHECKING:
+    import asyncio
+
+    import aiohttp
+
+
+def aiohttp_available() -> bool:
+    """
+    Check whether aiohttp is installed.
+
+    Returns:
+        bool: True if ``AsyncHTTPClient`` can be used.
+    """
+    try:
+        import aiohttp  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _import_aiohttp():
+    try:
+        import aiohttp
+    except ImportError:
+        raise ImportError("The async HTTP client requires the 'aiohttp' package")
+    return aiohttp
+
+
+class AsyncHTTPClient:
+    """
+    Pooled asyncio HTTP client, used as ``async with AsyncHTTPClient() as client``.
+
+    The delay before attempt ``n`` (starting at 1) is ``backoff * 2 ** (n - 1)``;
+    a request does not hold its concurrency slot while it waits to retry.
+
+    Args:
+        max_concurrency (int): The maximum number of requests in flight.
+        pool_size (int): The maximum number of pooled connections. Defaults
+            to ``max_concurrency``.
+        retries (int): The number of retries after the first attempt.
+        backoff (float): The base delay in seconds between attempts.
+        timeout (float): The timeout in seconds for each attempt.
+    """
+
+    def __init__(self, max_concurrency: int = 10, pool_size: Optional[int] = None, retries: int = 3,
+                 backoff: float = 0.5, timeout: float = 10) -> None:
+        self.max_concurrency = max_concurrency
+        self.pool_size = pool_size or max_concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self._session: Optional["aiohttp.ClientSession"] = None
+        self._semaphore: Optional["asyncio.Semaphore"] = None
+
+    async def __aenter__(self) -> "AsyncHTTPClient":
+        import asyncio
+
+        aiohttp = _import_aiohttp()
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.pool_size),
+            headers={"User-Agent": USER_AGENT},
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the session and its pooled connections."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def get(self, url: str, **kwargs) -> Tuple[bytes, Optional[str]]:
+        """
+        Send a GET request, retrying network errors and retryable status codes.
+
+        Args:
+            url (str): The URL to fetch.
+            **kwargs: Additional keyword arguments passed to ``ClientSession.get``.
+
+        Returns:
+            tuple: The response body and its declared charset, if any.
+
+        Raises:
+            RuntimeError: If the client is not open.
+            aiohttp.ClientResponseError: If the final attempt returned an unsuccessful status code.
+            aiohttp.ClientError: If the final attempt failed with a network error.
+            asyncio.TimeoutError: If the final attempt timed out.
+        """
+        if self._session is None:
+            raise RuntimeError("AsyncHTTPClient must be opened with 'async with' before use")
+        import asyncio
+
+        aiohttp = _import_aiohttp()
+        for attempt in range(self.retries + 1):
+            if attempt:
+                await asyncio.sleep(self.backoff * 2 ** (attempt - 1))
+            try:
+                async with self._semaphore:
+                    async with self._session.get(url, **kwargs) as response:
+                        if response.status in RETRY_STATUSES and attempt < self.retries:
+                            continue
+                        response.raise_for_status()
+                        return await response.read(), response.charset
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt == self.retries:
+                    raise
+
+    async def get_text(self, url: str, **kwargs) -> str:
+        """
+        Fetch a URL and decode the body as text.
+
+        Args:
+            url (str): The URL to fetch.
+            **kwargs: Additional keyword arguments passed to ``ClientSession.get``.
+
+        Returns:
+            str: The response body, decoded with its charset (UTF-8 by default).
+        """
+        content, charset = await self.get(url, **kwargs)
+        return content.decode(charset or "utf-8", errors="replace")
+
+    async def get_json(self, url: str, **kwargs) -> Any:
+        """
+        Fetch a URL and decode the body as JSON.
+
+        Args:
+            url (str): The URL to fetch.
+            **kwargs: Additional keyword arguments passed to ``ClientSession.get``.
+
+        Returns:
+            Any: The decoded JSON document.
+
+        Raises:
+            json.JSONDecodeError: If the body is not valid JSON.
+        """
+        content, _ = await self.get(url, **kwargs)
+        return json.loads(content)
@@ -0,0 +1,161 @@
+"""
+Run the pipeline on an asyncio event loop.
+
+The network tasks (1 and 2) run as coroutines on one shared
+``AsyncHTTPClient``, so their requests overlap without a thread each, and the
+CPU-bound parsing and file tasks run in an executor. The dependency handling
+and results are those of ``pipeline.run_pipeline``.
+
+Requires the optional aiohttp package.
+"""
+import asyncio
+import time
+from concurrent.futures import Executor
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence
+
+if __package__:
+    from .async_http import AsyncHTTPClient
+    from .incremental import DEFAULT_STATE_FILE
+    from .pipeline import Task, TaskResult, dependencies
+    from .task1_scrape import WIKIPEDIA_URL, afetch_wikipedia_page, extract_page_fields
+    from .task2_fetch_tokyo_weather import OPEN_METEO_URL, afetch_weather_data
+    from .utils import save_to_json
+else:
+    from async_http import AsyncHTTPClient
+    from incremental import DEFAULT_STATE_FILE
+    from pipeline import Task, TaskResult, dependencies
+    from task1_scrape import WIKIPEDIA_URL, afetch_wikipedia_page, extract_page_fields
+    from task2_fetch_tokyo_weather import OPEN_METEO_URL, afetch_weather_data
+    from utils import save_to_json
+
+
+async def scrape_page(url: str, client: AsyncHTTPClient, executor: Optional[Executor] = None) -> Dict[str, str]:
+    """
+    Fetch a Wikipedia page and extract its title and first sentence.
+
+    The extraction runs in ``executor``, so the event loop keeps serving other
+    requests while the page is parsed.
+
+    Args:
+        url (str): The URL of the page.
+        client (AsyncHTTPClient): The open client to fetch with.
+        executor (Executor, optional): Runs the parsing; the loop's default
+            thread pool if not given. A process pool parses pages in parallel.
+
+    Returns:
+        dict: The ``title`` and ``first_sentence`` of the page.
+    """
+    html = await afetch_wikipedia_page(url, client)
+    return await asyncio.get_running_loop().run_in_executor(executor, extract_page_fields, html)
+
+
+async def scrape_pages(urls: Iterable[str], client: AsyncHTTPClient,
+                       executor: Optional[Executor] = None) -> Dict[str, Dict[str, str]]:
+    """
+    Scrape many Wikipedia pages, parsing each page as soon as it arrives.
+
+    Fetches are bounded by the client's concurrency limit; pages that have
+    arrived are parsed while the others are still downloading.
+
+    Args:
+        urls (iterable of str): The URLs of the pages.
+        client (AsyncHTTPClient): The open client to fetch with.
+        executor (Executor, optional): Runs the parsing; see ``scrape_page``.
+
+    Returns:
+        dict: Maps each URL to its ``title`` and ``first_sentence``, in input order.
+
+    Raises:
+        aiohttp.ClientError: If a page failed after all retries.
+    """
+    urls = list(urls)
+    fields = await asyncio.gather(*(scrape_page(url, client, executor) for url in urls))
+    return dict(zip(urls, fields))
+
+
+async def _arun_task1(task: Task, options: Dict[str, Any]) -> None:
+    loop = asyncio.get_running_loop()
+    fields = await scrape_page(options["wikipedia_url"], options["client"], options["executor"])
+    await loop.run_in_executor(options["executor"], lambda: save_to_json(fields, task.outputs[0], pretty=True))
+
+
+async def _arun_task2(task: Task, options: Dict[str, Any]) -> None:
+    loop = asyncio.get_running_loop()
+    weather_data = await afetch_weather_data(options["client"], options["weather_url"])
+    await loop.run_in_executor(options["executor"], lambda: save_to_json(weather_data, task.outputs[0], pretty=True))
+
+
+# Tasks with a coroutine here run on the event loop; the others run their
+# ``Task.action`` in the executor
+ASYNC_ACTIONS: Dict[str, Callable[[Task, Dict[str, Any]], Awaitable[None]]] = {
+    "task1": _arun_task1,
+    "task2": _arun_task2,
+}
+
+
+async def run_pipeline_async(tasks: Sequence[Task], max_concurrency: int = 10, force: bool = False,
+                             incremental: bool = False, state_file: str = DEFAULT_STATE_FILE,
+                             parse_cache: Any = None, executor: Optional[Executor] = None,
+                             wikipedia_url: str = WIKIPEDIA_URL,
+                             weather_url: str = OPEN_METEO_URL) -> List[TaskResult]:
+    """
+    Run the tasks in dependency order on the running event loop.
+
+    Every task starts as soon as its dependencies have run or were skipped.
+    If a task fails, the tasks that depend on it are reported as ``blocked``
+    and the rest of the graph still runs.
+
+    Args:
+        tasks (list of Task): The tasks to run.
+        max_concurrency (int): The maximum number of HTTP requests in flight.
+        force (bool): Run tasks even when their outputs are up to date.
+        incremental (bool): Run the file tasks in incremental mode.
+        state_file (str): The file holding the progress of incremental runs.
+        parse_cache (ParseCache, optional): The cache of parsed inputs shared by the file tasks.
+        executor (Executor, optional): Runs the file tasks and the parsing;
+            the loop's default thread pool if not given.
+        wikipedia_url (str): The page scraped by task 1.
+        weather_url (str): The forecast endpoint queried by task 2.
+
+    Returns:
+        list of TaskResult: One result per task, in the order the tasks were given.
+
+    Raises:
+        ImportError: If aiohttp is not installed.
+    """
+    graph = dependencies(tasks)
+    loop = asyncio.get_running_loop()
+    async with AsyncHTTPClient(max_concurrency=max_concurrency) as client:
+        options = {
+            "incremental": incremental,
+            "state_file": state_file,
+            # The on-disk HTTP cache is synchronous; async fetches always go to the network
+            "cache": None,
+            "parse_cache": parse_cache,
+            "client": client,
+            "executor": executor,
+            "wikipedia_url": wikipedia_url,
+            "weather_url": weather_url,
+        }
+        futures: Dict[str, "asyncio.Future[TaskResult]"] = {}
+
+        async def execute(task: Task) -> TaskResult:
+            states = [(await futures[dependency]).status for dependency in graph[task.name]]
+            if any(status in ("failed", "blocked") for status in states):
+                return TaskResult(task.name, "blocked")
+            if not force and task.is_up_to_date():
+                return TaskResult(task.name, "skipped")
+            start = time.perf_counter()
+            try:
+                if task.name in ASYNC_ACTIONS:
+                    await ASYNC_ACTIONS[task.name](task, options)
+                else:
+                    await loop.run_in_executor(executor, task.action, task, options)
+            except Exception as e:
+                return TaskResult(task.name, "failed", time.perf_counter() - start, e)
+            return TaskResult(task.name, "ran", time.perf_counter() - start)
+
+        # Every future exists before any task starts awaiting its dependencies
+        for task in tasks:
+            futures[task.name] = asyncio.ensure_future(execute(task))
+        return list(await asyncio.gather(*futures.values()))
@@ -0,0 +1,356 @@
+"""
+Rolling-window and climatology analytics on top of the task 3 columnar analysis.
+
+Every function works on whole columns in a fixed number of NumPy passes, so
+multi-decade daily histories cost O(n) array work rather than a Python loop
+per window:
+
+- rolling means and counts use cumulative sums, with each window's first day
+  found by a binary search over the day numbers, so windows are calendar
+  windows even when days are missing;
+- heatwaves are runs of consecutive hot days found from the edges of the
+  ``is_hot_day`` flags;
+- anomalies are deviations from a day-of-year climatology built with one
+  ``bincount`` and smoothed over a circular window of calendar days.
+
+Values may be 1-D (one station) or 2-D with one column per station sharing
+the same dates, so thousands of stations are processed in the same passes.
+"""
+from typing import TYPE_CHECKING, Any, Dict, Optional, Sequence, Tuple, Union
+
+if __package__:
+    from .task3_complex_weather_analysis import analyze_weather_columns
+else:
+    from task3_complex_weather_analysis import analyze_weather_columns
+
+# NumPy is only imported by the functions that use it
+if TYPE_CHECKING:
+    import numpy as np
+
+DEFAULT_WINDOWS = (7, 30, 365)
+DEFAULT_HEATWAVE_DAYS = 3
+DEFAULT_SMOOTHING_DAYS = 15
+
+# The flags of analyze_weather_columns counted over the rolling windows, with their column prefix
+COUNTED_FLAGS = (("is_hot_day", "hot_days"), ("is_windy_day", "windy_days"),
+                 ("is_uncomfortable_day", "uncomfortable_days"))
+
+# Day-of-year slots follow a leap year, so 29 February has its own slot and
+# every other date keeps the same slot in every year
+_DAYS_IN_LEAP_YEAR = 366
+_MONTH_OFFSETS = (0, 31, 60, 91, 121, 152, 182, 213, 244, 274, 305, 335)
+
+
+def day_numbers(dates: Sequence[Any]) -> "np.ndarray":
+    """
+    Convert dates into strictly increasing day numbers.
+
+    Args:
+        dates (sequence): ISO date strings, dates or datetime64 values, in order.
+
+    Returns:
+        numpy.ndarray: Days since 1970-01-01, as int64.
+
+    Raises:
+        ValueError: If the dates are not strictly increasing.
+    """
+    import numpy as np
+
+    days = np.asarray(dates, dtype="datetime64[D]").astype(np.int64)
+    if np.any(np.diff(days) <= 0):
+        raise ValueError("dates must be strictly increasing")
+    return days
+
+
+def day_of_year_slots(dates: Sequence[Any]) -> "np.ndarray":
+    """
+    Map dates to their day-of-year slot, 0-365, in a leap-year calendar.
+
+    Args:
+        dates (sequence): ISO date strings, dates or datetime64 values.
+
+    Returns:
+        numpy.ndarray: One slot per date; 1 March is slot 60 in every year.
+    """
+    import numpy as np
+
+    days = np.asarray(dates, dtype="datetime64[D]")
+    months = days.astype("datetime64[M]")
+    month_index = (months.astype(np.int64) % 12)
+    day_index = (days - months).astype(np.int64)
+    return np.asarray(_MONTH_OFFSETS)[month_index] + day_index
+
+
+def _window_starts(days: "np.ndarray", window: int) -> "np.ndarray":
+    """Return, for every day, the index of the first day of the ``window`` calendar days ending on it."""
+    import numpy as np
+
+    return np.searchsorted(days, days - (window - 1), side="left")
+
+
+def _as_float(values: Any) -> "np.ndarray":
+    import numpy as np
+
+    return np.asarray(values, dtype=np.float64)
+
+
+def rolling_sums(dates: Sequence[Any], values: Any, window: int) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Sum the values over a trailing window of calendar days.
+
+    Args:
+        dates (sequence): The dates of the values, strictly increasing.
+        values (array-like): One value per date, or one row per date with one
+            column per station. NaN values are skipped.
+        window (int): The window length in calendar days, including the current day.
+
+    Returns:
+        tuple: The window sums and the number of non-NaN values in each window,
+        both with the shape of ``values``.
+
+    Raises:
+        ValueError: If ``window`` is less than 1 or the dates are not increasing.
+    """
+    import numpy as np
+
+    if window < 1:
+        raise ValueError("window must be at least 1 day")
+    days = day_numbers(dates)
+    values = _as_float(values)
+    if len(values) != len(days):
+        raise ValueError("values must have one entry per date")
+    observed = ~np.isnan(values)
+    # Shifting by the mean keeps the cumulative sums small, so the differences stay accurate
+    offset = np.nanmean(values, axis=0) if observed.any() else 0.0
+    offset = np.nan_to_num(offset)
+    zeros = np.zeros((1,) + values.shape[1:])
+    sums = np.concatenate([zeros, np.cumsum(np.where(observed, values - offset, 0.0), axis=0)])
+    counts = np.concatenate([zeros, np.cumsum(observed, axis=0)])
+    starts = _window_starts(days, window)
+    ends = np.arange(1, len(days) + 1)
+    window_counts = counts[ends] - counts[starts]
+    return sums[ends] - sums[starts] + window_counts * offset, window_counts
+
+
+def rolling_mean(dates: Sequence[Any], values: Any, window: int,
+                 min_periods: Optional[int] = None) -> "np.ndarray":
+    """
+    Average the values over a trailing window of calendar days.
+
+    Args:
+        dates (sequence): The dates of the values, strictly increasing.
+        values (array-like): One value per date, or one row per date with one
+            column per station. NaN values are skipped.
+        window (int): The window length in calendar days, including the current day.
+        min_periods (int, optional): The number of values a window needs for a
+            mean. Defaults to ``window``, so windows with missing days or
+            before the first full window are NaN.
+
+    Returns:
+        numpy.ndarray: The means, with the shape of ``values``.
+
+    Raises:
+        ValueError: If ``window`` is less than 1 or the dates are not increasing.
+    """
+    import numpy as np
+
+    sums, counts = rolling_sums(dates, values, window)
+    required = window if min_periods is None else max(min_periods, 1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(counts >= required, sums / counts, np.nan)
+
+
+def find_heatwaves(dates: Sequence[Any], is_hot_day: Sequence[bool],
+                   min_days: int = DEFAULT_HEATWAVE_DAYS) -> Dict[str, "np.ndarray"]:
+    """
+    Find the runs of at least ``min_days`` consecutive hot days.
+
+    Consecutive means consecutive calendar days: a missing day ends a run.
+
+    Args:
+        dates (sequence): The dates, strictly increasing.
+        is_hot_day (sequence of bool): The ``is_hot_day`` flag of each date.
+        min_days (int): The shortest run that counts as a heatwave.
+
+    Returns:
+        dict: ``start`` and ``end`` (indices of the first and last day of each
+        heatwave, in date order) and ``days`` (their lengths).
+
+    Raises:
+        ValueError: If ``min_days`` is less than 1 or the dates are not increasing.
+    """
+    import numpy as np
+
+    if min_days < 1:
+        raise ValueError("min_days must be at least 1")
+    days = day_numbers(dates)
+    hot = np.asarray(is_hot_day, dtype=bool)
+    # A run starts at a hot day whose previous day is not hot or not the previous calendar day
+    continues = np.zeros(len(hot), dtype=bool)
+    continues[1:] = hot[1:] & hot[:-1] & (np.diff(days) == 1)
+    starts = np.flatnonzero(hot & ~continues)
+    ends = np.flatnonzero(hot & ~np.append(continues[1:], False))
+    lengths = ends - starts + 1
+    keep = lengths >= min_days
+    return {"start": starts[keep], "end": ends[keep], "days": lengths[keep]}
+
+
+def heatwave_mask(dates: Sequence[Any], is_hot_day: Sequence[bool],
+                  min_days: int = DEFAULT_HEATWAVE_DAYS) -> "np.ndarray":
+    """
+    Flag the days that belong to a heatwave.
+
+    Args:
+        dates (sequence): The dates, strictly increasing.
+        is_hot_day (sequence of bool): The ``is_hot_day`` flag of each date.
+        min_days (int): The shortest run that counts as a heatwave.
+
+    Returns:
+        numpy.ndarray: One boolean per date.
+    """
+    import numpy as np
+
+    heatwaves = find_heatwaves(dates, is_hot_day, min_days)
+    # +1 at each start and -1 after each end; the running total is 1 inside a heatwave
+    edges = np.zeros(len(is_hot_day) + 1, dtype=np.int64)
+    np.add.at(edges, heatwaves["start"], 1)
+    np.add.at(edges, heatwaves["end"] + 1, -1)
+    return np.cumsum(edges[:-1]) > 0
+
+
+def day_of_year_climatology(dates: Sequence[Any], values: Any,
+                            smoothing: int = DEFAULT_SMOOTHING_DAYS) -> "np.ndarray":
+    """
+    Compute the mean value of every day of the year.
+
+    Args:
+        dates (sequence): The dates of the values.
+        values (array-like): One value per date, or one row per date with one
+            column per station. NaN values are skipped.
+        smoothing (int): Average each day of the year with its neighbours over
+            this many calendar days (odd, centred, wrapping around the new
+            year); 1 disables smoothing.
+
+    Returns:
+        numpy.ndarray: 366 rows, one per day-of-year slot (see
+        ``day_of_year_slots``), with the columns of ``values``. Slots without
+        any value are NaN.
+
+    Raises:
+        ValueError: If ``smoothing`` is not a positive odd number.
+    """
+    import numpy as np
+
+    if smoothing < 1 or smoothing % 2 == 0:
+        raise ValueError("smoothing must be a positive odd number of days")
+    slots = day_of_year_slots(dates)
+    values = _as_float(values)
+    observed = ~np.isnan(values)
+    stations = int(np.prod(values.shape[1:], dtype=np.int64))
+    # One bincount over (slot, station) pairs covers every station at once
+    bins = (slots[:, None] * stations + np.arange(stations)).ravel()
+    size = _DAYS_IN_LEAP_YEAR * stations
+    sums = np.bincount(bins, np.where(observed, values, 0.0).ravel(), size).reshape(-1, stations)
+    counts = np.bincount(bins, observed.ravel(), size).reshape(-1, stations)
+    if smoothing > 1:
+        half = smoothing // 2
+        # Circular moving sum of both sums and counts, so every value keeps its weight
+        kernel_sums = np.concatenate([sums[-half:], sums, sums[:half]])
+        kernel_counts = np.concatenate([counts[-half:], counts, counts[:half]])
+        cumulative_sums = np.concatenate([np.zeros((1, sums.shape[1])), np.cumsum(kernel_sums, axis=0)])
+        cumulative_counts = np.concatenate([np.zeros((1, sums.shape[1])), np.cumsum(kernel_counts, axis=0)])
+        sums = cumulative_sums[smoothing:] - cumulative_sums[:-smoothing]
+        counts = cumulative_counts[smoothing:] - cumulative_counts[:-smoothing]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        climatology = np.where(counts > 0, sums / counts, np.nan)
+    return climatology.reshape((_DAYS_IN_LEAP_YEAR,) + values.shape[1:])
+
+
+def anomalies(dates: Sequence[Any], values: Any, climatology: Optional["np.ndarray"] = None,
+              base_period: Optional[Tuple[int, int]] = None,
+              smoothing: int = DEFAULT_SMOOTHING_DAYS) -> "np.ndarray":
+    """
+    Subtract the day-of-year climatology from the values.
+
+    Args:
+        dates (sequence): The dates of the values.
+        values (array-like): One value per date, or one row per date with one
+            column per station.
+        climatology (numpy.ndarray, optional): A precomputed result of
+            ``day_of_year_climatology``, e.g. from a longer history.
+        base_period (tuple of int, optional): The first and last year of the
+            reference period the climatology is computed from, when it is not
+            given. Defaults to the whole history.
+        smoothing (int): See ``day_of_year_climatology``.
+
+    Returns:
+        numpy.ndarray: The anomalies, with the shape of ``values``.
+    """
+    import numpy as np
+
+    values = _as_float(values)
+    if climatology is None:
+        if base_period is not None:
+            years = np.asarray(dates, dtype="datetime64[Y]").astype(np.int64) + 1970
+            in_base = (years >= base_period[0]) & (years <= base_period[1])
+            climatology = day_of_year_climatology(np.asarray(dates)[in_base], values[in_base], smoothing)
+        else:
+            climatology = day_of_year_climatology(dates, values, smoothing)
+    return values - climatology[day_of_year_slots(dates)]
+
+
+def analyze_climatology(daily: Union[Sequence[Dict[str, Any]], Dict[str, Sequence[Any]], Any],
+                        temp_threshold: float = 30, wind_threshold: float = 15,
+                        humidity_threshold: float = 70, windows: Sequence[int] = DEFAULT_WINDOWS,
+                        fields: Sequence[str] = ("max_temperature",),
+                        heatwave_days: int = DEFAULT_HEATWAVE_DAYS,
+                        base_period: Optional[Tuple[int, int]] = None,
+                        smoothing: int = DEFAULT_SMOOTHING_DAYS) -> Dict[str, "np.ndarray"]:
+    """
+    Extend the columnar daily analysis with rolling, heatwave and anomaly columns.
+
+    On top of the columns of ``analyze_weather_columns`` (computed with the
+    same thresholds), adds for every window ``w`` and field ``f``:
+
+    - ``{f}_mean_{w}d``: the trailing ``w``-day mean of the field;
+    - ``hot_days_{w}d``, ``windy_days_{w}d``, ``uncomfortable_days_{w}d``:
+      the number of flagged days in the trailing window;
+
+    and for every field ``{f}_anomaly``, the deviation from its day-of-year
+    climatology, plus ``in_heatwave`` for the days of a run of at least
+    ``heatwave_days`` consecutive hot days.
+
+    Args:
+        daily: The daily weather, in any form accepted by ``analyze_weather_columns``,
+            sorted by date.
+        temp_threshold (float): The temperature threshold to determine a hot day.
+        wind_threshold (float): The wind speed threshold to determine a windy day.
+        humidity_threshold (float): The humidity threshold to determine uncomfortable weather.
+        windows (sequence of int): The rolling window lengths in calendar days.
+        fields (sequence of str): The numeric fields to average and compare with their climatology.
+        heatwave_days (int): The shortest run of hot days that counts as a heatwave.
+        base_period (tuple of int, optional): The reference years of the climatology.
+        smoothing (int): See ``day_of_year_climatology``.
+
+    Returns:
+        dict: A mapping of analysis field name to a NumPy array.
+
+    Raises:
+        ValueError: If the dates are not strictly increasing.
+    """
+    import numpy as np
+
+    analysis = analyze_weather_columns(daily, temp_threshold, wind_threshold, humidity_threshold)
+    # Parse the dates once rather than in every window
+    dates = np.asarray(analysis["date"], dtype="datetime64[D]")
+    result = dict(analysis)
+    for window in windows:
+        for field in fields:
+            result[f"{field}_mean_{window}d"] = rolling_mean(dates, analysis[field], window)
+        for flag, name in COUNTED_FLAGS:
+            # The sums are exact integers up to rounding of the cumulative sums
+            result[f"{name}_{window}d"] = np.rint(rolling_sums(dates, analysis[flag], window)[0]).astype(np.int64)
+    for field in fields:
+        result[f"{field}_anomaly"] = anomalies(dates, analysis[field], base_period=base_period, smoothing=smoothing)
+    result["in_heatwave"] = heatwave_mask(dates, analysis["is_hot_day"], heatwave_days)
+    return result
@@ -0,0 +1,192 @@
+"""
+Reduce long daily series to a bounded number of chart points.
+
+Two tools keep the amount of data sent to the browser independent of the
+history length:
+
+- ``aggregate`` rolls days up into weekly, monthly or yearly means and sums,
+  with ``choose_period`` picking the finest period that fits a point budget;
+- ``lttb_indices`` (Largest-Triangle-Three-Buckets) and ``minmax_indices``
+  select a subset of the raw points that preserves the visual shape of a line,
+  including its peaks, for when daily resolution is requested anyway.
+"""
+from typing import TYPE_CHECKING, Any, Mapping, Sequence
+
+# NumPy and pandas are only imported by the functions that use them
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+DEFAULT_MAX_POINTS = 2000
+
+# (name, pandas frequency, approximate length in days), finest first
+PERIODS = (
+    ("daily", "D", 1.0),
+    ("weekly", "W", 7.0),
+    ("monthly", "MS", 30.44),
+    ("yearly", "YS", 365.25),
+)
+DOWNSAMPLING_METHODS = ("lttb", "minmax")
+
+
+def choose_period(days: int, max_points: int = DEFAULT_MAX_POINTS) -> str:
+    """
+    Pick the finest aggregation period that keeps a chart within ``max_points``.
+
+    Args:
+        days (int): The number of days covered by the chart.
+        max_points (int): The largest number of points to draw.
+
+    Returns:
+        str: A period name from ``PERIODS``; ``yearly`` if none fits.
+    """
+    for name, _, length in PERIODS:
+        if days / length <= max_points:
+            return name
+    return PERIODS[-1][0]
+
+
+def aggregate(frame: "pd.DataFrame", period: str, how: Mapping[str, str],
+              date_column: str = "date") -> "pd.DataFrame":
+    """
+    Aggregate daily rows into one row per period.
+
+    Args:
+        frame (pandas.DataFrame): Daily rows with a datetime ``date_column``.
+        period (str): A period name from ``PERIODS``.
+        how (dict): Maps each column to keep to a pandas aggregation, e.g. ``mean`` or ``sum``.
+        date_column (str): The column holding the dates.
+
+    Returns:
+        pandas.DataFrame: One row per period that has data, labelled with the
+        first day of the period (the last day for weeks), in date order.
+
+    Raises:
+        ValueError: If ``period`` is unknown.
+    """
+    frequencies = {name: frequency for name, frequency, _ in PERIODS}
+    if period not in frequencies:
+        raise ValueError(f"Unknown period '{period}'; expected one of {', '.join(frequencies)}")
+    if period == "daily":
+        return frame[[date_column, *how]].reset_index(drop=True)
+    grouped = frame.resample(frequencies[period], on=date_column).agg(dict(how))
+    # Periods without any day (gaps in the history) are dropped rather than drawn as zeros
+    counts = frame.resample(frequencies[period], on=date_column).size()
+    return grouped[counts > 0].reset_index()
+
+
+def lttb_indices(x: Sequence[float], y: Sequence[float], threshold: int) -> "np.ndarray":
+    """
+    Select ``threshold`` points of a line with the Largest-Triangle-Three-Buckets algorithm.
+
+    The first and last points are kept. The points in between are split into
+    ``threshold - 2`` buckets, and from each bucket the point forming the
+    largest triangle with the previously selected point and the average of
+    the next bucket is kept, which preserves peaks and troughs.
+
+    Args:
+        x (sequence of float): The x values, in increasing order.
+        y (sequence of float): The y values.
+        threshold (int): The number of points to keep, at least 3.
+
+    Returns:
+        numpy.ndarray: The indices of the selected points, in increasing order;
+        all indices if the line has no more than ``threshold`` points.
+
+    Raises:
+        ValueError: If ``threshold`` is less than 3.
+    """
+    import numpy as np
+
+    if threshold < 3:
+        raise ValueError("threshold must be at least 3")
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n <= threshold:
+        return np.arange(n)
+
+    # Bucket i holds the points edges[i]:edges[i + 1]; the endpoints are not bucketed
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.intp)
+    indices = np.empty(threshold, dtype=np.intp)
+    indices[0], indices[-1] = 0, n - 1
+    selected = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_x, next_y = x[end:edges[i + 2]].mean(), y[end:edges[i + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+        # Twice the triangle areas; the factor does not change the argmax
+        areas = np.abs((x[selected] - next_x) * (y[start:end] - y[selected])
+                       - (x[selected] - x[start:end]) * (next_y - y[selected]))
+        selected = start + int(np.argmax(areas))
+        indices[i + 1] = selected
+    return indices
+
+
+def minmax_indices(y: Sequence[float], buckets: int) -> "np.ndarray":
+    """
+    Select the minimum and maximum of each of ``buckets`` equal slices of a series.
+
+    Cheaper than LTTB and exact about extremes, which suits bar charts of
+    spiky values such as precipitation.
+
+    Args:
+        y (sequence of float): The values.
+        buckets (int): The number of slices; at most ``2 * buckets`` points are kept.
+
+    Returns:
+        numpy.ndarray: The indices of the selected points, in increasing order;
+        all indices if the series has no more than ``2 * buckets`` points.
+
+    Raises:
+        ValueError: If ``buckets`` is less than 1.
+    """
+    import numpy as np
+
+    if buckets < 1:
+        raise ValueError("buckets must be at least 1")
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n <= 2 * buckets:
+        return np.arange(n)
+    edges = np.linspace(0, n, buckets + 1).astype(np.intp)
+    selected = []
+    for start, end in zip(edges[:-1], edges[1:]):
+        chunk = y[start:end]
+        if np.isnan(chunk).all():
+            continue
+        selected.extend((start + int(np.nanargmin(chunk)), start + int(np.nanargmax(chunk))))
+    return np.unique(np.array(selected, dtype=np.intp))
+
+
+def downsample(x: Sequence[Any], y: Sequence[float], max_points: int = DEFAULT_MAX_POINTS,
+               method: str = "lttb") -> "np.ndarray":
+    """
+    Select at most ``max_points`` points of a series.
+
+    Args:
+        x (sequence): The x values; datetimes are compared as timestamps.
+        y (sequence of float): The y values.
+        max_points (int): The largest number of points to keep, at least 3.
+        method (str): ``lttb`` for lines, ``minmax`` for bars and spiky series.
+
+    Returns:
+        numpy.ndarray: The indices of the selected points, in increasing order.
+
+    Raises:
+        ValueError: If ``method`` is unknown or ``max_points`` is less than 3.
+    """
+    import numpy as np
+
+    if method == "lttb":
+        x = np.asarray(x)
+        if np.issubdtype(x.dtype, np.datetime64):
+            x = x.astype("datetime64[ns]").astype(np.int64)
+        return lttb_indices(x, y, max_points)
+    if method == "minmax":
+        if max_points < 3:
+            raise ValueError("max_points must be at least 3")
+        return minmax_indices(y, max_points // 2)
+    raise ValueError(f"Unknown downsampling method '{method}'; expected one of {', '.join(DOWNSAMPLING_METHODS)}")
@@ -0,0 +1,268 @@
+"""
+On-disk HTTP response cache with conditional revalidation.
+
+Bodies are stored under a cache directory keyed by URL. Fresh entries (younger
+than the TTL) are served without touching the network; stale entries are
+revalidated with ``If-None-Match`` / ``If-Modified-Since`` so an unchanged
+resource costs a 304 instead of a full download.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+if __package__:
+    from .http_client import create_session, get_with_retry
+else:
+    from http_client import create_session, get_with_retry
+
+if TYPE_CHECKING:
+    import requests
+
+DEFAULT_CACHE_DIR = ".http_cache"
+
+_default_session: Optional["requests.Session"] = None
+
+
+class CachedResponse:
+    """
+    The body of a response served through ``cached_get``.
+
+    Args:
+        content (bytes): The raw response body.
+        encoding (str, optional): The text encoding of the body.
+        from_cache (bool): Whether the body was served from the cache.
+    """
+
+    def __init__(self, content: bytes, encoding: Optional[str], from_cache: bool) -> None:
+        self.content = content
+        self.encoding = encoding
+        self.from_cache = from_cache
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+
+class HTTPCache:
+    """
+    Size-bounded LRU cache of HTTP response bodies stored on disk.
+
+    Args:
+        directory (str): The directory that holds the cached bodies.
+        ttl (float): Seconds during which an entry is served without revalidation.
+        max_entries (int): The maximum number of cached responses.
+        max_bytes (int): The maximum total size of the cached bodies.
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, ttl: float = 3600,
+                 max_entries: int = 1000, max_bytes: int = 512 * 1024 * 1024) -> None:
+        self.directory = directory
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._index: Optional["OrderedDict[str, Dict[str, Any]]"] = None
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str, suffix: str) -> str:
+        return os.path.join(self.directory, key + suffix)
+
+    def _load_index(self) -> "OrderedDict[str, Dict[str, Any]]":
+        """Read the metadata of every entry on disk, least recently used first."""
+        if self._index is None:
+            entries = []
+            if os.path.isdir(self.directory):
+                for name in os.listdir(self.directory):
+                    if not name.endswith(".json"):
+                        continue
+                    path = os.path.join(self.directory, name)
+                    try:
+                        with open(path, 'r', encoding='utf-8') as f:
+                            meta = json.load(f)
+                        # Lookups record the access time as the metadata file's mtime
+                        meta["accessed_at"] = max(meta["accessed_at"], os.path.getmtime(path))
+                    except (OSError, ValueError):
+                        continue
+                    entries.append(meta)
+            entries.sort(key=lambda meta: meta["accessed_at"])
+            self._index = OrderedDict((self._key(meta["url"]), meta) for meta in entries)
+        return self._index
+
+    def _write_atomic(self, path: str, data: bytes) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _write_meta(self, key: str, meta: Dict[str, Any]) -> None:
+        self._write_atomic(self._path(key, ".json"), json.dumps(meta).encode("utf-8"))
+
+    def lookup(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the metadata of the cached entry for ``url`` and mark it as recently used.
+
+        Args:
+            url (str): The URL of the cached response.
+
+        Returns:
+            dict or None: The entry metadata, or None if the URL is not cached.
+        """
+        key = self._key(url)
+        with self._lock:
+            meta = self._load_index().get(key)
+            if meta is None or not os.path.exists(self._path(key, ".body")):
+                return None
+            self._index.move_to_end(key)
+            meta["accessed_at"] = time.time()
+            # Persist the access without rewriting the metadata, so the LRU
+            # order survives into other processes and later runs
+            try:
+                os.utime(self._path(key, ".json"), (meta["accessed_at"], meta["accessed_at"]))
+            except OSError:
+                pass
+            return dict(meta)
+
+    def is_fresh(self, meta: Dict[str, Any]) -> bool:
+        """
+        Check whether an entry can be served without revalidation.
+
+        Args:
+            meta (dict): The entry metadata returned by ``lookup``.
+
+        Returns:
+            bool: True if the entry is younger than the TTL.
+        """
+        return time.time() - meta["stored_at"] < self.ttl
+
+    def read(self, url: str) -> bytes:
+        """
+        Read the cached body for ``url``.
+
+        Args:
+            url (str): The URL of the cached response.
+
+        Returns:
+            bytes: The cached body.
+        """
+        with open(self._path(self._key(url), ".body"), 'rb') as f:
+            return f.read()
+
+    def store(self, url: str, content: bytes, headers: Dict[str, str], encoding: Optional[str] = None) -> None:
+        """
+        Store a response body and its validators, evicting old entries if needed.
+
+        Args:
+            url (str): The URL of the response.
+            content (bytes): The response body.
+            headers (dict): The response headers.
+            encoding (str, optional): The text encoding of the body.
+        """
+        key = self._key(url)
+        now = time.time()
+        meta = {
+            "url": url,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "encoding": encoding,
+            "size": len(content),
+            "stored_at": now,
+            "accessed_at": now,
+        }
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            self._write_atomic(self._path(key, ".body"), content)
+            self._write_meta(key, meta)
+            index = self._load_index()
+            index[key] = meta
+            index.move_to_end(key)
+            self._evict()
+
+    def refresh(self, url: str, headers: Dict[str, str]) -> None:
+        """
+        Restart the TTL of an entry after a 304 Not Modified response.
+
+        Args:
+            url (str): The URL of the cached response.
+            headers (dict): The headers of the 304 response.
+        """
+        key = self._key(url)
+        with self._lock:
+            meta = self._load_index().get(key)
+            if meta is None:
+                return
+            meta["stored_at"] = time.time()
+            meta["etag"] = headers.get("ETag") or meta["etag"]
+            meta["last_modified"] = headers.get("Last-Modified") or meta["last_modified"]
+            self._write_meta(key, meta)
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until both size limits hold."""
+        index = self._index
+        total = sum(meta["size"] for meta in index.values())
+        while index and (len(index) > self.max_entries or total > self.max_bytes):
+            key, meta = index.popitem(last=False)
+            total -= meta["size"]
+            for suffix in (".body", ".json"):
+                try:
+                    os.remove(self._path(key, suffix))
+                except FileNotFoundError:
+                    pass
+
+
+def cached_get(url: str, cache: HTTPCache, session: Optional["requests.Session"] = None,
+               **retry_options) -> CachedResponse:
+    """
+    Fetch ``url`` through the cache.
+
+    A fresh entry is returned without a request. A stale entry is revalidated
+    with a conditional GET and served from disk on 304 Not Modified.
+
+    Args:
+        url (str): The URL to fetch.
+        cache (HTTPCache): The cache to read from and store into.
+        session (requests.Session, optional): The session used for requests.
+            A shared pooled session is used when omitted.
+        **retry_options: Keyword arguments passed to ``get_with_retry``.
+
+    Returns:
+        CachedResponse: The response body.
+
+    Raises:
+        requests.HTTPError: If the HTTP request returned an unsuccessful status code.
+        requests.RequestException: If there was a network error.
+    """
+    global _default_session
+    if session is None:
+        if _default_session is None:
+            _default_session = create_session()
+        session = _default_session
+
+    meta = cache.lookup(url)
+    if meta is not None and cache.is_fresh(meta):
+        return CachedResponse(cache.read(url), meta["encoding"], from_cache=True)
+
+    headers = {}
+    if meta is not None:
+        if meta["etag"]:
+            headers["If-None-Match"] = meta["etag"]
+        if meta["last_modified"]:
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    response = get_with_retry(session, url, headers=headers, **retry_options)
+    if response.status_code == 304 and meta is not None:
+        cache.refresh(url, response.headers)
+        return CachedResponse(cache.read(url), meta["encoding"], from_cache=True)
+
+    cache.store(url, response.content, response.headers, response.encoding)
+    return CachedResponse(response.content, response.encoding, from_cache=False)
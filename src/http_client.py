@@ -0,0 +1,113 @@
+"""
+Shared HTTP helpers for the network-bound tasks: pooled sessions,
+per-host rate limiting and retries with exponential backoff.
+
+``requests`` is imported on first use, so importing this module stays cheap.
+"""
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, Optional
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    import requests
+
+USER_AGENT = "MLDS-Week1/1.0 (educational data collection)"
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def create_session(pool_size: int = 10) -> "requests.Session":
+    """
+    Create a ``requests.Session`` whose connection pool can serve ``pool_size``
+    concurrent requests per host, so TCP/TLS connections are reused.
+
+    Args:
+        pool_size (int): The maximum number of pooled connections per host.
+
+    Returns:
+        requests.Session: The configured session.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = USER_AGENT
+    return session
+
+
+class HostRateLimiter:
+    """
+    Thread-safe limiter that spaces out requests to the same host.
+
+    Args:
+        requests_per_second (float): The maximum request rate per host.
+            A value of 0 or less disables rate limiting.
+    """
+
+    def __init__(self, requests_per_second: float) -> None:
+        self.interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url: str) -> None:
+        """
+        Block until a request to the host of ``url`` is allowed.
+
+        Args:
+            url (str): The URL about to be requested.
+        """
+        if not self.interval:
+            return
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def get_with_retry(session: "requests.Session", url: str, retries: int = 3, backoff: float = 0.5,
+                   rate_limiter: Optional[HostRateLimiter] = None, timeout: float = 10,
+                   **kwargs) -> "requests.Response":
+    """
+    Send a GET request, retrying network errors and retryable status codes.
+
+    The delay before attempt ``n`` (starting at 1) is ``backoff * 2 ** (n - 1)``.
+
+    Args:
+        session (requests.Session): The session used to send the request.
+        url (str): The URL to fetch.
+        retries (int): The number of retries after the first attempt.
+        backoff (float): The base delay in seconds between attempts.
+        rate_limiter (HostRateLimiter, optional): Limiter consulted before every attempt.
+        timeout (float): The timeout in seconds for each attempt.
+        **kwargs: Additional keyword arguments passed to ``session.get``.
+
+    Returns:
+        requests.Response: The successful response.
+
+    Raises:
+        requests.HTTPError: If the final attempt returned an unsuccessful status code.
+        requests.RequestException: If the final attempt failed with a network error.
+    """
+    import requests
+
+    for attempt in range(retries + 1):
+        if attempt:
+            time.sleep(backoff * 2 ** (attempt - 1))
+        if rate_limiter is not None:
+            rate_limiter.wait(url)
+        try:
+            response = session.get(url, timeout=timeout, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == retries:
+                raise
+            continue
+        if response.status_code in RETRY_STATUSES and attempt < retries:
+            continue
+        response.raise_for_status()
+        return response
@@ -0,0 +1,199 @@
+"""
+State tracking for incremental pipeline runs.
+
+A small JSON state file records, for each task and input, how far the input
+has already been processed: a byte offset for the append-only text and XML
+inputs, and the last processed date for the JSON inputs. A re-run then reads
+only what was appended since and appends to the existing outputs.
+"""
+import json
+import mmap
+import os
+import threading
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+DEFAULT_STATE_FILE = ".pipeline_state.json"
+
+# Bytes at the start of an input and just before a saved offset that are
+# hashed to detect a rewritten input
+_FINGERPRINT_BYTES = 64 * 1024
+
+# Serializes saves of tasks that share a state file within one process
+_save_lock = threading.Lock()
+
+
+class IncrementalState:
+    """
+    Progress of every task and input, persisted in a JSON file.
+
+    Args:
+        path (str): The state file. It is created on the first ``save``.
+    """
+
+    def __init__(self, path: str = DEFAULT_STATE_FILE) -> None:
+        self.path = path
+        self._entries = self._read()
+        self._updated = set()
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            # A corrupt state file only costs a full re-run
+            return {}
+
+    @staticmethod
+    def _key(task: str, input_file: str) -> str:
+        return f"{task}:{os.path.abspath(input_file)}"
+
+    def get(self, task: str, input_file: str) -> Dict[str, Any]:
+        """
+        Return the saved progress of a task over one input.
+
+        Args:
+            task (str): The name of the task, e.g. ``task5``.
+            input_file (str): The input file of the task.
+
+        Returns:
+            dict: The saved progress, empty if the input was never processed.
+        """
+        return dict(self._entries.get(self._key(task, input_file), {}))
+
+    def update(self, task: str, input_file: str, **values: Any) -> None:
+        """
+        Record new progress of a task over one input. Call ``save`` to persist it.
+
+        Args:
+            task (str): The name of the task.
+            input_file (str): The input file of the task.
+            **values: The progress fields to store; they must be JSON serializable.
+        """
+        key = self._key(task, input_file)
+        self._entries.setdefault(key, {}).update(values)
+        self._updated.add(key)
+
+    def save(self) -> None:
+        """
+        Atomically write the updated entries to the state file.
+
+        The file is re-read first and only the entries updated through this
+        object are replaced, so tasks running concurrently in the same process
+        do not overwrite each other's progress.
+
+        Raises:
+            IOError: If there is an error writing to the file.
+        """
+        import tempfile
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        with _save_lock:
+            entries = self._read()
+            entries.update((key, self._entries[key]) for key in self._updated)
+            try:
+                fd, tmp_path = tempfile.mkstemp(dir=directory)
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(entries, f, indent=2)
+                os.replace(tmp_path, self.path)
+            except IOError as e:
+                raise IOError(f"Error writing to file '{self.path}': {e}")
+            self._entries = entries
+
+
+def _fingerprint(filename: str, offset: int) -> str:
+    """Hash the first bytes of a file and the bytes just before ``offset``."""
+    import hashlib
+
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as f:
+        digest.update(f.read(min(offset, _FINGERPRINT_BYTES)))
+        # The two regions do not overlap; below twice their size they cover every byte
+        start = max(_FINGERPRINT_BYTES, offset - _FINGERPRINT_BYTES)
+        if start < offset:
+            f.seek(start)
+            digest.update(f.read(offset - start))
+    return digest.hexdigest()
+
+
+def checkpoint(filename: str, offset: int) -> Dict[str, Any]:
+    """
+    Describe a byte offset so that ``resume_offset`` can validate it later.
+
+    Args:
+        filename (str): The input file.
+        offset (int): The offset up to which the file has been processed.
+
+    Returns:
+        dict: Progress fields for ``IncrementalState.update``.
+    """
+    return {"offset": offset, "fingerprint": _fingerprint(filename, offset)}
+
+
+def resume_offset(filename: str, progress: Dict[str, Any]) -> int:
+    """
+    Return the byte offset where processing of ``filename`` should resume.
+
+    The saved offset is only trusted if the file is still at least that long
+    and its fingerprint is unchanged; otherwise the file was truncated or
+    rewritten and must be processed from the start. The fingerprint covers
+    the first and the last 64 KiB before the offset (every byte of shorter
+    files), so a regenerated file or an edit near either end is detected, but
+    an in-place edit further inside a large file is not.
+
+    Args:
+        filename (str): The input file.
+        progress (dict): The progress returned by ``IncrementalState.get``.
+
+    Returns:
+        int: The saved offset, or 0 for a full run.
+    """
+    offset = progress.get("offset", 0)
+    if not offset or os.path.getsize(filename) < offset:
+        return 0
+    if _fingerprint(filename, offset) != progress.get("fingerprint"):
+        return 0
+    return offset
+
+
+def last_boundary(filename: str, start: int, boundary: bytes) -> int:
+    """
+    Find the end of the last complete record of a file.
+
+    Args:
+        filename (str): The input file.
+        start (int): The offset from which to search.
+        boundary (bytes): The byte sequence that ends a record, e.g. ``b"\\n"``.
+
+    Returns:
+        int: The offset right after the last ``boundary`` at or after ``start``,
+        or ``start`` if the rest of the file holds no complete record.
+    """
+    with open(filename, 'rb') as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be memory-mapped
+            return start
+        with mapped:
+            index = mapped.rfind(boundary, start)
+    return start if index == -1 else index + len(boundary)
+
+
+def days_after(days: Iterable[Dict[str, Any]], last_date: Optional[str]) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the days dated after ``last_date``.
+
+    Dates are ISO ``YYYY-MM-DD`` strings, so they compare chronologically.
+
+    Args:
+        days (iterable of dict): The daily records, each with a ``date`` key.
+        last_date (str, optional): The last date already processed.
+
+    Yields:
+        dict: The days not processed yet.
+    """
+    for day in days:
+        if last_date is None or day["date"] > last_date:
+            yield day
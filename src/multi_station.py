@@ -0,0 +1,190 @@
+"""
+Per-station analysis of many weather stations, partitioned over a process pool.
+
+Stations come in either of two forms:
+
+- a directory of station files, each in the single-city format of
+  ``tokyo_weather_complex.json`` and named after its station id. This is
+  the scalable form: each worker process reads and analyzes its own files,
+  so only the summary rows cross process boundaries;
+- one multi-station JSON file::
+
+      {"stations": [{"station": "tokyo", "city": "Tokyo", "daily": [...]}, ...]}
+
+Each station is summarized with the same logic as ``summarize_weather_data``
+(task 4) and the hot/windy/uncomfortable flags of ``analyze_weather_columns``
+(task 3), and the rows are collected into a table indexed by station.
+"""
+import glob
+import os
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+if __package__:
+    from .utils import load_json, load_json_batch
+    from .records import DailyWeatherBatch
+    from .instrumentation import instrumented
+    from .task3_complex_weather_analysis import DAILY_FIELDS, analyze_weather_columns
+    from .task4_weather_summary_export import summarize_weather_data
+else:
+    from utils import load_json, load_json_batch
+    from records import DailyWeatherBatch
+    from instrumentation import instrumented
+    from task3_complex_weather_analysis import DAILY_FIELDS, analyze_weather_columns
+    from task4_weather_summary_export import summarize_weather_data
+
+# pandas is only imported when the summary table is built
+if TYPE_CHECKING:
+    import pandas as pd
+
+# A station's days: the path of a single-city JSON file, a batch, or a list of day dictionaries
+StationData = Union[str, DailyWeatherBatch, Iterable[Mapping[str, Any]]]
+
+STATION_SUMMARY_COLUMNS = (
+    "days", "first_date", "last_date",
+    "average_max_temp", "average_min_temp", "total_precipitation", "average_wind_speed", "average_humidity",
+    "hot_days", "windy_days", "rainy_days", "uncomfortable_days", "hottest_day", "max_temperature",
+)
+
+
+def station_files(directory: str, pattern: str = "*.json") -> Dict[str, str]:
+    """
+    List the station files of a directory.
+
+    Args:
+        directory (str): The directory holding one single-city JSON file per station.
+        pattern (str): The glob pattern of the station files.
+
+    Returns:
+        dict: Maps each station id (the file name without extension) to its path, sorted by id.
+    """
+    paths = sorted(glob.glob(os.path.join(directory, pattern)))
+    return {os.path.splitext(os.path.basename(path))[0]: path for path in paths}
+
+
+def load_stations(filename: str) -> Dict[str, DailyWeatherBatch]:
+    """
+    Load a multi-station JSON file.
+
+    A single-city file such as ``tokyo_weather_complex.json`` is accepted too,
+    as one station named after its city.
+
+    Args:
+        filename (str): The name of the JSON file to load.
+
+    Returns:
+        dict: Maps each station id to its days, in file order.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        KeyError: If a station has no ``station`` id or no ``daily`` array.
+        ValueError: If a station id appears twice.
+    """
+    data = load_json(filename)
+    if "stations" not in data:
+        return {data.get("city", os.path.splitext(os.path.basename(filename))[0]):
+                DailyWeatherBatch.from_records(data["daily"])}
+    stations = {}
+    for station in data["stations"]:
+        if station["station"] in stations:
+            raise ValueError(f"Duplicate station '{station['station']}' in '{filename}'")
+        stations[station["station"]] = DailyWeatherBatch.from_records(station["daily"])
+    return stations
+
+
+def summarize_station(daily: StationData, temp_threshold: float = 30, wind_threshold: float = 15,
+                      humidity_threshold: float = 70) -> Dict[str, Any]:
+    """
+    Summarize the days of one station.
+
+    Args:
+        daily: The station's days, or the path of its single-city JSON file.
+        temp_threshold (float): The temperature threshold to determine a hot day.
+        wind_threshold (float): The wind speed threshold to determine a windy day.
+        humidity_threshold (float): The humidity threshold to determine uncomfortable weather.
+
+    Returns:
+        dict: The values of ``STATION_SUMMARY_COLUMNS``. Dates and extremes
+        are None for a station without days.
+    """
+    import numpy as np
+
+    if isinstance(daily, str):
+        daily = load_json_batch(daily)["daily"]
+    elif not isinstance(daily, DailyWeatherBatch):
+        daily = DailyWeatherBatch.from_records(daily)
+    if not daily:
+        # An empty batch only knows the date field
+        daily = DailyWeatherBatch(DAILY_FIELDS)
+    summary = summarize_weather_data(daily, temp_threshold, wind_threshold)
+    analysis = analyze_weather_columns(daily, temp_threshold, wind_threshold, humidity_threshold)
+    days = len(analysis["date"])
+    hottest = int(np.argmax(analysis["max_temperature"])) if days else None
+    summary.update(
+        days=days,
+        first_date=str(analysis["date"][0]) if days else None,
+        last_date=str(analysis["date"][-1]) if days else None,
+        uncomfortable_days=int(np.count_nonzero(analysis["is_uncomfortable_day"])),
+        hottest_day=str(analysis["date"][hottest]) if days else None,
+        max_temperature=float(analysis["max_temperature"][hottest]) if days else None,
+    )
+    return {column: summary[column] for column in STATION_SUMMARY_COLUMNS}
+
+
+def _summarize_partition(partition: List[Tuple[str, StationData]],
+                         thresholds: Tuple[float, float, float]) -> List[Tuple[str, Dict[str, Any]]]:
+    """Summarize a partition of stations in a worker process."""
+    return [(station, summarize_station(daily, *thresholds)) for station, daily in partition]
+
+
+@instrumented(rows=len)
+def summarize_stations(stations: Union[str, Mapping[str, StationData]], workers: Optional[int] = None,
+                       temp_threshold: float = 30, wind_threshold: float = 15,
+                       humidity_threshold: float = 70, partitions_per_worker: int = 4) -> "pd.DataFrame":
+    """
+    Summarize many stations in parallel into one table.
+
+    The stations are split into ``workers * partitions_per_worker`` partitions
+    of about the same number of stations, which a pool of processes
+    summarizes independently. Passing station files rather than loaded days
+    lets every worker do its own parsing.
+
+    Args:
+        stations: A directory of station files, a multi-station JSON file, or a
+            mapping of station id to its days or the path of its station file.
+        workers (int, optional): The number of processes. Defaults to the number
+            of CPUs; 1 summarizes in this process.
+        temp_threshold (float): The temperature threshold to determine a hot day.
+        wind_threshold (float): The wind speed threshold to determine a windy day.
+        humidity_threshold (float): The humidity threshold to determine uncomfortable weather.
+        partitions_per_worker (int): More partitions even out stations of
+            different lengths; fewer reduce the per-task overhead.
+
+    Returns:
+        pandas.DataFrame: One row per station, indexed by ``station`` in input
+        order, with the columns of ``STATION_SUMMARY_COLUMNS``.
+
+    Raises:
+        FileNotFoundError: If a station file does not exist.
+    """
+    import pandas as pd
+
+    if isinstance(stations, str):
+        stations = station_files(stations) if os.path.isdir(stations) else load_stations(stations)
+    items = list(stations.items())
+    thresholds = (temp_threshold, wind_threshold, humidity_threshold)
+    workers = min(workers or os.cpu_count() or 1, max(len(items), 1))
+    if workers == 1:
+        rows = _summarize_partition(items, thresholds)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        # Interleaved partitions spread long and short stations of sorted inputs evenly
+        count = min(workers * partitions_per_worker, len(items))
+        partitions = [items[i::count] for i in range(count)]
+        with ProcessPoolExecutor(workers) as executor:
+            results = executor.map(_summarize_partition, partitions, [thresholds] * count)
+            summaries = dict(row for partition in results for row in partition)
+        rows = [(station, summaries[station]) for station, _ in items]
+
+    return pd.DataFrame([summary for _, summary in rows], columns=list(STATION_SUMMARY_COLUMNS),
+                        index=pd.Index([station for station, _ in rows], name="station"))
@@ -0,0 +1,246 @@
+"""
+Binary cache of parsed inputs, so unchanged XML, text and JSON files are not re-parsed.
+
+The parsed ``DailyWeatherBatch`` of a source file is written to a cache file
+holding a small JSON header followed by the raw column arrays, each aligned
+to 8 bytes. Loading memory-maps the file and copies the arrays out in one
+operation per column, without any parsing.
+
+Entries are keyed by source path and parser. An entry is valid while the
+source has the recorded size and modification time; if only the
+modification time changed (the file was touched or copied), the content
+hash recorded with the entry decides. Anything else re-parses the source
+and replaces the entry.
+"""
+import json
+import mmap
+import os
+import sys
+from typing import Any, Callable, Dict, Optional
+
+if __package__:
+    from .records import DailyWeatherBatch
+else:
+    from records import DailyWeatherBatch
+
+DEFAULT_CACHE_DIR = ".parse_cache"
+
+_MAGIC = b"MLDSWXC2"
+_ALIGNMENT = 8
+
+
+def _content_hash(filename: str) -> str:
+    import hashlib
+
+    with open(filename, 'rb') as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def _padding(offset: int) -> int:
+    return -offset % _ALIGNMENT
+
+
+def _is_int(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _valid_header(header: Any) -> bool:
+    """Check the types of the header fields that ``load`` relies on."""
+    if not isinstance(header, dict):
+        return False
+    layout, offsets = header.get("layout"), header.get("offsets")
+    if not (_is_int(header.get("size")) and _is_int(header.get("mtime_ns"))
+            and isinstance(header.get("sha256"), str) and isinstance(header.get("byteorder"), str)):
+        return False
+    if not (isinstance(layout, dict) and isinstance(layout.get("fields"), list) and _is_int(layout.get("count"))
+            and isinstance(layout.get("typecodes"), dict) and isinstance(layout.get("labels"), list)):
+        return False
+    if not isinstance(offsets, dict) or set(offsets) != {"date", *layout["typecodes"]}:
+        return False
+    return all(isinstance(span, list) and len(span) == 2 and all(_is_int(value) and value >= 0 for value in span)
+               for span in offsets.values())
+
+
+class ParseCache:
+    """
+    On-disk cache of parsed weather files.
+
+    Args:
+        directory (str): The directory that holds the cache files.
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR) -> None:
+        self.directory = directory
+
+    def path(self, source: str, parser: str) -> str:
+        """
+        Return the cache file of one source and parser.
+
+        Args:
+            source (str): The parsed file.
+            parser (str): The name of the parser, so that different parsings
+                of the same file do not share an entry.
+
+        Returns:
+            str: The path of the cache file.
+        """
+        import hashlib
+
+        key = hashlib.sha256(f"{parser}:{os.path.abspath(source)}".encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, key + ".bin")
+
+    def load(self, source: str, parser: str) -> Optional[DailyWeatherBatch]:
+        """
+        Return the cached batch of a source if the source has not changed since.
+
+        Args:
+            source (str): The parsed file.
+            parser (str): The name of the parser.
+
+        Returns:
+            DailyWeatherBatch or None: The cached batch, or None if there is
+            no valid entry.
+
+        Raises:
+            FileNotFoundError: If the source does not exist.
+        """
+        stat = os.stat(source)
+        try:
+            f = open(self.path(source, parser), 'rb')
+        except FileNotFoundError:
+            return None
+        with f:
+            try:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                return None
+            with mapped:
+                header = self._read_header(mapped)
+                if header is None or header["size"] != stat.st_size:
+                    return None
+                if header["mtime_ns"] != stat.st_mtime_ns and header["sha256"] != _content_hash(source):
+                    return None
+                view = memoryview(mapped)
+                try:
+                    buffers = {field: view[start:start + length] for field, (start, length) in header["offsets"].items()}
+                    try:
+                        batch = DailyWeatherBatch.from_buffers(header["layout"], buffers)
+                    finally:
+                        for buffer in buffers.values():
+                            buffer.release()
+                except (KeyError, TypeError, ValueError):
+                    # A header that passed the checks but does not fit the arrays
+                    return None
+                finally:
+                    view.release()
+        if header["mtime_ns"] != stat.st_mtime_ns:
+            # Same content under a new mtime: record it so the hash is not recomputed every run
+            self.store(source, parser, batch, header["sha256"], stat)
+        return batch
+
+    @staticmethod
+    def _read_header(mapped: mmap.mmap) -> Optional[Dict[str, Any]]:
+        if mapped[:len(_MAGIC)] != _MAGIC:
+            return None
+        length = int.from_bytes(mapped[len(_MAGIC):len(_MAGIC) + 8], "little")
+        start = len(_MAGIC) + 8
+        try:
+            header = json.loads(mapped[start:start + length])
+        except ValueError:
+            return None
+        if not _valid_header(header) or header["byteorder"] != sys.byteorder:
+            return None
+        if any(start + length > len(mapped) for start, length in header["offsets"].values()):
+            # Truncated file
+            return None
+        return header
+
+    def store(self, source: str, parser: str, batch: DailyWeatherBatch, content_hash: Optional[str] = None,
+              stat: Optional[os.stat_result] = None) -> bool:
+        """
+        Atomically write the batch parsed from a source to the cache.
+
+        Pass the ``stat`` and ``content_hash`` of the source taken before it
+        was parsed: if the source has changed since, the batch may not match
+        either version of it and nothing is written.
+
+        Args:
+            source (str): The parsed file.
+            parser (str): The name of the parser.
+            batch (DailyWeatherBatch): The parsed days.
+            content_hash (str, optional): The SHA-256 of the source, if already known.
+            stat (os.stat_result, optional): The status of the source when it
+                was read. Defaults to its current status.
+
+        Returns:
+            bool: True if the entry was written, False if the source changed.
+
+        Raises:
+            IOError: If there is an error writing to the cache file.
+        """
+        import tempfile
+
+        current = os.stat(source)
+        if stat is None:
+            stat = current
+        elif (current.st_size, current.st_mtime_ns) != (stat.st_size, stat.st_mtime_ns):
+            return False
+        layout, buffers = batch.to_buffers()
+        sizes = {field: memoryview(buffer).nbytes for field, buffer in buffers.items()}
+        header = {
+            "source": os.path.abspath(source),
+            "parser": parser,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": content_hash or _content_hash(source),
+            "byteorder": sys.byteorder,
+            "layout": layout,
+        }
+        # The offsets depend on the header length, which depends on the offsets:
+        # reserve room for them with placeholder values of the final width
+        header["offsets"] = {field: [10 ** 15, size] for field, size in sizes.items()}
+        data_start = len(_MAGIC) + 8 + len(json.dumps(header).encode("utf-8"))
+        offset = data_start + _padding(data_start)
+        for field, size in sizes.items():
+            header["offsets"][field] = [offset, size]
+            offset += size + _padding(size)
+        encoded = json.dumps(header).encode("utf-8")
+        encoded += b" " * (data_start - len(_MAGIC) - 8 - len(encoded))
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(source, parser)
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(_MAGIC)
+                f.write(len(encoded).to_bytes(8, "little"))
+                f.write(encoded)
+                f.write(b"\0" * _padding(data_start))
+                for field, buffer in buffers.items():
+                    f.write(buffer)
+                    f.write(b"\0" * _padding(sizes[field]))
+            os.replace(tmp_path, path)
+        except IOError as e:
+            raise IOError(f"Error writing to file '{path}': {e}")
+        return True
+
+    def parse(self, source: str, parser: str, parse: Callable[[str], DailyWeatherBatch]) -> DailyWeatherBatch:
+        """
+        Return the parsed batch of a source, from the cache when it is still valid.
+
+        Args:
+            source (str): The file to parse.
+            parser (str): The name of the parser, e.g. ``xml``.
+            parse (callable): Parses ``source`` into a batch on a cache miss.
+
+        Returns:
+            DailyWeatherBatch: The parsed days.
+        """
+        batch = self.load(source, parser)
+        if batch is None:
+            # Taken before parsing, so a source rewritten meanwhile is not cached under the new version
+            stat = os.stat(source)
+            content_hash = _content_hash(source)
+            batch = parse(source)
+            self.store(source, parser, batch, content_hash, stat)
+        return batch
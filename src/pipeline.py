@@ -0,0 +1,270 @@
+"""
+Run tasks 1-6 in one process as a dependency graph.
+
+A task depends on every task that writes one of its inputs. Tasks whose
+dependencies are done run concurrently on a thread pool, so the network-bound
+tasks overlap with the file-bound ones. A task is skipped when all of its
+outputs are newer than all of its inputs.
+"""
+import importlib
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+if __package__:
+    from .incremental import DEFAULT_STATE_FILE
+else:
+    from incremental import DEFAULT_STATE_FILE
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _import_task(module: str):
+    """Import a task module on first use, as part of the package when there is one."""
+    return importlib.import_module(f"{__package__}.{module}" if __package__ else module)
+
+
+class Task:
+    """
+    One node of the pipeline graph.
+
+    Args:
+        name (str): The name of the task, e.g. ``task3``.
+        action (callable): Runs the task; called with the task and the pipeline options.
+        inputs (list of str): The files the task reads.
+        outputs (list of str): The files the task writes.
+    """
+
+    def __init__(self, name: str, action: Callable[["Task", Dict[str, Any]], None],
+                 inputs: Sequence[str] = (), outputs: Sequence[str] = ()) -> None:
+        self.name = name
+        self.action = action
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+
+    def is_up_to_date(self) -> bool:
+        """
+        Check whether every output exists and is newer than every input.
+
+        Tasks without file inputs (the network tasks) are never up to date.
+
+        Returns:
+            bool: True if the task can be skipped.
+        """
+        if not self.inputs or not self.outputs:
+            return False
+        try:
+            oldest_output = min(os.path.getmtime(path) for path in self.outputs)
+            newest_input = max(os.path.getmtime(path) for path in self.inputs)
+        except OSError:
+            return False
+        return oldest_output >= newest_input
+
+
+class TaskResult:
+    """
+    The outcome of one task.
+
+    Args:
+        name (str): The name of the task.
+        status (str): ``ran``, ``skipped`` (up to date), ``failed`` or
+            ``blocked`` (a dependency failed).
+        seconds (float): The wall-clock time spent in the task.
+        error (Exception, optional): The exception raised by a failed task.
+    """
+
+    def __init__(self, name: str, status: str, seconds: float = 0.0,
+                 error: Optional[Exception] = None) -> None:
+        self.name = name
+        self.status = status
+        self.seconds = seconds
+        self.error = error
+
+
+def _run_task1(task: Task, options: Dict[str, Any]) -> None:
+    _import_task("task1_scrape").run(json_file=task.outputs[0], cache=options["cache"])
+
+
+def _run_task2(task: Task, options: Dict[str, Any]) -> None:
+    _import_task("task2_fetch_tokyo_weather").run(json_file=task.outputs[0], cache=options["cache"])
+
+
+def _run_task3(task: Task, options: Dict[str, Any]) -> None:
+    report = _import_task("task3_complex_weather_analysis").run(
+        task.inputs[0], incremental=options["incremental"], state_file=options["state_file"],
+        parse_cache=options["parse_cache"])
+    with open(task.outputs[0], 'a' if options["incremental"] else 'w', encoding='utf-8') as f:
+        f.write(report + "\n")
+
+
+def _run_task4(task: Task, options: Dict[str, Any]) -> None:
+    _import_task("task4_weather_summary_export").run(
+        task.inputs[0], task.outputs[0],
+        incremental=options["incremental"], state_file=options["state_file"],
+        parse_cache=options["parse_cache"])
+
+
+def _run_task5(task: Task, options: Dict[str, Any]) -> None:
+    _import_task("task5_parse_weather_xml").run(
+        task.inputs[0], task.outputs[0],
+        incremental=options["incremental"], state_file=options["state_file"],
+        parse_cache=options["parse_cache"])
+
+
+def _run_task6(task: Task, options: Dict[str, Any]) -> None:
+    _import_task("task6_extract_weather_data").run(
+        task.inputs[0], task.outputs[0],
+        incremental=options["incremental"], state_file=options["state_file"],
+        parse_cache=options["parse_cache"])
+
+
+def default_tasks(output_dir: str = ".") -> List[Task]:
+    """
+    Build the graph of tasks 1-6 with their usual inputs and outputs.
+
+    Args:
+        output_dir (str): The directory the outputs are written to.
+
+    Returns:
+        list of Task: The six tasks.
+    """
+    def output(name: str) -> str:
+        return os.path.join(output_dir, name)
+
+    json_input = os.path.join(SRC_DIR, "tokyo_weather_complex.json")
+    return [
+        Task("task1", _run_task1, outputs=[output("extracted_wikipedia_data.json")]),
+        Task("task2", _run_task2, outputs=[output("tokyo_weather.json")]),
+        Task("task3", _run_task3, inputs=[json_input], outputs=[output("weather_analysis_report.txt")]),
+        Task("task4", _run_task4, inputs=[json_input], outputs=[output("tokyo_weather_summary.csv")]),
+        Task("task5", _run_task5, inputs=[os.path.join(SRC_DIR, "weather_data.xml")],
+             outputs=[output("parsed_weather_data.csv")]),
+        Task("task6", _run_task6, inputs=[os.path.join(SRC_DIR, "weather_report.txt")],
+             outputs=[output("extracted_weather_data.csv")]),
+    ]
+
+
+def dependencies(tasks: Sequence[Task]) -> Dict[str, List[str]]:
+    """
+    Derive the dependency graph from the task inputs and outputs.
+
+    Args:
+        tasks (list of Task): The tasks of the pipeline.
+
+    Returns:
+        dict: Maps each task name to the names of the tasks that write its inputs.
+
+    Raises:
+        ValueError: If the graph has a cycle.
+    """
+    writers = {os.path.abspath(path): task.name for task in tasks for path in task.outputs}
+    graph = {
+        task.name: sorted({writers[os.path.abspath(path)] for path in task.inputs
+                           if os.path.abspath(path) in writers} - {task.name})
+        for task in tasks
+    }
+
+    # Depth-first search for a cycle
+    visiting, done = set(), set()
+
+    def visit(name: str) -> None:
+        if name in done:
+            return
+        if name in visiting:
+            raise ValueError(f"Dependency cycle through task '{name}'")
+        visiting.add(name)
+        for dependency in graph[name]:
+            visit(dependency)
+        visiting.discard(name)
+        done.add(name)
+
+    for name in graph:
+        visit(name)
+    return graph
+
+
+def run_pipeline(tasks: Sequence[Task], max_workers: int = 4, force: bool = False,
+                 incremental: bool = False, state_file: str = DEFAULT_STATE_FILE,
+                 cache: Any = None, parse_cache: Any = None) -> List[TaskResult]:
+    """
+    Run the tasks in dependency order, running independent tasks concurrently.
+
+    A task starts as soon as all of its dependencies have run or were skipped.
+    If a task fails, the tasks that depend on it are reported as ``blocked``
+    and the rest of the graph still runs.
+
+    Args:
+        tasks (list of Task): The tasks to run.
+        max_workers (int): The maximum number of tasks running at once.
+        force (bool): Run tasks even when their outputs are up to date.
+        incremental (bool): Run the file tasks in incremental mode.
+        state_file (str): The file holding the progress of incremental runs.
+        cache (HTTPCache, optional): The response cache shared by the network tasks.
+        parse_cache (ParseCache, optional): The cache of parsed inputs shared by the file tasks.
+
+    Returns:
+        list of TaskResult: One result per task, in the order the tasks were given.
+    """
+    graph = dependencies(tasks)
+    by_name = {task.name: task for task in tasks}
+    options = {
+        "incremental": incremental,
+        "state_file": state_file,
+        "cache": cache,
+        "parse_cache": parse_cache,
+    }
+
+    def execute(task: Task) -> TaskResult:
+        if not force and task.is_up_to_date():
+            return TaskResult(task.name, "skipped")
+        start = time.perf_counter()
+        try:
+            task.action(task, options)
+        except Exception as e:
+            return TaskResult(task.name, "failed", time.perf_counter() - start, e)
+        return TaskResult(task.name, "ran", time.perf_counter() - start)
+
+    results: Dict[str, TaskResult] = {}
+    pending = [task.name for task in tasks]
+    with ThreadPoolExecutor(max_workers) as executor:
+        running = {}
+        while pending or running:
+            for name in list(pending):
+                states = [results[dependency].status if dependency in results else None
+                          for dependency in graph[name]]
+                if any(status in ("failed", "blocked") for status in states):
+                    results[name] = TaskResult(name, "blocked")
+                    pending.remove(name)
+                elif all(status in ("ran", "skipped") for status in states):
+                    running[executor.submit(execute, by_name[name])] = name
+                    pending.remove(name)
+            if not running:
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                result = future.result()
+                results[result.name] = result
+                del running[future]
+    return [results[task.name] for task in tasks]
+
+
+def format_timings(results: Sequence[TaskResult], total_seconds: float) -> str:
+    """
+    Format the per-task timing table printed after a run.
+
+    Args:
+        results (list of TaskResult): The results returned by ``run_pipeline``.
+        total_seconds (float): The wall-clock time of the whole run.
+
+    Returns:
+        str: The table as a string.
+    """
+    lines = [f"{'task':<8} {'status':<8} {'seconds':>8}"]
+    for result in results:
+        line = f"{result.name:<8} {result.status:<8} {result.seconds:>8.3f}"
+        if result.error is not None:
+            line += f"  {type(result.error).__name__}: {result.error}"
+        lines.append(line)
+    lines.append(f"{'total':<17} {total_seconds:>8.3f}")
+    return "\n".join(lines)
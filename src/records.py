@@ -0,0 +1,403 @@
+"""
+Compact representations of daily weather shared by all tasks.
+
+- ``DailyWeather`` is a ``__slots__`` dataclass for one day. It also supports
+  ``day["max_temperature"]`` style access, so it can be passed to code written
+  for the per-day dictionaries.
+- ``DailyWeatherBatch`` stores many days as one typed array per field (struct
+  of arrays), a small fraction of the memory of a list of dictionaries. The
+  batch parsers of tasks 5 and 6 and ``utils.load_json_batch`` produce it, and
+  the task 3 and 4 analyzers and the CSV and Arrow exporters read its columns
+  directly.
+
+Every task uses the field names of ``WEATHER_FIELDS``; a day only has the
+fields its source provides (task 5 records a single ``temperature``, task 6
+has no wind speed).
+"""
+import math
+from array import array
+from dataclasses import dataclass, field
+from itertools import islice, repeat
+from typing import (TYPE_CHECKING, Any, Dict, FrozenSet, Iterable, Iterator, List, Mapping, Optional, Sequence,
+                    Tuple, Union)
+
+# NumPy is only needed by ``DailyWeatherBatch.to_numpy``
+if TYPE_CHECKING:
+    import numpy as np
+
+WEATHER_FIELDS = ("date", "temperature", "max_temperature", "min_temperature", "precipitation",
+                  "wind_speed", "humidity", "weather_description")
+NUMERIC_FIELDS = WEATHER_FIELDS[1:-1]
+
+# ISO dates (YYYY-MM-DD) are stored as fixed-width ASCII
+_DATE_WIDTH = 10
+
+# The kinds of the values of a float column that also received integers or nulls
+_FLOAT, _INT, _NULL = 0, 1, 2
+
+
+@dataclass(slots=True)
+class DailyWeather:
+    """
+    The weather of one day. Fields the source does not provide are None.
+
+    A field the source gives as null (JSON ``null``) is None too, but is
+    remembered in ``_nulls``: like a dictionary, ``day[field]`` then returns
+    None, while a field the source lacks raises ``KeyError``.
+    """
+    date: str
+    temperature: Optional[float] = None
+    max_temperature: Optional[float] = None
+    min_temperature: Optional[float] = None
+    precipitation: Optional[float] = None
+    wind_speed: Optional[float] = None
+    humidity: Optional[float] = None
+    weather_description: Optional[str] = None
+    _nulls: FrozenSet[str] = field(default=frozenset(), repr=False, kw_only=True)
+
+    @classmethod
+    def from_dict(cls, day: Mapping[str, Any]) -> "DailyWeather":
+        """
+        Build a record from a per-day dictionary, ignoring unknown keys.
+
+        Args:
+            day (dict): A daily weather dictionary with a ``date`` key.
+
+        Returns:
+            DailyWeather: The record.
+        """
+        values = {field: day[field] for field in WEATHER_FIELDS if field in day}
+        nulls = frozenset(field for field, value in values.items() if value is None)
+        return cls(**values, _nulls=nulls) if nulls else cls(**values)
+
+    def __getitem__(self, key: str) -> Any:
+        value = getattr(self, key) if key in WEATHER_FIELDS else None
+        if value is None and key not in self._nulls:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return key in WEATHER_FIELDS and (getattr(self, key) is not None or key in self._nulls)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the value of a field, or ``default`` if the day does not have it."""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self) -> List[str]:
+        """Return the names of the fields the day has, in ``WEATHER_FIELDS`` order."""
+        return [field for field in WEATHER_FIELDS if getattr(self, field) is not None or field in self._nulls]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the day as the per-day dictionary used by the tasks."""
+        return {field: getattr(self, field) for field in self.keys()}
+
+
+class DailyWeatherBatch:
+    """
+    Many days stored as one typed array per field.
+
+    Dates are kept as fixed-width ASCII, numeric fields as ``array('q')``
+    while every value is an integer and as ``array('d')`` otherwise, and
+    descriptions as indexes into a table of distinct strings. A float column
+    that also received integers (a JSON source may write ``60`` next to
+    ``60.5``) or nulls records the kind of each value in one extra byte per
+    day, so every value is read back as the type it was stored from; nulls
+    are stored as NaN. A day costs
+    about 60 bytes instead of several hundred for a dictionary.
+
+    Args:
+        fields (sequence of str): The fields of every day; must include ``date``.
+
+    Raises:
+        ValueError: If a field is unknown or ``date`` is missing.
+    """
+
+    def __init__(self, fields: Sequence[str] = WEATHER_FIELDS) -> None:
+        unknown = set(fields) - set(WEATHER_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown weather field(s): {', '.join(sorted(unknown))}")
+        if "date" not in fields:
+            raise ValueError("A batch needs the 'date' field")
+        self.fields = tuple(field for field in WEATHER_FIELDS if field in fields)
+        self._dates = bytearray()
+        self._numbers: Dict[str, array] = {field: array('q') for field in self.fields if field in NUMERIC_FIELDS}
+        # The kind of each value of the float columns that also received integers or nulls
+        self._kinds: Dict[str, array] = {}
+        self._descriptions = array('I') if "weather_description" in self.fields else None
+        self._labels: List[str] = []
+        self._label_codes: Dict[str, int] = {}
+
+    @classmethod
+    def from_records(cls, days: Iterable[Mapping[str, Any]],
+                     fields: Optional[Sequence[str]] = None) -> "DailyWeatherBatch":
+        """
+        Build a batch from per-day mappings, e.g. a parser's iterator.
+
+        Args:
+            days (iterable of dict): The days; consumed one at a time.
+            fields (sequence of str, optional): The fields to keep. Defaults to
+                the known fields of the first day.
+
+        Returns:
+            DailyWeatherBatch: The batch.
+        """
+        days = iter(days)
+        if fields is None:
+            first = next(days, None)
+            if first is None:
+                return cls(("date",))
+            batch = cls([field for field in WEATHER_FIELDS if field in first])
+            batch.append(first)
+        else:
+            batch = cls(fields)
+        return batch.extend(days)
+
+    def append(self, day: Mapping[str, Any]) -> None:
+        """
+        Add one day.
+
+        Args:
+            day (dict or DailyWeather): The day; it must have every field of the batch.
+
+        Raises:
+            KeyError: If the day lacks a field of the batch.
+            ValueError: If the date is not an ISO ``YYYY-MM-DD`` string.
+        """
+        self._extend_chunk([day])
+
+    def extend(self, days: Iterable[Mapping[str, Any]], chunk_size: int = 65536) -> "DailyWeatherBatch":
+        """
+        Add many days.
+
+        Days are read ``chunk_size`` at a time and each field is appended to
+        its array in one operation, which is much faster than ``append`` per day.
+
+        Args:
+            days (iterable of dict): The days.
+            chunk_size (int): The number of days converted at a time.
+
+        Returns:
+            DailyWeatherBatch: This batch, to allow chaining.
+
+        Raises:
+            KeyError: If a day lacks a field of the batch.
+            ValueError: If a date is not an ISO ``YYYY-MM-DD`` string.
+        """
+        days = iter(days)
+        while True:
+            chunk = list(islice(days, chunk_size))
+            if not chunk:
+                return self
+            self._extend_chunk(chunk)
+
+    def _extend_chunk(self, chunk: List[Mapping[str, Any]]) -> None:
+        # Convert every field before storing any, so a bad day leaves the batch unchanged
+        dates = [day["date"] for day in chunk]
+        if any(len(date) != _DATE_WIDTH for date in dates):
+            bad = next(date for date in dates if len(date) != _DATE_WIDTH)
+            raise ValueError(f"Expected an ISO YYYY-MM-DD date, got '{bad}'")
+        encoded = "".join(dates).encode("ascii")
+        numbers = {}
+        kinds = {}
+        for field, column in self._numbers.items():
+            values = [day[field] for day in chunk]
+            try:
+                numbers[field] = array(column.typecode, values)
+            except TypeError:
+                # A non-integer value or a null turns the column into floats
+                numbers[field] = array('d', [math.nan if value is None else value for value in values])
+            if numbers[field].typecode == 'd' and (field in self._kinds or column.typecode == 'q' and len(column)
+                                                   or any(type(value) is int or value is None for value in values)):
+                kinds[field] = array('B', [_INT if type(value) is int else _NULL if value is None else _FLOAT
+                                           for value in values])
+        descriptions = [day["weather_description"] for day in chunk] if self._descriptions is not None else None
+
+        self._dates += encoded
+        for field, values in numbers.items():
+            column = self._numbers[field]
+            if field in kinds and field not in self._kinds:
+                self._kinds[field] = array('B', [_INT if column.typecode == 'q' else _FLOAT]) * len(column)
+            if values.typecode != column.typecode:
+                self._numbers[field] = array('d', column)
+            self._numbers[field].extend(values)
+        for field, values in kinds.items():
+            self._kinds[field].extend(values)
+        if descriptions is not None:
+            codes = self._label_codes
+            for description in descriptions:
+                if description not in codes:
+                    codes[description] = len(self._labels)
+                    self._labels.append(description)
+            self._descriptions.extend(array('I', [codes[description] for description in descriptions]))
+
+    def __len__(self) -> int:
+        return len(self._dates) // _DATE_WIDTH
+
+    def __getitem__(self, index: int) -> DailyWeather:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("batch index out of range")
+        day = {field: values[index] for field, values in self._numbers.items()}
+        for field, kinds in self._kinds.items():
+            if kinds[index] == _INT:
+                day[field] = int(day[field])
+            elif kinds[index] == _NULL:
+                day[field] = None
+        day["date"] = self._dates[index * _DATE_WIDTH:(index + 1) * _DATE_WIDTH].decode("ascii")
+        if self._descriptions is not None:
+            day["weather_description"] = self._labels[self._descriptions[index]]
+        return DailyWeather.from_dict(day)
+
+    def __iter__(self) -> Iterator[DailyWeather]:
+        if any(_NULL in kinds for kinds in self._kinds.values()):
+            # from_dict tells nulls apart from the fields the batch does not have
+            return (DailyWeather.from_dict(dict(zip(self.fields, row))) for row in self.rows(self.fields))
+        columns = [self.column(field) if field in self.fields else repeat(None) for field in WEATHER_FIELDS]
+        return (DailyWeather(*values) for values in zip(*columns))
+
+    def column(self, field: str) -> Union[array, List[str]]:
+        """
+        Return all values of one field.
+
+        Args:
+            field (str): A field of the batch.
+
+        Returns:
+            array or list: The stored array for numeric fields (do not modify
+            it), a new list for a float column that also received integers or
+            nulls, or a new list of strings for ``date`` and ``weather_description``.
+
+        Raises:
+            KeyError: If the batch does not have the field.
+        """
+        if field == "date":
+            text = self._dates.decode("ascii")
+            return [text[start:start + _DATE_WIDTH] for start in range(0, len(text), _DATE_WIDTH)]
+        if field == "weather_description" and self._descriptions is not None:
+            labels = self._labels
+            return [labels[code] for code in self._descriptions]
+        if field in self._kinds:
+            return _restore_kinds(self._numbers[field], self._kinds[field])
+        if field in self._numbers:
+            return self._numbers[field]
+        raise KeyError(field)
+
+    def rows(self, fields: Sequence[str]) -> Iterator[Tuple]:
+        """
+        Yield one tuple of values per day, e.g. for a CSV writer.
+
+        Args:
+            fields (sequence of str): The fields to include, in order.
+
+        Returns:
+            iterator of tuple: The rows.
+        """
+        return zip(*(self.column(field) for field in fields))
+
+    def to_numpy(self, field: str) -> "np.ndarray":
+        """
+        Return one field as a NumPy array.
+
+        Numeric fields are zero-copy views of the stored arrays, which cannot
+        grow while a view exists, with nulls as NaN; dates and descriptions
+        are Unicode string arrays.
+
+        Args:
+            field (str): A field of the batch.
+
+        Returns:
+            numpy.ndarray: The values.
+
+        Raises:
+            KeyError: If the batch does not have the field.
+        """
+        import numpy as np
+
+        if field == "date":
+            return np.frombuffer(bytes(self._dates), dtype=f"S{_DATE_WIDTH}").astype(f"U{_DATE_WIDTH}")
+        if field == "weather_description" and self._descriptions is not None:
+            codes = np.frombuffer(self._descriptions, dtype=np.uint32) if self._descriptions else np.array([], np.intp)
+            return np.array(self._labels, dtype=str)[codes]
+        if field in self._numbers:
+            column = self._numbers[field]
+            return np.frombuffer(column, dtype=np.int64 if column.typecode == 'q' else np.float64)
+        raise KeyError(field)
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Return the days as the per-day dictionaries used by the tasks."""
+        return [dict(zip(self.fields, row)) for row in self.rows(self.fields)]
+
+    def to_buffers(self) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Describe the stored arrays for writing them to a binary file.
+
+        Returns:
+            tuple: A JSON-serializable layout (fields, array typecodes and the
+            description table) and a mapping of field name to an object
+            supporting the buffer protocol. The value kinds of a column are
+            stored under ``"<field>.kinds"``.
+        """
+        buffers: Dict[str, Any] = {"date": self._dates, **self._numbers}
+        if self._descriptions is not None:
+            buffers["weather_description"] = self._descriptions
+        buffers.update((f"{field}.kinds", kinds) for field, kinds in self._kinds.items())
+        layout = {
+            "fields": list(self.fields),
+            "count": len(self),
+            "typecodes": {field: column.typecode for field, column in buffers.items() if field != "date"},
+            "labels": list(self._labels),
+        }
+        return layout, buffers
+
+    @classmethod
+    def from_buffers(cls, layout: Mapping[str, Any], buffers: Mapping[str, Any]) -> "DailyWeatherBatch":
+        """
+        Rebuild a batch from the output of ``to_buffers``, e.g. read back from a file.
+
+        Args:
+            layout (dict): The layout returned by ``to_buffers``.
+            buffers (dict): Maps each field to its raw bytes (any buffer, such
+                as a slice of a memory map); the bytes are copied.
+
+        Returns:
+            DailyWeatherBatch: The batch.
+
+        Raises:
+            ValueError: If a buffer does not hold ``count`` values.
+        """
+        batch = cls(layout["fields"])
+        count = layout["count"]
+        batch._dates = bytearray(buffers["date"])
+        columns = {}
+        for field, typecode in layout["typecodes"].items():
+            column = array(typecode)
+            column.frombytes(buffers[field])
+            columns[field] = column
+        if len(batch._dates) != count * _DATE_WIDTH or any(len(column) != count for column in columns.values()):
+            raise ValueError("Buffer sizes do not match the number of days")
+        batch._numbers = {field: columns[field] for field in batch._numbers}
+        batch._kinds = {field: columns[f"{field}.kinds"] for field in batch._numbers if f"{field}.kinds" in columns}
+        if batch._descriptions is not None:
+            batch._descriptions = columns["weather_description"]
+            batch._labels = list(layout["labels"])
+            batch._label_codes = {label: code for code, label in enumerate(batch._labels)}
+        return batch
+
+    @property
+    def nbytes(self) -> int:
+        """The memory used by the stored values, in bytes."""
+        size = len(self._dates) + sum(column.itemsize * len(column) for column in self._numbers.values())
+        size += sum(len(kinds) for kinds in self._kinds.values())
+        if self._descriptions is not None:
+            size += self._descriptions.itemsize * len(self._descriptions)
+            size += sum(len(label) for label in self._labels)
+        return size
+
+
+def _restore_kinds(values: Iterable[float], kinds: Iterable[int]) -> List[Union[int, float]]:
+    """Convert the stored floats of a column back to the values recorded in ``kinds``."""
+    return [value if kind == _FLOAT else int(value) if kind == _INT else None for value, kind in zip(values, kinds)]
@@ -1,19 +1,41 @@
-import requests
-from bs4 import BeautifulSoup
-from typing import Dict
+import re
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from html.parser import HTMLParser
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Tuple
 
-try:
+if __package__:
     from .utils import save_to_json
-except ImportError:
+    from .instrumentation import instrumented
+    from .http_client import USER_AGENT, HostRateLimiter, create_session, get_with_retry
+    from .http_cache import HTTPCache, cached_get
+    from .async_http import AsyncHTTPClient
+else:
     from utils import save_to_json
+    from instrumentation import instrumented
+    from http_client import USER_AGENT, HostRateLimiter, create_session, get_with_retry
+    from http_cache import HTTPCache, cached_get
+    from async_http import AsyncHTTPClient
 
+# requests and bs4 dominate the import time of this module, so they are
+# imported by the functions that need them
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
 
-def fetch_wikipedia_page(url: str) -> str:
+WIKIPEDIA_URL = "https://en.wikipedia.org/wiki/Web_scraping"
+
+_CITATION_PATTERN = re.compile(r"\[\d+\]")
+_SENTENCE_END_PATTERN = re.compile(r"(?<=[.!?])\s")
+_FAST_PARSE_CHUNK_SIZE = 16 * 1024
+
+
+@instrumented(bytes_read=lambda html: len(html.encode('utf-8')))
+def fetch_wikipedia_page(url: str, cache: Optional[HTTPCache] = None) -> str:
     """
     Fetch the HTML content of the given Wikipedia page.
 
     Args:
         url (str): The URL of the Wikipedia page to fetch.
+        cache (HTTPCache, optional): Serve unchanged pages from this on-disk cache.
 
     Returns:
         str: The HTML content of the page as a string.
@@ -22,10 +44,122 @@ def fetch_wikipedia_page(url: str) -> str:
         requests.HTTPError: If the HTTP request returned an unsuccessful status code.
         requests.RequestException: If there was a network error.
     """
-    pass
+    if cache is not None:
+        return cached_get(url, cache).text
+    import requests
+
+    response = requests.get(url, headers={"User-Agent": USER_AGENT}, timeout=10)
+    response.raise_for_status()
+    return response.text
+
+
+async def afetch_wikipedia_page(url: str, client: Optional[AsyncHTTPClient] = None) -> str:
+    """
+    Fetch the HTML content of the given Wikipedia page without blocking the event loop.
+
+    Args:
+        url (str): The URL of the Wikipedia page to fetch.
+        client (AsyncHTTPClient, optional): An open client to share its connection
+            pool and concurrency limit. A client is opened for this request otherwise.
+
+    Returns:
+        str: The HTML content of the page as a string.
+
+    Raises:
+        ImportError: If aiohttp is not installed.
+        aiohttp.ClientResponseError: If the HTTP request returned an unsuccessful status code.
+        aiohttp.ClientError: If there was a network error.
+    """
+    if client is None:
+        async with AsyncHTTPClient() as client:
+            return await client.get_text(url)
+    return await client.get_text(url)
+
+
+def fetch_wikipedia_pages(urls: Iterable[str], max_workers: int = 8, requests_per_second: float = 5.0,
+                          retries: int = 3, backoff: float = 0.5,
+                          cache: Optional[HTTPCache] = None) -> Iterator[Tuple[str, str]]:
+    """
+    Fetch many Wikipedia pages concurrently over one pooled session.
+
+    At most ``max_workers`` requests are in flight at any time, requests to the
+    same host are spaced out to ``requests_per_second``, and transient failures
+    are retried with exponential backoff. Pages are yielded as they arrive, so
+    results are not necessarily in input order.
+
+    Args:
+        urls (iterable of str): The URLs of the pages to fetch.
+        max_workers (int): The maximum number of concurrent requests.
+        requests_per_second (float): The maximum request rate per host (0 disables limiting).
+        retries (int): The number of retries per page after the first attempt.
+        backoff (float): The base delay in seconds between retries.
+        cache (HTTPCache, optional): Serve unchanged pages from this on-disk cache.
+
+    Yields:
+        tuple: ``(url, html)`` for every fetched page.
+
+    Raises:
+        requests.HTTPError: If a page returned an unsuccessful status code after all retries.
+        requests.RequestException: If a page failed with a network error after all retries.
+    """
+    rate_limiter = HostRateLimiter(requests_per_second)
+    url_iter = iter(urls)
+    pending = {}
+
+    def fetch(session, url: str):
+        if cache is not None:
+            return cached_get(url, cache, session, retries=retries, backoff=backoff, rate_limiter=rate_limiter)
+        return get_with_retry(session, url, retries, backoff, rate_limiter)
+
+    with create_session(pool_size=max_workers) as session, ThreadPoolExecutor(max_workers) as executor:
+        def submit_next() -> bool:
+            url = next(url_iter, None)
+            if url is None:
+                return False
+            future = executor.submit(fetch, session, url)
+            pending[future] = url
+            return True
+
+        # Keep the window bounded so huge URL lists are not queued up front
+        while len(pending) < max_workers and submit_next():
+            pass
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                url = pending.pop(future)
+                try:
+                    response = future.result()
+                except Exception:
+                    for other in pending:
+                        other.cancel()
+                    raise
+                yield url, response.text
+                submit_next()
+
+
+def scrape_wikipedia_pages(urls: Iterable[str], fast: bool = True, **fetch_options) -> Iterator[Dict[str, str]]:
+    """
+    Fetch many Wikipedia pages and extract their title and first sentence as they arrive.
+
+    Args:
+        urls (iterable of str): The URLs of the pages to scrape.
+        fast (bool): Use ``extract_page_fields`` instead of building a full BeautifulSoup tree.
+        **fetch_options: Keyword arguments passed to ``fetch_wikipedia_pages``.
+
+    Yields:
+        dict: The ``url``, ``title`` and ``first_sentence`` of each page.
+    """
+    for url, html in fetch_wikipedia_pages(urls, **fetch_options):
+        if fast:
+            fields = extract_page_fields(html)
+        else:
+            from bs4 import BeautifulSoup
+            soup = BeautifulSoup(html, 'html.parser')
+            fields = {"title": extract_title(soup), "first_sentence": extract_first_sentence(soup)}
+        yield {"url": url, **fields}
 
 
-def extract_title(soup: BeautifulSoup) -> str:
+def extract_title(soup: "BeautifulSoup") -> str:
     """
     Extract the title of the Wikipedia page.
 
@@ -33,12 +167,13 @@ def extract_title(soup: BeautifulSoup) -> str:
         soup (BeautifulSoup): A BeautifulSoup object representing the parsed HTML.
 
     Returns:
-        str: The title of the page.
+        str: The title of the page, or an empty string if it has no title heading.
     """
-    pass
+    heading = soup.find('h1', id='firstHeading')
+    return heading.get_text().strip() if heading else ""
 
 
-def extract_first_sentence(soup: BeautifulSoup) -> str:
+def extract_first_sentence(soup: "BeautifulSoup") -> str:
     """
     Extract the first sentence of the first paragraph on the Wikipedia page.
 
@@ -48,33 +183,175 @@ def extract_first_sentence(soup: BeautifulSoup) -> str:
     Returns:
         str: The first sentence of the first paragraph.
     """
-    pass
+    container = soup.find('div', class_='mw-parser-output') or soup
+    for paragraph in container.find_all('p'):
+        text = paragraph.get_text().strip()
+        if text:
+            return _first_sentence(text)
+    return ""
 
 
-if __name__ == "__main__":
-    url = "https://en.wikipedia.org/wiki/Web_scraping"
+def _first_sentence(text: str) -> str:
+    """
+    Return the first sentence of a paragraph, without citation markers such as ``[1]``.
+
+    Args:
+        text (str): The paragraph text.
+
+    Returns:
+        str: The first sentence of the text.
+    """
+    text = _CITATION_PATTERN.sub("", text).strip()
+    return _SENTENCE_END_PATTERN.split(text, maxsplit=1)[0]
+
+
+class _FieldsFound(Exception):
+    """Raised by ``_WikipediaFieldParser`` to stop parsing once every field is known."""
+
+
+class _WikipediaFieldParser(HTMLParser):
+    """
+    Incremental parser that only tracks the title heading and the first paragraphs.
+
+    It mirrors ``extract_title`` and ``extract_first_sentence``: the title is the
+    text of ``<h1 id="firstHeading">`` and the paragraph is the first non-empty
+    ``<p>`` inside the first ``mw-parser-output`` div, or the first non-empty
+    ``<p>`` of the document when there is no such div.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.title: Optional[str] = None
+        self.body_paragraph: Optional[str] = None
+        self.fallback_paragraph: Optional[str] = None
+        self.container_seen = False
+        self._container_depth = 0
+        self._title_parts: Optional[List[str]] = None
+        self._paragraph_parts: Optional[List[str]] = None
+        self._paragraph_in_container = False
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ("script", "style"):
+            self._skip_depth += 1
+        elif tag == "p":
+            self._finish_paragraph()
+            self._paragraph_parts = []
+            self._paragraph_in_container = self._container_depth > 0
+        elif tag == "div":
+            if self._container_depth:
+                self._container_depth += 1
+            elif not self.container_seen and "mw-parser-output" in (dict(attrs).get("class") or "").split():
+                self.container_seen = True
+                self._container_depth = 1
+        elif tag == "h1" and self.title is None and self._title_parts is None and dict(attrs).get("id") == "firstHeading":
+            self._title_parts = []
+
+    def handle_endtag(self, tag):
+        if tag in ("script", "style"):
+            self._skip_depth = max(self._skip_depth - 1, 0)
+        elif tag == "p":
+            self._finish_paragraph()
+        elif tag == "div" and self._container_depth:
+            self._container_depth -= 1
+        elif tag == "h1" and self._title_parts is not None:
+            self.title = "".join(self._title_parts).strip()
+            self._title_parts = None
+        if self.title is not None and self.body_paragraph is not None:
+            raise _FieldsFound
+
+    def handle_data(self, data):
+        if self._skip_depth:
+            return
+        if self._title_parts is not None:
+            self._title_parts.append(data)
+        if self._paragraph_parts is not None:
+            self._paragraph_parts.append(data)
+
+    def _finish_paragraph(self) -> None:
+        if self._paragraph_parts is None:
+            return
+        text = "".join(self._paragraph_parts).strip()
+        self._paragraph_parts = None
+        if not text:
+            return
+        if self._paragraph_in_container:
+            if self.body_paragraph is None:
+                self.body_paragraph = text
+        elif self.fallback_paragraph is None and not self.container_seen:
+            self.fallback_paragraph = text
+
+    @property
+    def paragraph(self) -> Optional[str]:
+        return self.body_paragraph if self.container_seen else self.fallback_paragraph
+
+
+@instrumented()
+def extract_page_fields(html: str) -> Dict[str, str]:
+    """
+    Extract the title and first sentence without building a BeautifulSoup tree.
+
+    The HTML is fed to an incremental ``HTMLParser`` in chunks and parsing stops
+    as soon as both fields are found, so the rest of a large article is never
+    tokenized. The result matches ``extract_title`` and ``extract_first_sentence``.
+
+    Args:
+        html (str): The HTML content of the page.
+
+    Returns:
+        dict: The ``title`` and ``first_sentence`` of the page.
+    """
+    parser = _WikipediaFieldParser()
     try:
-        page_content = fetch_wikipedia_page(url)
-        soup = BeautifulSoup(page_content, 'html.parser')
+        for start in range(0, len(html), _FAST_PARSE_CHUNK_SIZE):
+            parser.feed(html[start:start + _FAST_PARSE_CHUNK_SIZE])
+        parser.close()
+        parser._finish_paragraph()
+    except _FieldsFound:
+        pass
+    paragraph = parser.paragraph
+    return {
+        "title": parser.title or "",
+        "first_sentence": _first_sentence(paragraph) if paragraph else "",
+    }
 
-        # Extract the title of the page
-        title = extract_title(soup)
 
-        # Extract the first sentence of the first paragraph
-        first_sentence = extract_first_sentence(soup)
+@instrumented()
+def run(url: str = WIKIPEDIA_URL, json_file: str = "extracted_wikipedia_data.json",
+        cache: Optional[HTTPCache] = None) -> Dict[str, str]:
+    """
+    Scrape the title and first sentence of a Wikipedia page into a JSON file.
 
-        # Combine the extracted data
-        extracted_data = {
-            "title": title,
-            "first_sentence": first_sentence
-        }
+    Args:
+        url (str): The URL of the Wikipedia page.
+        json_file (str): The name of the JSON file to write.
+        cache (HTTPCache, optional): Serve an unchanged page from this on-disk cache.
 
-        # Print the extracted data
-        print("Extracted Data:", extracted_data)
+    Returns:
+        dict: The extracted ``title`` and ``first_sentence``.
+    """
+    from bs4 import BeautifulSoup
+
+    page_content = fetch_wikipedia_page(url, cache=cache)
+    soup = BeautifulSoup(page_content, 'html.parser')
+
+    # Combine the extracted data
+    extracted_data = {
+        "title": extract_title(soup),
+        "first_sentence": extract_first_sentence(soup)
+    }
 
-        # Save the data to a JSON file
-        save_to_json(extracted_data, 'extracted_wikipedia_data.json')
+    # Save the data to a JSON file
+    save_to_json(extracted_data, json_file, pretty=True)
+    return extracted_data
 
+
+if __name__ == "__main__":
+    try:
+        extracted_data = run(cache=HTTPCache())
+
+        # Print the extracted data
+        print("Extracted Data:", extracted_data)
         print("Data successfully saved to extracted_wikipedia_data.json")
     except Exception as e:
         print(f"An error occurred: {e}")
@@ -1,16 +1,36 @@
-import requests
-from typing import Dict
+import math
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlencode
 
-try:
+if __package__:
     from .utils import save_to_json
-except ImportError:
+    from .instrumentation import instrumented
+    from .http_client import create_session, get_with_retry
+    from .http_cache import HTTPCache, cached_get
+    from .async_http import AsyncHTTPClient
+else:
     from utils import save_to_json
+    from instrumentation import instrumented
+    from http_client import create_session, get_with_retry
+    from http_cache import HTTPCache, cached_get
+    from async_http import AsyncHTTPClient
 
+OPEN_METEO_URL = "https://api.open-meteo.com/v1/forecast"
+TOKYO_FORECAST_QUERY = "latitude=35.6895&longitude=139.6917&daily=temperature_2m_max&timezone=Asia/Tokyo"
 
-def fetch_weather_data() -> Dict[str, any]:
+Location = Tuple[float, float]
+
+
+@instrumented()
+def fetch_weather_data(cache: Optional[HTTPCache] = None) -> Dict[str, any]:
     """
     Fetch the maximum temperature forecast for Tokyo using the Open-Meteo API.
 
+    Args:
+        cache (HTTPCache, optional): Serve an unchanged forecast from this on-disk cache.
+
     Returns:
         dict: A dictionary containing the date and the maximum temperature.
 
@@ -19,19 +39,169 @@ def fetch_weather_data() -> Dict[str, any]:
         requests.RequestException: If there was a network error.
         KeyError: If the expected data is not in the API response.
     """
-    url = ("https://api.open-meteo.com/v1/forecast?latitude=35.6895&longitude=139.6917"
-           "&daily=temperature_2m_max&timezone=Asia/Tokyo")
-    
-    pass
+    url = f"{OPEN_METEO_URL}?{TOKYO_FORECAST_QUERY}"
+
+    if cache is not None:
+        payload = cached_get(url, cache).json()
+    else:
+        # Deferred so that importing this module does not load requests
+        import requests
+
+        response = requests.get(url, timeout=10)
+        response.raise_for_status()
+        payload = response.json()
+    return _first_day(payload)
+
+
+async def afetch_weather_data(client: Optional[AsyncHTTPClient] = None,
+                              base_url: str = OPEN_METEO_URL) -> Dict[str, any]:
+    """
+    Fetch the maximum temperature forecast for Tokyo without blocking the event loop.
+
+    Args:
+        client (AsyncHTTPClient, optional): An open client to share its connection
+            pool and concurrency limit. A client is opened for this request otherwise.
+        base_url (str): The forecast endpoint.
+
+    Returns:
+        dict: A dictionary containing the date and the maximum temperature.
+
+    Raises:
+        ImportError: If aiohttp is not installed.
+        aiohttp.ClientResponseError: If the HTTP request returned an unsuccessful status code.
+        aiohttp.ClientError: If there was a network error.
+        KeyError: If the expected data is not in the API response.
+    """
+    url = f"{base_url}?{TOKYO_FORECAST_QUERY}"
+    if client is None:
+        async with AsyncHTTPClient() as client:
+            return _first_day(await client.get_json(url))
+    return _first_day(await client.get_json(url))
+
+
+def _first_day(payload: Dict[str, Any]) -> Dict[str, any]:
+    """Return the date and maximum temperature of the first forecast day."""
+    daily = payload["daily"]
+    return {"date": daily["time"][0], "max_temperature": daily["temperature_2m_max"][0]}
+
+
+def _batch_url(base_url: str, locations: Sequence[Location], variables: Sequence[str], timezone: str) -> str:
+    """
+    Build a multi-location Open-Meteo request URL.
+
+    Args:
+        base_url (str): The forecast endpoint.
+        locations (list of tuple): The ``(latitude, longitude)`` pairs to request.
+        variables (list of str): The daily variables to request.
+        timezone (str): The timezone used for the daily aggregation.
+
+    Returns:
+        str: The request URL.
+    """
+    query = urlencode({
+        "latitude": ",".join(str(lat) for lat, _ in locations),
+        "longitude": ",".join(str(lon) for _, lon in locations),
+        "daily": ",".join(variables),
+        "timezone": timezone,
+    }, safe=",/")
+    return f"{base_url}?{query}"
+
+
+def _to_columns(payload: Dict[str, Any], variables: Sequence[str]) -> Dict[str, Any]:
+    """
+    Convert the ``daily`` block of one location into compact columns.
+
+    Args:
+        payload (dict): The API response for a single location.
+        variables (list of str): The requested daily variables.
+
+    Returns:
+        dict: ``time`` as a list of dates and each variable as an ``array('d')``,
+        with missing values stored as NaN.
+    """
+    daily = payload["daily"]
+    columns: Dict[str, Any] = {"time": daily["time"]}
+    for variable in variables:
+        columns[variable] = array('d', (math.nan if value is None else value for value in daily[variable]))
+    return columns
+
+
+@instrumented(rows=len)
+def fetch_weather_batch(locations: Sequence[Location], variables: Sequence[str] = ("temperature_2m_max",),
+                        timezone: str = "auto", chunk_size: int = 100, max_workers: int = 4,
+                        base_url: str = OPEN_METEO_URL,
+                        cache: Optional[HTTPCache] = None) -> Dict[Location, Dict[str, Any]]:
+    """
+    Fetch daily forecasts for many locations using multi-location requests.
+
+    Open-Meteo accepts comma-separated latitudes and longitudes, so locations are
+    grouped into chunks of ``chunk_size`` and each chunk costs a single request.
+    Chunks are fetched concurrently over one pooled session.
+
+    Args:
+        locations (list of tuple): The ``(latitude, longitude)`` pairs to fetch.
+        variables (list of str): The daily variables to request.
+        timezone (str): The timezone used for the daily aggregation.
+        chunk_size (int): The maximum number of locations per request.
+        max_workers (int): The maximum number of concurrent requests.
+        base_url (str): The forecast endpoint.
+        cache (HTTPCache, optional): Serve unchanged forecasts from this on-disk cache.
+
+    Returns:
+        dict: Maps each requested ``(latitude, longitude)`` to its columns:
+        ``time`` (list of dates) and one ``array('d')`` per variable.
+
+    Raises:
+        requests.HTTPError: If a request returned an unsuccessful status code.
+        requests.RequestException: If there was a network error.
+        KeyError: If the expected data is not in the API response.
+    """
+    locations = list(locations)
+    chunks = [locations[start:start + chunk_size] for start in range(0, len(locations), chunk_size)]
+
+    with create_session(pool_size=max_workers) as session:
+        def fetch_chunk(chunk: List[Location]) -> List[Dict[str, Any]]:
+            url = _batch_url(base_url, chunk, variables, timezone)
+            if cache is not None:
+                payload = cached_get(url, cache, session).json()
+            else:
+                payload = get_with_retry(session, url).json()
+            # A single location comes back as an object instead of a list
+            return payload if isinstance(payload, list) else [payload]
+
+        with ThreadPoolExecutor(max_workers) as executor:
+            responses = list(executor.map(fetch_chunk, chunks))
+
+    result: Dict[Location, Dict[str, Any]] = {}
+    for chunk, payloads in zip(chunks, responses):
+        if len(payloads) != len(chunk):
+            raise KeyError(f"Expected {len(chunk)} locations in the API response, got {len(payloads)}")
+        for location, payload in zip(chunk, payloads):
+            result[location] = _to_columns(payload, variables)
+    return result
+
+
+@instrumented()
+def run(json_file: str = "tokyo_weather.json", cache: Optional[HTTPCache] = None) -> Dict[str, any]:
+    """
+    Fetch the Tokyo forecast and save it to a JSON file.
+
+    Args:
+        json_file (str): The name of the JSON file to write.
+        cache (HTTPCache, optional): Serve an unchanged forecast from this on-disk cache.
+
+    Returns:
+        dict: The date and the maximum temperature.
+    """
+    weather_data = fetch_weather_data(cache=cache)
+    save_to_json(weather_data, json_file, pretty=True)
+    return weather_data
 
 
 if __name__ == "__main__":
     try:
-        # Fetch the weather data
-        weather_data = fetch_weather_data()
-
-        # Save the data to a JSON file
-        save_to_json(weather_data, "tokyo_weather.json")
+        # Fetch the weather data and save it to a JSON file
+        run(cache=HTTPCache())
 
         print("Data successfully saved to tokyo_weather.json")
     except Exception as e:
@@ -1,9 +1,29 @@
-from typing import Dict, List, Any
+from typing import TYPE_CHECKING, Dict, List, Any, Mapping, Optional, Sequence, Union
 
-try:
-    from .utils import load_json
-except ImportError:
-    from utils import load_json
+if __package__:
+    from .utils import load_json, load_json_batch, load_json_stream
+    from .records import DailyWeatherBatch
+    from .instrumentation import instrumented, record
+    from .incremental import DEFAULT_STATE_FILE, IncrementalState, days_after
+    from .parse_cache import ParseCache
+else:
+    from utils import load_json, load_json_batch, load_json_stream
+    from records import DailyWeatherBatch
+    from instrumentation import instrumented, record
+    from incremental import DEFAULT_STATE_FILE, IncrementalState, days_after
+    from parse_cache import ParseCache
+
+# NumPy is only needed by the columnar functions, which import it on first use
+if TYPE_CHECKING:
+    import numpy as np
+
+
+DAILY_FIELDS = ("date", "max_temperature", "min_temperature", "precipitation",
+                "wind_speed", "humidity", "weather_description")
+
+# The record days of the summary report and the field each one maximizes
+SUMMARY_EXTREMES = (("hottest", "max_temperature"), ("windiest", "wind_speed"),
+                    ("most_humid", "humidity"), ("rainiest", "precipitation"))
 
 
 def analyze_daily_weather(day: Dict[str, Any], temp_threshold: float = 30, 
@@ -20,7 +40,20 @@ def analyze_daily_weather(day: Dict[str, Any], temp_threshold: float = 30,
     Returns:
         dict: A dictionary with analysis results for the day.
     """
-    pass
+    return {
+        "date": day["date"],
+        "is_hot_day": day["max_temperature"] > temp_threshold,
+        "max_temperature": day["max_temperature"],
+        "min_temperature": day["min_temperature"],
+        "temperature_swing": day["max_temperature"] - day["min_temperature"],
+        "is_windy_day": day["wind_speed"] > wind_threshold,
+        "wind_speed": day["wind_speed"],
+        "is_uncomfortable_day": day["humidity"] > humidity_threshold,
+        "humidity": day["humidity"],
+        "is_rainy_day": day["precipitation"] > 0,
+        "precipitation": day["precipitation"],
+        "weather_description": day["weather_description"],
+    }
 
 
 def generate_daily_report(analysis: Dict[str, Any]) -> str:
@@ -33,9 +66,28 @@ def generate_daily_report(analysis: Dict[str, Any]) -> str:
     Returns:
         str: A detailed report as a string.
     """
-    pass
+    lines = [
+        f"Date: {analysis['date']}",
+        f"Weather: {analysis['weather_description']}",
+        f"Temperature: Max {analysis['max_temperature']}°C, Min {analysis['min_temperature']}°C "
+        f"(Swing: {analysis['temperature_swing']:.1f}°C)",
+    ]
+    if analysis["is_hot_day"]:
+        lines.append("It was a hot day.")
+    if analysis["temperature_swing"] > 10:
+        lines.append("There was a significant temperature swing.")
+    if analysis["is_windy_day"]:
+        lines.append("It was a windy day.")
+    if analysis["is_uncomfortable_day"]:
+        lines.append("The humidity made the day uncomfortable.")
+    if analysis["is_rainy_day"]:
+        lines.append("It was a rainy day.")
+    else:
+        lines.append("There was no precipitation.")
+    return "\n".join(lines) + "\n"
 
 
+@instrumented()
 def summarize_weather_analysis(analyses: List[Dict[str, Any]]) -> str:
     """
     Summarize the weather analysis over multiple days.
@@ -46,28 +98,226 @@ def summarize_weather_analysis(analyses: List[Dict[str, Any]]) -> str:
     Returns:
         str: A summary report as a string.
     """
-    pass
+    if not analyses:
+        return "Weather Summary:\nNo weather data to summarize."
+    return _format_summary(**_extreme_days(analyses))
+
+
+def _extreme_days(analyses: Sequence[Mapping[str, Any]],
+                  previous: Optional[Mapping[str, Mapping[str, Any]]] = None) -> Dict[str, Mapping[str, Any]]:
+    """
+    Find the record days of the summary report.
+
+    Args:
+        analyses (list of dict): Daily analysis results, in date order.
+        previous (dict, optional): Record days found in earlier runs; they win ties
+            because they come first.
+
+    Returns:
+        dict: The record day for every name in ``SUMMARY_EXTREMES``.
+    """
+    return {
+        name: max([previous[name]] + list(analyses) if previous else analyses, key=lambda a: a[field])
+        for name, field in SUMMARY_EXTREMES
+    }
+
+
+def _format_summary(hottest: Mapping[str, Any], windiest: Mapping[str, Any],
+                    most_humid: Mapping[str, Any], rainiest: Mapping[str, Any]) -> str:
+    """
+    Format the summary report shared by the per-day and columnar paths.
+
+    Args:
+        hottest (dict): The day with the highest maximum temperature.
+        windiest (dict): The day with the highest wind speed.
+        most_humid (dict): The day with the highest humidity.
+        rainiest (dict): The day with the most precipitation.
+
+    Returns:
+        str: A summary report as a string.
+    """
+    return "\n".join([
+        "Weather Summary:",
+        f"Hottest day: {hottest['date']} with a maximum temperature of {hottest['max_temperature']}°C",
+        f"Windiest day: {windiest['date']} with wind speeds of {windiest['wind_speed']} km/h",
+        f"Most humid day: {most_humid['date']} with a humidity level of {most_humid['humidity']}%",
+        f"Rainiest day: {rainiest['date']} with {rainiest['precipitation']} mm of precipitation",
+    ])
+
+
+def _to_columns(daily: Union[Sequence[Mapping[str, Any]], Mapping[str, Sequence[Any]], Any]) -> Dict[str, "np.ndarray"]:
+    """
+    Convert daily weather data into a dictionary of NumPy columns.
+
+    Args:
+        daily: Either a ``DailyWeatherBatch``, a pandas DataFrame, a mapping of
+            column name to values, or a list of per-day dictionaries as found in
+            the JSON ``daily`` array.
+
+    Returns:
+        dict: A mapping of field name to a NumPy array of equal length.
+    """
+    import numpy as np
+
+    if isinstance(daily, DailyWeatherBatch):
+        return {field: daily.to_numpy(field) for field in DAILY_FIELDS}
+    if hasattr(daily, "columns"):
+        return {field: daily[field].to_numpy() for field in DAILY_FIELDS}
+    if isinstance(daily, Mapping):
+        return {field: np.asarray(daily[field]) for field in DAILY_FIELDS}
+    return {field: np.array([day[field] for day in daily]) for field in DAILY_FIELDS}
+
+
+@instrumented(rows=lambda analysis: len(analysis["date"]))
+def analyze_weather_columns(daily: Union[Sequence[Mapping[str, Any]], Mapping[str, Sequence[Any]], Any],
+                            temp_threshold: float = 30, wind_threshold: float = 15,
+                            humidity_threshold: float = 70) -> Dict[str, "np.ndarray"]:
+    """
+    Analyze weather data for many days at once in a single vectorized pass.
+
+    This is the columnar counterpart of ``analyze_daily_weather``: every key of
+    the per-day result becomes a NumPy array with one entry per day.
+
+    Args:
+        daily: The whole ``daily`` array, as a ``DailyWeatherBatch``, a list of
+            day dictionaries, a mapping of column name to values, or a pandas DataFrame.
+        temp_threshold (float): The temperature threshold to determine a hot day.
+        wind_threshold (float): The wind speed threshold to determine a windy day.
+        humidity_threshold (float): The humidity threshold to determine uncomfortable weather.
+
+    Returns:
+        dict: A mapping of analysis field name to a NumPy array.
+    """
+    columns = _to_columns(daily)
+    max_temperature = columns["max_temperature"]
+    min_temperature = columns["min_temperature"]
+    wind_speed = columns["wind_speed"]
+    humidity = columns["humidity"]
+    precipitation = columns["precipitation"]
+    return {
+        "date": columns["date"],
+        "is_hot_day": max_temperature > temp_threshold,
+        "max_temperature": max_temperature,
+        "min_temperature": min_temperature,
+        "temperature_swing": max_temperature - min_temperature,
+        "is_windy_day": wind_speed > wind_threshold,
+        "wind_speed": wind_speed,
+        "is_uncomfortable_day": humidity > humidity_threshold,
+        "humidity": humidity,
+        "is_rainy_day": precipitation > 0,
+        "precipitation": precipitation,
+        "weather_description": columns["weather_description"],
+    }
+
+
+def columns_to_analyses(analysis: Mapping[str, "np.ndarray"]) -> List[Dict[str, Any]]:
+    """
+    Expand columnar analysis results into the per-day dictionaries
+    returned by ``analyze_daily_weather``.
+
+    Args:
+        analysis (dict): The result of ``analyze_weather_columns``.
+
+    Returns:
+        list of dict: One analysis dictionary per day, with plain Python values.
+    """
+    fields = list(analysis)
+    values = [analysis[field].tolist() for field in fields]
+    return [dict(zip(fields, row)) for row in zip(*values)]
+
+
+def summarize_weather_columns(analysis: Mapping[str, "np.ndarray"]) -> str:
+    """
+    Summarize columnar analysis results in one vectorized pass.
+
+    Produces the same report as ``summarize_weather_analysis`` does for the
+    equivalent list of per-day analyses.
+
+    Args:
+        analysis (dict): The result of ``analyze_weather_columns``.
+
+    Returns:
+        str: A summary report as a string.
+    """
+    import numpy as np
+
+    if len(analysis["date"]) == 0:
+        return summarize_weather_analysis([])
+
+    def row(index: int) -> Dict[str, Any]:
+        return {field: values[index].item() if hasattr(values[index], "item") else values[index]
+                for field, values in analysis.items()}
+
+    return _format_summary(
+        row(int(np.argmax(analysis["max_temperature"]))),
+        row(int(np.argmax(analysis["wind_speed"]))),
+        row(int(np.argmax(analysis["humidity"]))),
+        row(int(np.argmax(analysis["precipitation"]))),
+    )
+
+
+@instrumented()
+def run(json_file: str, incremental: bool = False, state_file: str = DEFAULT_STATE_FILE,
+        parse_cache: Optional[ParseCache] = None) -> str:
+    """
+    Analyze the daily weather and build the daily reports and the summary report.
+
+    In incremental mode only the days dated after the last processed day are
+    analyzed and reported. The summary still covers every day: the record days
+    found so far are saved in ``state_file`` and compared with the new days.
+
+    Args:
+        json_file (str): Path to the daily weather JSON file.
+        incremental (bool): Only analyze days added since the last run.
+        state_file (str): The file holding the progress of incremental runs.
+        parse_cache (ParseCache, optional): Reuse the parsed days of an
+            unchanged JSON file in full runs.
+
+    Returns:
+        str: The daily reports followed by the summary report.
+    """
+    if not incremental:
+        if parse_cache is not None:
+            days = parse_cache.parse(json_file, "json-daily", lambda f: load_json_batch(f)['daily'])
+        else:
+            days = load_json(json_file)['daily']
+        analyses = [analyze_daily_weather(day) for day in days]
+        record(rows=len(analyses))
+        reports = [generate_daily_report(analysis) for analysis in analyses]
+        return "\n".join(reports + [summarize_weather_analysis(analyses)])
+
+    state = IncrementalState(state_file)
+    progress = state.get("task3", json_file)
+    days = days_after(load_json_stream(json_file)['daily'], progress.get("last_date"))
+    analyses = [analyze_daily_weather(day) for day in days]
+    record(rows=len(analyses))
+    reports = [generate_daily_report(analysis) for analysis in analyses]
+    if not analyses and not progress.get("extremes"):
+        return "\n".join(reports + [summarize_weather_analysis(analyses)])
+
+    extremes = _extreme_days(analyses, progress.get("extremes"))
+    if analyses:
+        # Only the fields used by the summary are kept in the state file
+        saved = {name: {"date": extremes[name]["date"], field: extremes[name][field]}
+                 for name, field in SUMMARY_EXTREMES}
+        state.update("task3", json_file, last_date=analyses[-1]["date"], extremes=saved)
+        state.save()
+    return "\n".join(reports + [_format_summary(**extremes)])
 
 
 if __name__ == "__main__":
+    import argparse
+    import os
+    parser = argparse.ArgumentParser(description="Analyze the Tokyo weather data.")
+    parser.add_argument("--incremental", action="store_true", help="only analyze days added since the last run")
+    parser.add_argument("--state-file", default=DEFAULT_STATE_FILE, help="progress file for incremental runs")
+    args = parser.parse_args()
     try:
-        # Load the JSON data
-        import os
         # Get the directory where this script is located
         script_dir = os.path.dirname(os.path.abspath(__file__))
         json_path = os.path.join(script_dir, "tokyo_weather_complex.json")
-        weather_data = load_json(json_path)
-
-        # Analyze the weather data for each day
-        analyses = [analyze_daily_weather(day) for day in weather_data['daily']]
-
-        # Generate and print daily reports
-        for analysis in analyses:
-            report = generate_daily_report(analysis)
-            print(report)
 
-        # Generate and print a summary report
-        summary_report = summarize_weather_analysis(analyses)
-        print(summary_report)
+        # Generate and print the daily reports and the summary report
+        print(run(json_path, incremental=args.incremental, state_file=args.state_file))
     except Exception as e:
         print(f"An error occurred: {e}")
@@ -1,65 +1,482 @@
 import csv
-from typing import Dict, List, Union, TextIO
+import os
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union, TextIO
 
-try:
-    from .utils import load_json
-except ImportError:
-    from utils import load_json
+if __package__:
+    from .utils import load_json, load_json_batch, load_json_stream, open_text_output
+    from .instrumentation import instrumented, record
+    from .arrow_export import arrow_available, write_table
+    from .records import DailyWeatherBatch
+    from .incremental import DEFAULT_STATE_FILE, IncrementalState, days_after
+    from .parse_cache import ParseCache
+else:
+    from utils import load_json, load_json_batch, load_json_stream, open_text_output
+    from instrumentation import instrumented, record
+    from arrow_export import arrow_available, write_table
+    from records import DailyWeatherBatch
+    from incremental import DEFAULT_STATE_FILE, IncrementalState, days_after
+    from parse_cache import ParseCache
 
+EXPORT_COLUMNS = [
+    ("Date", "date32"), ("Max Temperature", "float32"), ("Min Temperature", "float32"),
+    ("Precipitation", "float32"), ("Wind Speed", "float32"), ("Humidity", "float32"),
+    ("Weather Description", "string"), ("Is Hot Day", "bool_"), ("Is Windy Day", "bool_"),
+    ("Is Rainy Day", "bool_"),
+]
 
-def summarize_weather_data(data: List[Dict[str, any]]) -> Dict[str, float]:
+
+# Daily fields tracked by WeatherSummaryAggregator
+SUMMARY_FIELDS = ("max_temperature", "min_temperature", "precipitation", "wind_speed", "humidity")
+
+
+class _RunningStats:
+    """
+    Streaming count, sum, min, max and Welford mean/variance of one field.
+    """
+    __slots__ = ("count", "total", "mean", "m2", "minimum", "maximum")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = None
+        self.maximum = None
+
+    def update(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+
+    def update_batch(self, values: Sequence[float]) -> None:
+        """Add a batch of values, computing its mean and variance in two passes over the sequence."""
+        if not values:
+            return
+        batch = _RunningStats()
+        batch.count = len(values)
+        batch.total = float(sum(values))
+        batch.mean = batch.total / batch.count
+        mean = batch.mean
+        batch.m2 = sum((value - mean) * (value - mean) for value in values)
+        batch.minimum = min(values)
+        batch.maximum = max(values)
+        self.merge(batch)
+
+    def merge(self, other: "_RunningStats") -> None:
+        """Combine with another accumulator using Chan et al.'s parallel update."""
+        if not other.count:
+            return
+        if not self.count:
+            for name in self.__slots__:
+                setattr(self, name, getattr(other, name))
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    def to_state(self) -> Dict[str, float]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, float]) -> "_RunningStats":
+        stats = cls()
+        for name in cls.__slots__:
+            setattr(stats, name, state[name])
+        return stats
+
+    def to_dict(self) -> Dict[str, float]:
+        variance = self.m2 / (self.count - 1) if self.count > 1 else 0.0
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "variance": variance,
+            "std": variance ** 0.5,
+            "min": self.minimum,
+            "max": self.maximum,
+        }
+
+
+class WeatherSummaryAggregator:
+    """
+    Incremental version of ``summarize_weather_data``.
+
+    Days can be added one at a time with ``update`` and partial aggregators
+    built by parallel workers can be combined with ``merge``, so a summary can
+    be kept up to date without re-reading earlier days. Memory use does not
+    grow with the number of days.
+
+    Args:
+        temp_threshold (float): The temperature threshold to determine a hot day.
+        wind_threshold (float): The wind speed threshold to determine a windy day.
+    """
+
+    def __init__(self, temp_threshold: float = 30, wind_threshold: float = 15) -> None:
+        self.temp_threshold = temp_threshold
+        self.wind_threshold = wind_threshold
+        self.stats = {field: _RunningStats() for field in SUMMARY_FIELDS}
+        self.hot_days = 0
+        self.windy_days = 0
+        self.rainy_days = 0
+
+    @property
+    def count(self) -> int:
+        """The number of days aggregated so far."""
+        return self.stats["max_temperature"].count
+
+    def update(self, day: Dict[str, any]) -> "WeatherSummaryAggregator":
+        """
+        Add one day to the summary.
+
+        Args:
+            day (dict): A daily weather record.
+
+        Returns:
+            WeatherSummaryAggregator: This aggregator, to allow chaining.
+        """
+        for field, stats in self.stats.items():
+            stats.update(day[field])
+        self.hot_days += day["max_temperature"] > self.temp_threshold
+        self.windy_days += day["wind_speed"] > self.wind_threshold
+        self.rainy_days += day["precipitation"] > 0
+        return self
+
+    def update_many(self, days: Iterable[Dict[str, any]], batch_size: int = 65536) -> "WeatherSummaryAggregator":
+        """
+        Add many days to the summary.
+
+        Days are read in batches of ``batch_size``; each batch is reduced with
+        builtins over per-field lists and merged in, which is several times
+        faster than calling ``update`` per day. Memory use stays bounded by
+        the batch size. A ``DailyWeatherBatch`` is reduced directly from its
+        columns.
+
+        Args:
+            days (iterable of dict or DailyWeatherBatch): The daily weather records.
+            batch_size (int): The number of days reduced at a time.
+
+        Returns:
+            WeatherSummaryAggregator: This aggregator, to allow chaining.
+        """
+        if isinstance(days, DailyWeatherBatch):
+            # Slices of the same size as below give bit-identical sums
+            columns = {field: days.column(field) for field in SUMMARY_FIELDS}
+            for start in range(0, len(days), batch_size):
+                self._update_columns({field: values[start:start + batch_size] for field, values in columns.items()})
+            return self
+        days = iter(days)
+        while True:
+            batch = list(islice(days, batch_size))
+            if not batch:
+                return self
+            self._update_columns({field: [day[field] for day in batch] for field in SUMMARY_FIELDS})
+
+    def _update_columns(self, columns: Dict[str, Sequence[float]]) -> None:
+        """Add a batch of days given as one sequence of values per field of ``SUMMARY_FIELDS``."""
+        for field, stats in self.stats.items():
+            stats.update_batch(columns[field])
+        self.hot_days += sum(value > self.temp_threshold for value in columns["max_temperature"])
+        self.windy_days += sum(value > self.wind_threshold for value in columns["wind_speed"])
+        self.rainy_days += sum(value > 0 for value in columns["precipitation"])
+
+    def merge(self, other: "WeatherSummaryAggregator") -> "WeatherSummaryAggregator":
+        """
+        Add the days aggregated by another aggregator to this one.
+
+        Args:
+            other (WeatherSummaryAggregator): The aggregator to merge in.
+
+        Returns:
+            WeatherSummaryAggregator: This aggregator, to allow chaining.
+
+        Raises:
+            ValueError: If the aggregators use different thresholds.
+        """
+        if (other.temp_threshold, other.wind_threshold) != (self.temp_threshold, self.wind_threshold):
+            raise ValueError("Cannot merge aggregators with different thresholds")
+        for field, stats in self.stats.items():
+            stats.merge(other.stats[field])
+        self.hot_days += other.hot_days
+        self.windy_days += other.windy_days
+        self.rainy_days += other.rainy_days
+        return self
+
+    def result(self) -> Dict[str, float]:
+        """
+        Return the summary of the days aggregated so far.
+
+        Returns:
+            dict: The same keys as ``summarize_weather_data``.
+        """
+        stats = {field: stats.to_dict() for field, stats in self.stats.items()}
+        return {
+            "average_max_temp": stats["max_temperature"]["mean"],
+            "average_min_temp": stats["min_temperature"]["mean"],
+            "total_precipitation": stats["precipitation"]["sum"],
+            "average_wind_speed": stats["wind_speed"]["mean"],
+            "average_humidity": stats["humidity"]["mean"],
+            "hot_days": self.hot_days,
+            "windy_days": self.windy_days,
+            "rainy_days": self.rainy_days,
+        }
+
+    def statistics(self) -> Dict[str, Dict[str, float]]:
+        """
+        Return the detailed statistics of every tracked field.
+
+        Returns:
+            dict: For each field in ``SUMMARY_FIELDS``, its count, sum, mean,
+            sample variance, standard deviation, min and max.
+        """
+        return {field: stats.to_dict() for field, stats in self.stats.items()}
+
+    def to_state(self) -> Dict[str, any]:
+        """
+        Return the internal state as JSON-serializable data, e.g. to resume
+        the summary in a later incremental run.
+
+        Returns:
+            dict: The state accepted by ``from_state``.
+        """
+        return {
+            "temp_threshold": self.temp_threshold,
+            "wind_threshold": self.wind_threshold,
+            "hot_days": self.hot_days,
+            "windy_days": self.windy_days,
+            "rainy_days": self.rainy_days,
+            "stats": {field: stats.to_state() for field, stats in self.stats.items()},
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, any]) -> "WeatherSummaryAggregator":
+        """
+        Rebuild an aggregator from the data returned by ``to_state``.
+
+        Args:
+            state (dict): The saved state.
+
+        Returns:
+            WeatherSummaryAggregator: The restored aggregator.
+        """
+        aggregator = cls(state["temp_threshold"], state["wind_threshold"])
+        aggregator.hot_days = state["hot_days"]
+        aggregator.windy_days = state["windy_days"]
+        aggregator.rainy_days = state["rainy_days"]
+        aggregator.stats = {field: _RunningStats.from_state(state["stats"][field]) for field in SUMMARY_FIELDS}
+        return aggregator
+
+
+@instrumented()
+def summarize_weather_data(data: Iterable[Dict[str, any]], temp_threshold: float = 30,
+                           wind_threshold: float = 15) -> Dict[str, float]:
     """
     Summarize the weather data across all days.
 
+    The data is consumed in a single pass, so any iterable of days works,
+    including the ``daily`` generator returned by ``utils.load_json_stream``.
+
     Args:
-        data (list of dict): The daily weather data.
+        data (iterable of dict or DailyWeatherBatch): The daily weather data.
+        temp_threshold (float): The temperature threshold to determine a hot day.
+        wind_threshold (float): The wind speed threshold to determine a windy day.
 
     Returns:
         dict: A summary of the key metrics across all days.
     """
-    pass
+    aggregator = WeatherSummaryAggregator(temp_threshold, wind_threshold).update_many(data)
+    record(rows=aggregator.count)
+    return aggregator.result()
+
+
+def _export_rows(data: Iterable[Dict[str, any]], temp_threshold: float,
+                 wind_threshold: float) -> Iterator[Tuple]:
+    """
+    Yield one export row per day, including the derived hot/windy/rainy flags.
+
+    Args:
+        data (iterable of dict): The daily weather data.
+        temp_threshold (float): The temperature threshold to determine a hot day.
+        wind_threshold (float): The wind speed threshold to determine a windy day.
+
+    Yields:
+        tuple: The values of one row, in the order of ``EXPORT_COLUMNS``.
+    """
+    if isinstance(data, DailyWeatherBatch):
+        max_temperature, precipitation, wind_speed = (
+            data.column(field) for field in ("max_temperature", "precipitation", "wind_speed"))
+        yield from zip(
+            data.column("date"), max_temperature, data.column("min_temperature"), precipitation,
+            wind_speed, data.column("humidity"), data.column("weather_description"),
+            (value > temp_threshold for value in max_temperature),
+            (value > wind_threshold for value in wind_speed),
+            (value > 0 for value in precipitation),
+        )
+        return
+    for day in data:
+        yield (
+            day["date"], day["max_temperature"], day["min_temperature"], day["precipitation"],
+            day["wind_speed"], day["humidity"], day["weather_description"],
+            day["max_temperature"] > temp_threshold,
+            day["wind_speed"] > wind_threshold,
+            day["precipitation"] > 0,
+        )
 
 
-def export_to_csv(data: List[Dict[str, any]], file: Union[str, TextIO]) -> None:
+@instrumented(bytes_written="file")
+def export_to_csv(data: Iterable[Dict[str, any]], file: Union[str, TextIO], buffer_size: int = 10000,
+                  temp_threshold: float = 30, wind_threshold: float = 15, append: bool = False) -> None:
     """
     Export the summarized weather data to a CSV file or file-like object.
 
+    Rows are produced lazily and written in batches of ``buffer_size``, so any
+    iterable (including a generator) can be exported with constant memory.
+    File names ending in ``.gz`` or ``.zst`` are written compressed.
+
     Args:
-        data (list of dict): The daily weather data to export.
+        data (iterable of dict or DailyWeatherBatch): The daily weather data to export.
         file (str or file-like object): The name of the CSV file to save the data in, or a file-like object.
+        buffer_size (int): The number of rows written per batch.
+        temp_threshold (float): The temperature threshold to determine a hot day.
+        wind_threshold (float): The wind speed threshold to determine a windy day.
+        append (bool): Append rows instead of overwriting. The header is only
+            written to a file that is new or empty, and never to a file-like object.
     """
-    headers = ["Date", "Max Temperature", "Min Temperature", "Precipitation", "Wind Speed", "Humidity",
-               "Weather Description", "Is Hot Day", "Is Windy Day", "Is Rainy Day"]
+    headers = [name for name, _ in EXPORT_COLUMNS]
+    if isinstance(file, (str, os.PathLike)):
+        write_header = not (append and os.path.isfile(file) and os.path.getsize(file))
+    else:
+        write_header = not append
 
-    def write_data(writer: csv.DictWriter) -> None:
+    def write_data(writer: csv.writer) -> None:
         """Helper function to write rows to the CSV.
         
         Args:
-            writer (csv.DictWriter): The CSV writer object.
+            writer (csv.writer): The CSV writer object.
         """
-        pass
+        if write_header:
+            writer.writerow(headers)
+        rows = _export_rows(data, temp_threshold, wind_threshold)
+        while True:
+            batch = list(islice(rows, buffer_size))
+            if not batch:
+                break
+            writer.writerows(batch)
+            record(rows=len(batch))
+
+    if isinstance(file, (str, os.PathLike)):
+        with open_text_output(file, append=append) as f:
+            write_data(csv.writer(f))
+    else:
+        write_data(csv.writer(file))
+
+
+@instrumented(bytes_written="filename")
+def export_to_arrow(data: Iterable[Dict[str, any]], filename: str, file_format: str = "parquet",
+                    temp_threshold: float = 30, wind_threshold: float = 15) -> None:
+    """
+    Export the summarized weather data to a typed Parquet or Feather file.
+
+    The columns match the CSV export, but dates are stored as date32,
+    measurements as float32 and the flags as booleans, so readers do not need
+    to re-parse strings.
+
+    Args:
+        data (iterable of dict or DailyWeatherBatch): The daily weather data to export.
+        filename (str): The name of the file to save the data in.
+        file_format (str): Either ``parquet`` or ``feather``.
+        temp_threshold (float): The temperature threshold to determine a hot day.
+        wind_threshold (float): The wind speed threshold to determine a windy day.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+    """
+    write_table(_export_rows(data, temp_threshold, wind_threshold), EXPORT_COLUMNS, filename, file_format)
+
+
+@instrumented()
+def run(json_file: str, csv_file: str = "tokyo_weather_summary.csv", incremental: bool = False,
+        state_file: str = DEFAULT_STATE_FILE, parse_cache: Optional[ParseCache] = None) -> Dict[str, float]:
+    """
+    Summarize the daily weather and export it to the CSV file (and a Parquet
+    copy when pyarrow is installed).
+
+    In incremental mode only the days dated after the last processed day are
+    exported and appended to the CSV. The summary still covers every day: the
+    aggregator state is saved in ``state_file`` with the last processed date
+    and updated with the new days. The Parquet copy is only rewritten by full runs.
+
+    Args:
+        json_file (str): Path to the daily weather JSON file.
+        csv_file (str): Name of the CSV file.
+        incremental (bool): Only process days added since the last run.
+        state_file (str): The file holding the progress of incremental runs.
+        parse_cache (ParseCache, optional): Reuse the parsed days of an
+            unchanged JSON file in full runs.
+
+    Returns:
+        dict: The summary of all days, as returned by ``summarize_weather_data``.
+    """
+    if not incremental:
+        if parse_cache is not None:
+            days = parse_cache.parse(json_file, "json-daily", lambda f: load_json_batch(f)['daily'])
+        else:
+            days = load_json(json_file)['daily']
+        export_to_csv(days, csv_file)
+        if arrow_available():
+            export_to_arrow(days, os.path.splitext(csv_file)[0] + ".parquet")
+        return summarize_weather_data(days)
+
+    state = IncrementalState(state_file)
+    progress = state.get("task4", json_file)
+    last_date = progress.get("last_date")
+    aggregator = (WeatherSummaryAggregator.from_state(progress["summary"]) if last_date
+                  else WeatherSummaryAggregator())
+
+    def new_days() -> Iterator[Dict[str, any]]:
+        """Yield the days after ``last_date``, adding each one to the summary."""
+        nonlocal last_date
+        for day in days_after(load_json_stream(json_file)['daily'], last_date):
+            aggregator.update(day)
+            last_date = day["date"]
+            yield day
+
+    export_to_csv(new_days(), csv_file, append=progress.get("last_date") is not None)
+    state.update("task4", json_file, last_date=last_date, summary=aggregator.to_state())
+    state.save()
+    return aggregator.result()
 
 
 if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Summarize and export the Tokyo weather data.")
+    parser.add_argument("--incremental", action="store_true", help="only process days added since the last run")
+    parser.add_argument("--state-file", default=DEFAULT_STATE_FILE, help="progress file for incremental runs")
+    args = parser.parse_args()
     try:
-        # Load the JSON data
-        import os
         # Get the directory where this script is located
         script_dir = os.path.dirname(os.path.abspath(__file__))
         json_path = os.path.join(script_dir, "tokyo_weather_complex.json")
-        weather_data = load_json(json_path)
 
-        # Summarize the weather data
-        summary = summarize_weather_data(weather_data['daily'])
+        # Summarize the weather data and export it to a CSV file
+        summary = run(json_path, incremental=args.incremental, state_file=args.state_file)
 
         # Print the summary for verification
         print("Weather Data Summary:")
         for key, value in summary.items():
             print(f"{key}: {value}")
 
-        # Export the summarized data to a CSV file
-        export_to_csv(weather_data['daily'], "tokyo_weather_summary.csv")
-
         print("Data successfully exported to tokyo_weather_summary.csv")
     except Exception as e:
         print(f"An error occurred: {e}")
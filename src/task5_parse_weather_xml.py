@@ -1,8 +1,150 @@
 import xml.etree.ElementTree as ET
 import csv
-from typing import List, Dict
+import io
+import mmap
+import os
+import re
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Union
 
+if __package__:
+    from .utils import split_file_ranges
+    from .records import DailyWeatherBatch
+    from .instrumentation import instrumented
+    from .arrow_export import arrow_available, write_table
+    from .parse_cache import ParseCache
+    from .incremental import DEFAULT_STATE_FILE, IncrementalState, checkpoint, last_boundary, resume_offset
+else:
+    from utils import split_file_ranges
+    from records import DailyWeatherBatch
+    from instrumentation import instrumented
+    from arrow_export import arrow_available, write_table
+    from parse_cache import ParseCache
+    from incremental import DEFAULT_STATE_FILE, IncrementalState, checkpoint, last_boundary, resume_offset
 
+CSV_COLUMNS = [("Date", "date32"), ("Temperature", "float32"), ("Humidity", "int32"), ("Precipitation", "float32")]
+# The record field written to each CSV column
+RECORD_FIELDS = ("date", "temperature", "humidity", "precipitation")
+
+_DAY_START_PATTERN = re.compile(rb"<day[\s>]")
+_DAY_END = b"</day>"
+
+
+def _parse_day(day: ET.Element) -> Dict[str, any]:
+    """
+    Convert a single <day> element into a dictionary.
+
+    Args:
+        day (ET.Element): The <day> element to convert.
+
+    Returns:
+        dict: The parsed weather data for the day.
+    """
+    return {
+        "date": day.findtext("date"),
+        "temperature": float(day.findtext("temperature")),
+        "humidity": int(day.findtext("humidity")),
+        "precipitation": float(day.findtext("precipitation")),
+    }
+
+
+def iter_weather_xml(xml_file: str) -> Iterator[Dict[str, any]]:
+    """
+    Lazily parse weather data from an XML file, one day at a time.
+
+    Uses ``ET.iterparse`` and clears every processed <day> element, so memory
+    use stays flat regardless of the size of the file.
+
+    Args:
+        xml_file (str): Path to the XML file.
+
+    Yields:
+        dict: The parsed weather data for each day, in file order.
+
+    Raises:
+        FileNotFoundError: If the XML file does not exist.
+        ET.ParseError: If the XML file is malformed.
+    """
+    with open(xml_file, 'rb') as f:
+        yield from _iter_days(f)
+
+
+def _iter_days(source: Union[BinaryIO, io.StringIO]) -> Iterator[Dict[str, any]]:
+    """
+    Yield the parsed <day> elements of an open XML document, clearing each one.
+
+    Args:
+        source (file-like object): The XML document.
+
+    Yields:
+        dict: The parsed weather data for each day, in document order.
+    """
+    root = None
+    for event, elem in ET.iterparse(source, events=("start", "end")):
+        if event == "start":
+            if root is None:
+                root = elem
+            continue
+        if elem.tag == "day":
+            yield _parse_day(elem)
+            # Drop the finished day and its reference from the root
+            elem.clear()
+            root.clear()
+
+
+def iter_weather_xml_range(xml_file: str, start: int, end: int,
+                           chunk_size: int = 1024 * 1024) -> Iterator[Dict[str, any]]:
+    """
+    Lazily parse the <day> elements that lie in one byte range of an XML file.
+
+    The bytes from the first <day> to ``end`` are fed in chunks to a pull
+    parser inside a synthetic <weather> root, so only the range is read and
+    memory use stays flat. Incremental runs use this to parse the days
+    appended after the last processed </day>.
+
+    Args:
+        xml_file (str): Path to the XML file.
+        start (int): The first byte of the range.
+        end (int): The byte after the last </day> of the range.
+        chunk_size (int): The number of bytes fed to the parser at a time.
+
+    Yields:
+        dict: The parsed weather data for each day, in document order.
+
+    Raises:
+        ET.ParseError: If the range does not hold complete <day> elements.
+    """
+    with open(xml_file, 'rb') as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be memory-mapped
+            return
+        with mapped:
+            first = _DAY_START_PATTERN.search(mapped, start, end)
+            if first is None:
+                return
+            parser = ET.XMLPullParser(events=("start", "end"))
+            parser.feed(b"<weather>")
+            _, root = next(parser.read_events())
+            for position in range(first.start(), end, chunk_size):
+                parser.feed(mapped[position:min(position + chunk_size, end)])
+                yield from _read_days(parser, root)
+            parser.feed(b"</weather>")
+            parser.close()
+            yield from _read_days(parser, root)
+
+
+def _read_days(parser: ET.XMLPullParser, root: ET.Element) -> Iterator[Dict[str, any]]:
+    """Yield the <day> elements a pull parser has completed, clearing each one from ``root``."""
+    for event, elem in parser.read_events():
+        if event == "end" and elem.tag == "day":
+            yield _parse_day(elem)
+            # Drop the finished day and its reference from the root
+            elem.clear()
+            root.clear()
+
+
+@instrumented(rows=len, bytes_read="xml_file")
 def parse_weather_xml(xml_file: str) -> List[Dict[str, any]]:
     """
     Parse weather data from an XML file.
@@ -17,34 +159,200 @@ def parse_weather_xml(xml_file: str) -> List[Dict[str, any]]:
         FileNotFoundError: If the XML file does not exist.
         ET.ParseError: If the XML file is malformed.
     """
-    pass
+    return list(iter_weather_xml(xml_file))
 
 
-def save_to_csv(data: List[Dict[str, any]], filename: str = "parsed_weather_data.csv") -> None:
+@instrumented(rows=len, bytes_read="xml_file")
+def parse_weather_xml_batch(xml_file: str) -> DailyWeatherBatch:
+    """
+    Parse weather data from an XML file into a compact columnar batch.
+
+    Days are streamed from ``iter_weather_xml`` straight into typed arrays,
+    so no list of dictionaries is ever held in memory.
+
+    Args:
+        xml_file (str): Path to the XML file.
+
+    Returns:
+        DailyWeatherBatch: The parsed days, with the fields of ``RECORD_FIELDS``.
+
+    Raises:
+        FileNotFoundError: If the XML file does not exist.
+        ET.ParseError: If the XML file is malformed.
+    """
+    return DailyWeatherBatch.from_records(iter_weather_xml(xml_file), RECORD_FIELDS)
+
+
+def _parse_range(xml_file: str, start: int, end: int) -> List[Dict[str, any]]:
+    """
+    Parse the <day> elements that lie in one byte range of an XML file.
+
+    The bytes from the first <day> to the last </day> of the range are wrapped
+    in a synthetic <weather> root and parsed on their own. The document is
+    assumed to be UTF-8 encoded.
+
+    Args:
+        xml_file (str): Path to the XML file.
+        start (int): The first byte of the range.
+        end (int): The byte after the end of the range.
+
+    Returns:
+        list of dict: The parsed weather data in the range, in document order.
+    """
+    with open(xml_file, 'rb') as f:
+        f.seek(start)
+        chunk = f.read(end - start)
+    first = _DAY_START_PATTERN.search(chunk)
+    last = chunk.rfind(_DAY_END)
+    if first is None or last == -1:
+        return []
+    fragment = b"<weather>" + chunk[first.start():last + len(_DAY_END)] + b"</weather>"
+    return list(_iter_days(io.BytesIO(fragment)))
+
+
+@instrumented(rows=len, bytes_read="xml_file")
+def parse_weather_xml_parallel(xml_file: str, workers: Optional[int] = None) -> List[Dict[str, any]]:
+    """
+    Parse weather data from a large XML file using a pool of processes.
+
+    The file is split into byte ranges aligned to </day> boundaries, each range
+    is parsed in a separate process and the results are merged in date order.
+
+    Args:
+        xml_file (str): Path to the XML file.
+        workers (int, optional): The number of processes. Defaults to the number of CPUs.
+
+    Returns:
+        list of dict: The parsed weather data, sorted by date.
+
+    Raises:
+        FileNotFoundError: If the XML file does not exist.
+        ET.ParseError: If the XML file is malformed.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = workers or os.cpu_count() or 1
+    ranges = split_file_ranges(xml_file, workers * 4, boundary=_DAY_END)
+    with ProcessPoolExecutor(workers) as executor:
+        chunks = executor.map(_parse_range, [xml_file] * len(ranges), *zip(*ranges)) if ranges else []
+        data = [day for chunk in chunks for day in chunk]
+    data.sort(key=lambda day: day["date"])
+    return data
+
+
+@instrumented(bytes_written="filename")
+def save_to_csv(data: Iterable[Dict[str, any]], filename: str = "parsed_weather_data.csv",
+                append: bool = False) -> None:
     """
     Save parsed weather data to a CSV file.
 
     Args:
-        data (list of dict): Parsed weather data.
+        data (iterable of dict or DailyWeatherBatch): Parsed weather data. Any
+            iterable is accepted, including the generator returned by ``iter_weather_xml``.
         filename (str): Name of the CSV file.
+        append (bool): Append rows to an existing file instead of overwriting it.
+            The header is only written if the file is new or empty.
 
     Raises:
         IOError: If there is an error writing to the file.
     """
-    pass
+    headers = [name for name, _ in CSV_COLUMNS]
+    write_header = not (append and os.path.isfile(filename) and os.path.getsize(filename))
+    try:
+        with open(filename, 'a' if append else 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            if write_header:
+                writer.writerow(headers)
+            if isinstance(data, DailyWeatherBatch):
+                writer.writerows(data.rows(RECORD_FIELDS))
+            else:
+                writer.writerows(
+                    (day["date"], day["temperature"], day["humidity"], day["precipitation"])
+                    for day in data
+                )
+    except IOError as e:
+        raise IOError(f"Error writing to file '{filename}': {e}")
+
+
+@instrumented(bytes_written="filename")
+def save_to_arrow(data: Iterable[Dict[str, any]], filename: str = "parsed_weather_data.parquet",
+                  file_format: str = "parquet") -> None:
+    """
+    Save weather data to a typed Parquet or Feather file.
+
+    The columns match ``save_to_csv``, with dates stored as date32, measurements
+    as float32 and humidity as int32.
+
+    Args:
+        data (iterable of dict or DailyWeatherBatch): The weather data.
+        filename (str): Name of the output file.
+        file_format (str): Either ``parquet`` or ``feather``.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+        IOError: If there is an error writing to the file.
+    """
+    if isinstance(data, DailyWeatherBatch):
+        rows = data.rows(RECORD_FIELDS)
+    else:
+        rows = (tuple(day[field] for field in RECORD_FIELDS) for day in data)
+    write_table(rows, CSV_COLUMNS, filename, file_format)
+
+
+@instrumented()
+def run(xml_file: str, csv_file: str = "parsed_weather_data.csv", incremental: bool = False,
+        state_file: str = DEFAULT_STATE_FILE, parse_cache: Optional[ParseCache] = None) -> None:
+    """
+    Parse the XML file into the CSV file (and a Parquet copy when pyarrow is installed).
+
+    In incremental mode only the <day> elements added after the last processed
+    </day> are parsed and appended to the CSV, and the byte offset reached is
+    saved in ``state_file``. New days are expected to be inserted before the
+    closing root tag. The Parquet copy is only rewritten by full runs, which
+    parse the file once for both outputs.
+
+    Args:
+        xml_file (str): Path to the XML file.
+        csv_file (str): Name of the CSV file.
+        incremental (bool): Only process days added since the last run.
+        state_file (str): The file holding the progress of incremental runs.
+        parse_cache (ParseCache, optional): Reuse the parsed days of an
+            unchanged XML file in full runs.
+    """
+    if not incremental:
+        if parse_cache is not None:
+            data = parse_cache.parse(xml_file, "xml", parse_weather_xml_batch)
+        elif arrow_available():
+            # Both outputs read the same days: keep them in a compact batch
+            data = parse_weather_xml_batch(xml_file)
+        else:
+            data = iter_weather_xml(xml_file)
+        save_to_csv(data, csv_file)
+        if arrow_available():
+            save_to_arrow(data, os.path.splitext(csv_file)[0] + ".parquet")
+        return
+
+    state = IncrementalState(state_file)
+    start = resume_offset(xml_file, state.get("task5", xml_file))
+    end = last_boundary(xml_file, start, _DAY_END)
+    save_to_csv(iter_weather_xml_range(xml_file, start, end), csv_file, append=start > 0)
+    state.update("task5", xml_file, **checkpoint(xml_file, end))
+    state.save()
 
 
 if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Parse the weather XML file into CSV.")
+    parser.add_argument("--incremental", action="store_true", help="only process days added since the last run")
+    parser.add_argument("--state-file", default=DEFAULT_STATE_FILE, help="progress file for incremental runs")
+    args = parser.parse_args()
     try:
-        # Parse the XML file
-        import os
         # Get the directory where this script is located
         script_dir = os.path.dirname(os.path.abspath(__file__))
         xml_path = os.path.join(script_dir, "weather_data.xml")
-        weather_data = parse_weather_xml(xml_path)
 
-        # Save the parsed data to a CSV file
-        save_to_csv(weather_data)
+        # Stream the parsed days straight into the CSV file
+        run(xml_path, incremental=args.incremental, state_file=args.state_file)
         print("Data has been successfully parsed and saved to parsed_weather_data.csv.")
     except Exception as e:
         print(f"An error occurred: {e}")
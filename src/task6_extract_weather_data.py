@@ -1,6 +1,42 @@
 import csv
+import mmap
+import os
 import re
-from typing import List, Dict
+from typing import Dict, Iterable, Iterator, List, Optional
+
+if __package__:
+    from .utils import split_file_ranges
+    from .records import DailyWeatherBatch
+    from .instrumentation import instrumented
+    from .arrow_export import arrow_available, write_table
+    from .parse_cache import ParseCache
+    from .incremental import DEFAULT_STATE_FILE, IncrementalState, checkpoint, last_boundary, resume_offset
+else:
+    from utils import split_file_ranges
+    from records import DailyWeatherBatch
+    from instrumentation import instrumented
+    from arrow_export import arrow_available, write_table
+    from parse_cache import ParseCache
+    from incremental import DEFAULT_STATE_FILE, IncrementalState, checkpoint, last_boundary, resume_offset
+
+CSV_COLUMNS = [("Date", "date32"), ("Max Temperature", "float32"), ("Min Temperature", "float32"),
+               ("Humidity", "int32"), ("Precipitation", "float32")]
+# The record field written to each CSV column
+RECORD_FIELDS = ("date", "max_temperature", "min_temperature", "humidity", "precipitation")
+
+# One pattern with named groups shared by the line-based and streaming extractors.
+# Units are skipped with [^,\n]* so "32.9°C" and the cleaned "32.9C" both match.
+_RECORD_TEMPLATE = (
+    r"Date:{ws}(?P<date>\d{{4}}-\d{{2}}-\d{{2}}),{ws}"
+    r"Max{ws}Temp:{ws}(?P<max_temperature>-?\d+(?:\.\d+)?)[^,\n]*,{ws}"
+    r"Min{ws}Temp:{ws}(?P<min_temperature>-?\d+(?:\.\d+)?)[^,\n]*,{ws}"
+    r"Humidity:{ws}(?P<humidity>\d+)[^,\n]*,{ws}"
+    r"Precipitation:{ws}(?P<precipitation>\d+(?:\.\d+)?)"
+)
+RECORD_PATTERN = re.compile(_RECORD_TEMPLATE.format(ws=r"[ \t\xa0]*"))
+# Byte-level twin of RECORD_PATTERN for scanning raw UTF-8 without decoding
+# (a character class is much faster than an alternation; \xc2\xa0 is a UTF-8 non-breaking space)
+_RECORD_BYTES_PATTERN = re.compile(_RECORD_TEMPLATE.format(ws=r"[ \t\xc2\xa0]*").encode("ascii"))
 
 
 def clean_text(line: str) -> str:
@@ -14,9 +50,51 @@ def clean_text(line: str) -> str:
         str: The cleaned line of text.
     """
     # Replace non-breaking spaces and other non-ASCII characters
-    pass
+    line = line.replace("\u00a0", " ")
+    return line.encode("ascii", errors="ignore").decode("ascii").strip()
+
+
+def _to_record(match: re.Match) -> Dict[str, any]:
+    """
+    Convert a RECORD_PATTERN match into a weather record.
+
+    Args:
+        match (re.Match): The match of a single report line.
+
+    Returns:
+        dict: The extracted weather data for the day.
+    """
+    date, max_temperature, min_temperature, humidity, precipitation = match.groups()
+    return {
+        "date": date,
+        "max_temperature": float(max_temperature),
+        "min_temperature": float(min_temperature),
+        "humidity": int(humidity),
+        "precipitation": float(precipitation),
+    }
 
 
+def _bytes_to_record(match: re.Match) -> Dict[str, any]:
+    """
+    Convert a match of the bytes pattern into a weather record.
+
+    Args:
+        match (re.Match): The match of a single report line in raw UTF-8.
+
+    Returns:
+        dict: The extracted weather data for the day.
+    """
+    date, max_temperature, min_temperature, humidity, precipitation = match.groups()
+    return {
+        "date": date.decode("ascii"),
+        "max_temperature": float(max_temperature),
+        "min_temperature": float(min_temperature),
+        "humidity": int(humidity),
+        "precipitation": float(precipitation),
+    }
+
+
+@instrumented(rows=len, bytes_read="text_file")
 def extract_weather_data(text_file: str) -> List[Dict[str, any]]:
     """
     Extract weather data from a text file using regular expressions.
@@ -30,35 +108,240 @@ def extract_weather_data(text_file: str) -> List[Dict[str, any]]:
     Raises:
         FileNotFoundError: If the text file does not exist.
     """
-    pass
+    data = []
+    with open(text_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            match = RECORD_PATTERN.search(clean_text(line))
+            if match:
+                data.append(_to_record(match))
+    return data
+
+
+@instrumented(rows=len, bytes_read="text_file")
+def extract_weather_batch(text_file: str) -> DailyWeatherBatch:
+    """
+    Extract weather data from a text file into a compact columnar batch.
+
+    Records are streamed from ``iter_weather_records`` straight into typed
+    arrays, so no list of dictionaries is ever held in memory.
+
+    Args:
+        text_file (str): Path to the text file.
+
+    Returns:
+        DailyWeatherBatch: The extracted days, with the fields of ``RECORD_FIELDS``.
+
+    Raises:
+        FileNotFoundError: If the text file does not exist.
+    """
+    return DailyWeatherBatch.from_records(iter_weather_records(text_file), RECORD_FIELDS)
+
+
+def iter_weather_records(text_file: str, use_mmap: bool = True, start: int = 0,
+                         end: Optional[int] = None) -> Iterator[Dict[str, any]]:
+    """
+    Lazily extract weather data from a text file in a single pass.
+
+    By default the file is memory-mapped and scanned with one precompiled
+    bytes pattern, so lines are never decoded or cleaned individually. With
+    ``use_mmap=False`` the file is read line by line through the normal
+    buffered reader and ``clean_text`` only runs on lines that are not ASCII.
+
+    ``start`` and ``end`` restrict the memory-mapped scan to a byte range,
+    which is how incremental runs read only the lines appended since the last run.
+
+    Args:
+        text_file (str): Path to the text file.
+        use_mmap (bool): Scan a memory map of the file instead of reading lines.
+        start (int): The first byte to scan (memory-mapped scan only).
+        end (int, optional): The byte after the last one to scan. Defaults to the end of the file.
+
+    Yields:
+        dict: The extracted weather data for each day, in file order.
+
+    Raises:
+        FileNotFoundError: If the text file does not exist.
+    """
+    if not use_mmap:
+        if start or end is not None:
+            raise ValueError("Byte ranges require use_mmap=True")
+        with open(text_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                match = RECORD_PATTERN.search(line if line.isascii() else clean_text(line))
+                if match:
+                    yield _to_record(match)
+        return
+
+    with open(text_file, 'rb') as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be memory-mapped
+            return
+        with mapped:
+            for match in _RECORD_BYTES_PATTERN.finditer(mapped, start, len(mapped) if end is None else end):
+                yield _bytes_to_record(match)
+
+
+def _extract_range(text_file: str, start: int, end: int) -> List[Dict[str, any]]:
+    """
+    Extract the records that lie in one byte range of a text file.
+
+    Args:
+        text_file (str): Path to the text file.
+        start (int): The first byte of the range.
+        end (int): The byte after the end of the range.
+
+    Returns:
+        list of dict: The extracted weather data in the range, in file order.
+    """
+    with open(text_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        return [_bytes_to_record(match) for match in _RECORD_BYTES_PATTERN.finditer(mapped, start, end)]
+
+
+@instrumented(rows=len, bytes_read="text_file")
+def extract_weather_data_parallel(text_file: str, workers: Optional[int] = None) -> List[Dict[str, any]]:
+    """
+    Extract weather data from a large text file using a pool of processes.
+
+    The file is split into byte ranges aligned to line boundaries, each range
+    is scanned in a separate process and the results are merged in date order.
+
+    Args:
+        text_file (str): Path to the text file.
+        workers (int, optional): The number of processes. Defaults to the number of CPUs.
+
+    Returns:
+        list of dict: The extracted weather data, sorted by date.
+
+    Raises:
+        FileNotFoundError: If the text file does not exist.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = workers or os.cpu_count() or 1
+    # A few ranges per worker keep the pool busy when lines vary in length
+    ranges = split_file_ranges(text_file, workers * 4)
+    with ProcessPoolExecutor(workers) as executor:
+        chunks = executor.map(_extract_range, [text_file] * len(ranges), *zip(*ranges)) if ranges else []
+        data = [record for chunk in chunks for record in chunk]
+    data.sort(key=lambda record: record["date"])
+    return data
 
 
-def save_to_csv(data: List[Dict[str, any]], filename: str = "extracted_weather_data.csv") -> None:
+@instrumented(bytes_written="filename")
+def save_to_csv(data: Iterable[Dict[str, any]], filename: str = "extracted_weather_data.csv",
+                append: bool = False) -> None:
     """
     Save extracted weather data to a CSV file.
 
     Args:
-        data (list of dict): Extracted weather data.
+        data (iterable of dict or DailyWeatherBatch): Extracted weather data. Any
+            iterable is accepted, including the generator returned by ``iter_weather_records``.
         filename (str): Name of the CSV file.
+        append (bool): Append rows to an existing file instead of overwriting it.
+            The header is only written if the file is new or empty.
+
+    Raises:
+        IOError: If there is an error writing to the file.
+    """
+    headers = [name for name, _ in CSV_COLUMNS]
+    write_header = not (append and os.path.isfile(filename) and os.path.getsize(filename))
+    try:
+        with open(filename, 'a' if append else 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            if write_header:
+                writer.writerow(headers)
+            if isinstance(data, DailyWeatherBatch):
+                writer.writerows(data.rows(RECORD_FIELDS))
+            else:
+                writer.writerows(
+                    (day["date"], day["max_temperature"], day["min_temperature"], day["humidity"], day["precipitation"])
+                    for day in data
+                )
+    except IOError as e:
+        raise IOError(f"Error writing to file '{filename}': {e}")
+
+
+@instrumented(bytes_written="filename")
+def save_to_arrow(data: Iterable[Dict[str, any]], filename: str = "extracted_weather_data.parquet",
+                  file_format: str = "parquet") -> None:
+    """
+    Save weather data to a typed Parquet or Feather file.
+
+    The columns match ``save_to_csv``, with dates stored as date32, measurements
+    as float32 and humidity as int32.
+
+    Args:
+        data (iterable of dict or DailyWeatherBatch): The weather data.
+        filename (str): Name of the output file.
+        file_format (str): Either ``parquet`` or ``feather``.
 
     Raises:
+        ImportError: If pyarrow is not installed.
         IOError: If there is an error writing to the file.
     """
-    headers = ["Date", "Max Temperature", "Min Temperature", "Humidity", "Precipitation"]
-    pass
+    if isinstance(data, DailyWeatherBatch):
+        rows = data.rows(RECORD_FIELDS)
+    else:
+        rows = (tuple(day[field] for field in RECORD_FIELDS) for day in data)
+    write_table(rows, CSV_COLUMNS, filename, file_format)
+
+
+@instrumented()
+def run(text_file: str, csv_file: str = "extracted_weather_data.csv", incremental: bool = False,
+        state_file: str = DEFAULT_STATE_FILE, parse_cache: Optional[ParseCache] = None) -> None:
+    """
+    Extract the weather report into the CSV file (and a Parquet copy when pyarrow is installed).
+
+    In incremental mode only the complete lines appended since the previous run
+    are scanned and appended to the CSV, and the byte offset reached is saved in
+    ``state_file``. The Parquet copy is only rewritten by full runs, which
+    scan the report once for both outputs.
+
+    Args:
+        text_file (str): Path to the weather report.
+        csv_file (str): Name of the CSV file.
+        incremental (bool): Only process lines appended since the last run.
+        state_file (str): The file holding the progress of incremental runs.
+        parse_cache (ParseCache, optional): Reuse the parsed days of an
+            unchanged report in full runs.
+    """
+    if not incremental:
+        if parse_cache is not None:
+            data = parse_cache.parse(text_file, "text", extract_weather_batch)
+        elif arrow_available():
+            # Both outputs read the same days: keep them in a compact batch
+            data = extract_weather_batch(text_file)
+        else:
+            data = iter_weather_records(text_file)
+        save_to_csv(data, csv_file)
+        if arrow_available():
+            save_to_arrow(data, os.path.splitext(csv_file)[0] + ".parquet")
+        return
+
+    state = IncrementalState(state_file)
+    start = resume_offset(text_file, state.get("task6", text_file))
+    # A trailing line without a newline may still be being written
+    end = last_boundary(text_file, start, b"\n")
+    save_to_csv(iter_weather_records(text_file, start=start, end=end), csv_file, append=start > 0)
+    state.update("task6", text_file, **checkpoint(text_file, end))
+    state.save()
 
 
 if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Extract weather data from the text report.")
+    parser.add_argument("--incremental", action="store_true", help="only process lines appended since the last run")
+    parser.add_argument("--state-file", default=DEFAULT_STATE_FILE, help="progress file for incremental runs")
+    args = parser.parse_args()
     try:
-        # Extract data from the text file
-        import os
         # Get the directory where this script is located
         script_dir = os.path.dirname(os.path.abspath(__file__))
         txt_path = os.path.join(script_dir, "weather_report.txt")
-        weather_data = extract_weather_data(txt_path)
 
-        # Save the extracted data to a CSV file
-        save_to_csv(weather_data)
+        # Stream the extracted records straight into the CSV file
+        run(txt_path, incremental=args.incremental, state_file=args.state_file)
         print("Data has been successfully extracted and saved to extracted_weather_data.csv.")
     except Exception as e:
         print(f"An error occurred: {e}")
@@ -1,16 +1,100 @@
 """
 Common utility functions for weather data processing tasks.
 """
+import codecs
+import importlib
+import io
 import json
-from typing import Any, Dict
+import mmap
+import os
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
 
+if __package__:
+    from .instrumentation import instrumented
+    from .records import DailyWeatherBatch
+else:
+    from instrumentation import instrumented
+    from records import DailyWeatherBatch
 
-def load_json(filename: str) -> Dict[str, Any]:
+# Fast JSON libraries are optional; they are tried in this order
+JSON_BACKENDS = ("orjson", "msgspec", "json")
+JSON_BACKEND_ENV = "MLDS_JSON_BACKEND"
+
+_JSON_WHITESPACE = " \t\n\r"
+_JSON_DELIMITERS = _JSON_WHITESPACE + ",:]}"
+_STREAM_CHUNK_SIZE = 1024 * 1024
+
+
+def get_json_backend(backend: Optional[str] = None) -> str:
+    """
+    Resolve the JSON backend to use.
+
+    Args:
+        backend (str, optional): One of ``JSON_BACKENDS``. Defaults to the
+            ``MLDS_JSON_BACKEND`` environment variable, or else the fastest
+            installed library.
+
+    Returns:
+        str: The name of an installed backend.
+
+    Raises:
+        ValueError: If the backend is unknown.
+        ImportError: If the requested backend is not installed.
+    """
+    backend = backend or os.environ.get(JSON_BACKEND_ENV)
+    if backend is not None:
+        if backend not in JSON_BACKENDS:
+            raise ValueError(f"Unknown JSON backend '{backend}', expected one of {', '.join(JSON_BACKENDS)}")
+        if backend != "json":
+            importlib.import_module(backend)
+        return backend
+    for candidate in JSON_BACKENDS[:-1]:
+        try:
+            importlib.import_module(candidate)
+        except ImportError:
+            continue
+        return candidate
+    return "json"
+
+
+def _decode_json(content: bytes, backend: str) -> Any:
+    """Decode a JSON document with the given backend."""
+    if backend == "orjson":
+        import orjson
+        return orjson.loads(content)
+    if backend == "msgspec":
+        import msgspec
+        try:
+            return msgspec.json.decode(content)
+        except msgspec.DecodeError as e:
+            raise json.JSONDecodeError(str(e), content if isinstance(content, str) else "", 0)
+    return json.loads(content)
+
+
+def _encode_json(data: Any, backend: str, pretty: bool) -> bytes:
+    """Encode ``data`` as UTF-8 JSON with the given backend."""
+    if backend == "orjson":
+        import orjson
+        # orjson only supports two-space indentation
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        return orjson.dumps(data, option=option)
+    if backend == "msgspec":
+        import msgspec
+        content = msgspec.json.encode(data)
+        return msgspec.json.format(content, indent=4) if pretty else content
+    if pretty:
+        return json.dumps(data, indent=4, ensure_ascii=False).encode("utf-8")
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+@instrumented(bytes_read="filename")
+def load_json(filename: str, backend: Optional[str] = None) -> Dict[str, Any]:
     """
     Load JSON data from a file.
 
     Args:
         filename (str): The name of the JSON file to load.
+        backend (str, optional): The JSON library to decode with; see ``get_json_backend``.
 
     Returns:
         dict: The loaded JSON data.
@@ -19,9 +103,10 @@ def load_json(filename: str) -> Dict[str, Any]:
         FileNotFoundError: If the file does not exist.
         json.JSONDecodeError: If the file contains invalid JSON.
     """
+    backend = get_json_backend(backend)
     try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(filename, 'rb') as f:
+            data = _decode_json(f.read(), backend)
         return data
     except FileNotFoundError:
         raise FileNotFoundError(f"The file '{filename}' was not found.")
@@ -29,19 +114,301 @@ def load_json(filename: str) -> Dict[str, Any]:
         raise json.JSONDecodeError(f"Error decoding JSON from '{filename}': {e.msg}", e.doc, e.pos)
 
 
-def save_to_json(data: Dict[str, Any], filename: str) -> None:
+class _MappedJSONReader:
+    """
+    Decode JSON values one at a time from a memory-mapped UTF-8 file.
+
+    Only a sliding window of the file is decoded to text at any time; it is
+    extended chunk by chunk whenever a value crosses the end of the window.
+
+    Args:
+        mapped (mmap.mmap): The memory-mapped file.
+        chunk_size (int): The number of bytes decoded per refill.
+    """
+
+    def __init__(self, mapped: mmap.mmap, chunk_size: int = _STREAM_CHUNK_SIZE) -> None:
+        self._mapped = mapped
+        self._chunk_size = chunk_size
+        self._offset = 0
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> None:
+        """Drop the consumed part of the window and decode the next chunk."""
+        chunk = self._mapped[self._offset:self._offset + self._chunk_size]
+        self._offset += len(chunk)
+        self._eof = self._offset >= len(self._mapped)
+        self._buffer = self._buffer[self._pos:] + self._utf8.decode(chunk, final=self._eof)
+        self._pos = 0
+
+    def error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self._buffer, self._pos)
+
+    def next_char(self) -> str:
+        """Consume and return the next non-whitespace character, or '' at the end of the file."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _JSON_WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer) or self._eof:
+                break
+            self._fill()
+        if self._pos >= len(self._buffer):
+            return ""
+        self._pos += 1
+        return self._buffer[self._pos - 1]
+
+    def expect(self, expected: str) -> None:
+        """Consume the next non-whitespace character, which must be ``expected``."""
+        if self.next_char() != expected:
+            self._pos = max(self._pos - 1, 0)
+            raise self.error(f"Expecting '{expected}'")
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it."""
+        char = self.next_char()
+        if char:
+            self._pos -= 1
+        return char
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+                self._fill()
+                continue
+            # A value cut off at the end of the window (e.g. "35." of "35.6895")
+            # may still decode, so only accept it when a delimiter follows
+            if self._eof or (end < len(self._buffer) and self._buffer[end] in _JSON_DELIMITERS):
+                self._pos = end
+                return value
+            self._fill()
+
+
+def load_json_stream(filename: str, array_key: str = "daily",
+                     chunk_size: int = _STREAM_CHUNK_SIZE) -> Dict[str, Any]:
+    """
+    Load JSON data from a file, streaming the entries of one large array.
+
+    The file is memory-mapped and decoded incrementally. The top-level fields
+    that precede ``array_key`` (``city``, ``latitude``, ``timezone``, ...) are
+    available immediately, while ``array_key`` is a generator that decodes one
+    entry at a time, so the whole document is never materialized. Fields that
+    follow the array are added to the returned dict once the generator is exhausted.
+
+    Args:
+        filename (str): The name of the JSON file to load.
+        array_key (str): The top-level key of the array to stream.
+        chunk_size (int): The number of bytes decoded at a time.
+
+    Returns:
+        dict: The header fields, plus ``array_key`` mapped to an iterator of entries.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        json.JSONDecodeError: If the file contains invalid JSON.
+    """
+    try:
+        f = open(filename, 'rb')
+    except FileNotFoundError:
+        raise FileNotFoundError(f"The file '{filename}' was not found.")
+    try:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        f.close()
+        raise json.JSONDecodeError(f"Error decoding JSON from '{filename}': Expecting value", "", 0)
+
+    reader = _MappedJSONReader(mapped, chunk_size)
+    data: Dict[str, Any] = {}
+
+    def close() -> None:
+        mapped.close()
+        f.close()
+
+    def read_fields() -> bool:
+        """Read ``key: value`` pairs into ``data``; return True when ``array_key`` is reached."""
+        while True:
+            key = reader.value()
+            if not isinstance(key, str):
+                raise reader.error("Expecting property name enclosed in double quotes")
+            reader.expect(":")
+            if key == array_key:
+                return True
+            data[key] = reader.value()
+            separator = reader.next_char()
+            if separator == "}":
+                return False
+            if separator != ",":
+                raise reader.error("Expecting ',' delimiter")
+
+    def iter_entries() -> Iterator[Any]:
+        try:
+            reader.expect("[")
+            if reader.peek() == "]":
+                reader.next_char()
+            else:
+                while True:
+                    yield reader.value()
+                    separator = reader.next_char()
+                    if separator == "]":
+                        break
+                    if separator != ",":
+                        raise reader.error("Expecting ',' delimiter")
+            separator = reader.next_char()
+            if separator == ",":
+                read_fields()
+            elif separator != "}":
+                raise reader.error("Expecting '}'")
+        finally:
+            close()
+
+    try:
+        reader.expect("{")
+        found = reader.peek() != "}" and read_fields()
+    except json.JSONDecodeError as e:
+        close()
+        raise json.JSONDecodeError(f"Error decoding JSON from '{filename}': {e.msg}", e.doc, e.pos)
+    except Exception:
+        close()
+        raise
+    if found:
+        data[array_key] = iter_entries()
+    else:
+        close()
+        data[array_key] = iter(())
+    return data
+
+
+@instrumented(bytes_read="filename")
+def load_json_batch(filename: str, array_key: str = "daily") -> Dict[str, Any]:
+    """
+    Load a weather JSON file with its daily array as a compact columnar batch.
+
+    The array is streamed with ``load_json_stream`` into typed arrays, so the
+    per-day dictionaries are never all held in memory at once.
+
+    Args:
+        filename (str): The name of the JSON file to load.
+        array_key (str): The top-level key of the array of days.
+
+    Returns:
+        dict: The top-level fields, with ``array_key`` mapped to a ``DailyWeatherBatch``.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        json.JSONDecodeError: If the file contains invalid JSON.
+    """
+    data = load_json_stream(filename, array_key)
+    data[array_key] = DailyWeatherBatch.from_records(data[array_key])
+    return data
+
+
+@instrumented(bytes_written="filename")
+def save_to_json(data: Dict[str, Any], filename: str, pretty: bool = False,
+                 backend: Optional[str] = None) -> None:
     """
     Save data to a JSON file.
 
+    Output is compact by default, which suits machine-to-machine files. Use
+    ``pretty=True`` for files meant to be read by people.
+
     Args:
         data (dict): The data to be saved to the JSON file.
         filename (str): The name of the JSON file to save the data in.
+        pretty (bool): Indent the output (two spaces with orjson, four otherwise).
+        backend (str, optional): The JSON library to encode with; see ``get_json_backend``.
 
     Raises:
         IOError: If there is an error writing to the file.
     """
+    content = _encode_json(data, get_json_backend(backend), pretty)
     try:
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+        with open(filename, 'wb') as f:
+            f.write(content)
     except IOError as e:
         raise IOError(f"Error writing to file '{filename}': {e}")
+
+
+def split_file_ranges(filename: str, parts: int, boundary: bytes = b"\n") -> List[Tuple[int, int]]:
+    """
+    Split a file into byte ranges that end right after a record boundary.
+
+    Cut points are placed at roughly equal offsets and then moved forward to
+    the end of the next ``boundary``, so no record straddles two ranges.
+
+    Args:
+        filename (str): Path to the file to split.
+        parts (int): The desired number of ranges.
+        boundary (bytes): The byte sequence that ends a record, e.g. ``b"\\n"`` or ``b"</day>"``.
+
+    Returns:
+        list of tuple: Non-empty ``(start, end)`` byte ranges covering the whole file, in order.
+    """
+    size = os.path.getsize(filename)
+    cuts = [0]
+    with open(filename, 'rb') as f:
+        for part in range(1, max(parts, 1)):
+            target = max(size * part // parts, cuts[-1])
+            f.seek(target)
+            # Scan forward in small windows for the next boundary
+            window = b""
+            position = target
+            while True:
+                block = f.read(64 * 1024)
+                if not block:
+                    cut = size
+                    break
+                window = window[-(len(boundary) - 1):] + block if len(boundary) > 1 else block
+                index = window.find(boundary)
+                if index != -1:
+                    cut = position - (len(window) - len(block)) + index + len(boundary)
+                    break
+                position += len(block)
+            cuts.append(cut)
+    cuts.append(size)
+    return [(start, end) for start, end in zip(cuts, cuts[1:]) if end > start]
+
+
+def open_text_output(filename: str, buffer_size: int = 1024 * 1024, append: bool = False) -> TextIO:
+    """
+    Open a UTF-8 text file for writing, compressing it based on its extension.
+
+    ``.gz`` files are written with gzip and ``.zst`` files with zstandard (which
+    must be installed); any other name is written as plain text. Writes go
+    through a ``buffer_size`` byte buffer, so rows are not flushed one by one.
+    Appending to a compressed file adds a new gzip member or zstd frame, which
+    standard readers decompress as one continuous stream.
+
+    Args:
+        filename (str): The name of the file to write.
+        buffer_size (int): The size in bytes of the write buffer.
+        append (bool): Append to the file instead of overwriting it.
+
+    Returns:
+        TextIO: A text stream suitable for ``csv.writer`` (``newline=''``).
+
+    Raises:
+        ImportError: If a ``.zst`` file is requested and zstandard is not installed.
+        IOError: If the file cannot be opened.
+    """
+    name = os.fspath(filename)
+    mode = 'ab' if append else 'wb'
+    if name.endswith(".gz"):
+        import gzip
+        raw = gzip.open(name, mode)
+    elif name.endswith(".zst"):
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("Writing '.zst' files requires the 'zstandard' package")
+        raw = zstandard.open(name, mode)
+    else:
+        return open(name, 'a' if append else 'w', newline='', encoding='utf-8', buffering=buffer_size)
+    return io.TextIOWrapper(io.BufferedWriter(raw, buffer_size), encoding='utf-8', newline='')
@@ -6,6 +6,7 @@ Visualizes results from all tasks including web scraping, API data, and weather
 import streamlit as st
 import pandas as pd
 import json
+import os
 import plotly.express as px
 import plotly.graph_objects as go
 from pathlib import Path
@@ -15,6 +16,8 @@ from datetime import datetime
 # Add src to path for imports
 sys.path.append(str(Path(__file__).parent / 'src'))
 
+from downsampling import DEFAULT_MAX_POINTS, PERIODS, aggregate, choose_period, downsample
+
 # Page configuration
 st.set_page_config(
     page_title="MLDS Week 1 Dashboard",
@@ -50,25 +53,128 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
-def load_json_safe(filepath: str):
-    """Safely load JSON file with error handling."""
+def file_signature(filepath: str):
+    """Return (mtime, size) of a file, or None if it does not exist. Used as a cache key."""
+    try:
+        stat = os.stat(filepath)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def output_exists(*filepaths: str) -> bool:
+    """Check cheaply, without parsing, whether any of the files exists and is not empty."""
+    return any(signature is not None and signature[1] > 0
+               for signature in map(file_signature, filepaths))
+
+
+def _parse_json(filepath: str):
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
             return json.load(f)
-    except FileNotFoundError:
-        return None
-    except json.JSONDecodeError:
+    except (OSError, json.JSONDecodeError):
         return None
 
 
-def load_csv_safe(filepath: str):
-    """Safely load CSV file with error handling."""
+# The signature argument is part of the cache key, so a rewritten file is read
+# again while widget interactions reuse the parsed data
+@st.cache_data(max_entries=32, show_spinner=False)
+def _read_json(filepath: str, signature):
+    return _parse_json(filepath)
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _read_table(filepath: str, signature):
+    readers = {'.csv': pd.read_csv, '.parquet': pd.read_parquet, '.feather': pd.read_feather}
     try:
-        return pd.read_csv(filepath)
-    except FileNotFoundError:
-        return None
+        return readers[Path(filepath).suffix](filepath)
     except Exception:
+        # pyarrow missing or file unreadable
+        return None
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _read_daily_frame(filepath: str, signature):
+    # Not through _read_json: only the frame and the small header fields stay cached
+    data = _parse_json(filepath)
+    if not data or 'daily' not in data:
+        return None, None
+    header = {key: value for key, value in data.items() if key != 'daily'}
+    df = pd.DataFrame(data['daily'])
+    df['date'] = pd.to_datetime(df['date'])
+    return header, df.sort_values('date').reset_index(drop=True)
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _daily_csv(filepath: str, signature, start, end) -> bytes:
+    _, df = _read_daily_frame(filepath, signature)
+    range_df = df[(df['date'] >= pd.Timestamp(start)) & (df['date'] <= pd.Timestamp(end))]
+    return range_df.to_csv(index=False).encode('utf-8')
+
+
+def load_json_safe(filepath: str):
+    """Safely load JSON file with error handling; cached until the file changes."""
+    signature = file_signature(filepath)
+    if signature is None:
         return None
+    return _read_json(filepath, signature)
+
+
+def load_csv_safe(filepath: str):
+    """Safely load CSV file with error handling; cached until the file changes."""
+    signature = file_signature(filepath)
+    if signature is None:
+        return None
+    return _read_table(filepath, signature)
+
+
+def load_table_safe(stem: str):
+    """Load a task output, preferring the typed Parquet/Feather copies over CSV."""
+    csv_signature = file_signature(stem + '.csv')
+    # Incremental runs only append to the CSV, which leaves older columnar copies stale
+    csv_mtime = csv_signature[0] if csv_signature else 0
+    for suffix in ('.parquet', '.feather'):
+        signature = file_signature(stem + suffix)
+        if signature is not None and signature[0] >= csv_mtime:
+            table = _read_table(stem + suffix, signature)
+            if table is not None:
+                return table
+    return load_csv_safe(stem + '.csv')
+
+
+def load_daily_frame(filepath: str):
+    """
+    Load a JSON file with a ``daily`` array; cached until the file changes.
+
+    Returns the top-level fields other than ``daily`` (city, latitude, ...) and
+    the daily records as a date-sorted DataFrame, or (None, None).
+    """
+    signature = file_signature(filepath)
+    if signature is None:
+        return None, None
+    return _read_daily_frame(filepath, signature)
+
+
+def daily_csv(filepath: str, start, end) -> bytes:
+    """The daily records of a JSON file between two dates as CSV; cached until the file changes."""
+    return _daily_csv(filepath, file_signature(filepath), start, end)
+
+
+def table_exists(stem: str) -> bool:
+    """Check whether a task output exists in any of its formats."""
+    return output_exists(stem + '.csv', stem + '.parquet', stem + '.feather')
+
+
+# The detail table shows at most this many rows; the full range is downloadable
+MAX_TABLE_ROWS = 1000
+
+# How the daily columns of task 3 are rolled up into weekly, monthly or yearly points
+CHART_AGGREGATIONS = {
+    'max_temperature': 'mean',
+    'min_temperature': 'mean',
+    'wind_speed': 'mean',
+    'precipitation': 'sum',
+}
 
 
 def task1_web_scraping():
@@ -149,11 +255,9 @@ def task3_weather_analysis():
     """Display Task 3 - Complex Weather Analysis results."""
     st.markdown('<div class="task-header">🌦️ Task 3: Complex Weather Analysis</div>', unsafe_allow_html=True)
     
-    data = load_json_safe('src/tokyo_weather_complex.json')
+    data, df = load_daily_frame('src/tokyo_weather_complex.json')
     
-    if data and 'daily' in data:
-        daily_data = data['daily']
-        df = pd.DataFrame(daily_data)
+    if data is not None:
         
         # City information
         st.subheader(f"📍 {data.get('city', 'Tokyo')}")
@@ -178,18 +282,55 @@ def task3_weather_analysis():
         with col4:
             st.metric("Avg Humidity", f"{df['humidity'].mean():.0f}%")
         
-        # Temperature chart
+        # Chart resolution: charts never draw more than max_points points, so
+        # rendering stays bounded however long the history is
         st.subheader("🌡️ Temperature Trends")
+        first_day, last_day = df['date'].iloc[0].date(), df['date'].iloc[-1].date()
+        col1, col2, col3 = st.columns([2, 1, 1])
+        with col1:
+            selected_range = st.date_input("Date range", value=(first_day, last_day),
+                                           min_value=first_day, max_value=last_day)
+        with col2:
+            resolution = st.selectbox("Resolution", ["auto"] + [name for name, _, _ in PERIODS])
+        with col3:
+            max_points = int(st.number_input("Max chart points", min_value=100, max_value=20000,
+                                             value=DEFAULT_MAX_POINTS, step=100))
+        # The range has a single date while the user is still picking the end
+        if not isinstance(selected_range, (tuple, list)):
+            selected_range = (selected_range,)
+        start, end = selected_range[0], selected_range[1] if len(selected_range) > 1 else last_day
+        range_df = df[(df['date'] >= pd.Timestamp(start)) & (df['date'] <= pd.Timestamp(end))]
+        
+        period = choose_period((end - start).days + 1, max_points) if resolution == "auto" else resolution
+        chart_df = aggregate(range_df, period, CHART_AGGREGATIONS)
+        caption = f"{len(range_df)} days shown at {period} resolution ({len(chart_df)} points"
+        if len(chart_df) > max_points:
+            caption += f", downsampled to {max_points}"
+        caption += ")."
+        if period != "daily":
+            caption += " Narrow the date range to drill down to daily values."
+        st.caption(caption)
+        
+        def line_points(column):
+            rows = chart_df.iloc[downsample(chart_df['date'], chart_df[column], max_points, "lttb")]
+            return rows['date'], rows[column]
+        
+        def bar_points(column):
+            return chart_df.iloc[downsample(chart_df['date'], chart_df[column], max_points, "minmax")]
+        
+        mode = 'lines+markers' if min(len(chart_df), max_points) <= 400 else 'lines'
         fig_temp = go.Figure()
+        x, y = line_points('max_temperature')
         fig_temp.add_trace(go.Scatter(
-            x=df['date'], y=df['max_temperature'],
-            mode='lines+markers',
+            x=x, y=y,
+            mode=mode,
             name='Max Temperature',
             line=dict(color='red', width=2)
         ))
+        x, y = line_points('min_temperature')
         fig_temp.add_trace(go.Scatter(
-            x=df['date'], y=df['min_temperature'],
-            mode='lines+markers',
+            x=x, y=y,
+            mode=mode,
             name='Min Temperature',
             line=dict(color='blue', width=2)
         ))
@@ -205,7 +346,7 @@ def task3_weather_analysis():
         
         with col1:
             st.subheader("💨 Wind Speed")
-            fig_wind = px.bar(df, x='date', y='wind_speed', 
+            fig_wind = px.bar(bar_points('wind_speed'), x='date', y='wind_speed', 
                              color='wind_speed',
                              color_continuous_scale='Blues')
             fig_wind.update_layout(showlegend=False)
@@ -213,7 +354,7 @@ def task3_weather_analysis():
         
         with col2:
             st.subheader("💧 Precipitation")
-            fig_precip = px.bar(df, x='date', y='precipitation',
+            fig_precip = px.bar(bar_points('precipitation'), x='date', y='precipitation',
                                color='precipitation',
                                color_continuous_scale='Blues')
             fig_precip.update_layout(showlegend=False)
@@ -238,7 +379,16 @@ def task3_weather_analysis():
         
         # Detailed data table
         with st.expander("📋 View Detailed Weather Data"):
-            st.dataframe(df, use_container_width=True)
+            table_df = chart_df.tail(MAX_TABLE_ROWS)
+            if len(table_df) < len(chart_df):
+                st.caption(f"Showing the last {len(table_df)} of {len(chart_df)} {period} rows.")
+            st.dataframe(table_df, use_container_width=True)
+            st.download_button(
+                label="📥 Download daily data (CSV)",
+                data=daily_csv('src/tokyo_weather_complex.json', start, end),
+                file_name=f'tokyo_weather_daily_{start}_{end}.csv',
+                mime='text/csv',
+            )
     else:
         st.warning("⚠️ No complex weather data found. Check `src/tokyo_weather_complex.json`.")
 
@@ -247,7 +397,7 @@ def task4_csv_export():
     """Display Task 4 - CSV Export results."""
     st.markdown('<div class="task-header">📁 Task 4: Weather Data Export</div>', unsafe_allow_html=True)
     
-    df = load_csv_safe('tokyo_weather_summary.csv')
+    df = load_table_safe('tokyo_weather_summary')
     
     if df is not None:
         st.success(f"✅ Successfully loaded CSV with {len(df)} records")
@@ -285,7 +435,7 @@ def task5_xml_parsing():
     """Display Task 5 - XML Parsing results."""
     st.markdown('<div class="task-header">📄 Task 5: XML Parsing</div>', unsafe_allow_html=True)
     
-    df = load_csv_safe('parsed_weather_data.csv')
+    df = load_table_safe('parsed_weather_data')
     
     if df is not None:
         st.success(f"✅ Successfully parsed XML data: {len(df)} records")
@@ -314,7 +464,7 @@ def task6_regex_extraction():
     """Display Task 6 - Regex Extraction results."""
     st.markdown('<div class="task-header">🔍 Task 6: Regex Data Extraction</div>', unsafe_allow_html=True)
     
-    df = load_csv_safe('extracted_weather_data.csv')
+    df = load_table_safe('extracted_weather_data')
     
     if df is not None:
         st.success(f"✅ Successfully extracted {len(df)} records using regex")
@@ -408,12 +558,12 @@ def main():
                 "Regex Extraction"
             ],
             "Status": [
-                "✅" if load_json_safe('extracted_wikipedia_data.json') else "⏳",
-                "✅" if load_json_safe('tokyo_weather.json') else "⏳",
-                "✅" if load_json_safe('src/tokyo_weather_complex.json') else "⏳",
-                "✅" if load_csv_safe('tokyo_weather_summary.csv') is not None else "⏳",
-                "✅" if load_csv_safe('parsed_weather_data.csv') is not None else "⏳",
-                "✅" if load_csv_safe('extracted_weather_data.csv') is not None else "⏳"
+                "✅" if output_exists('extracted_wikipedia_data.json') else "⏳",
+                "✅" if output_exists('tokyo_weather.json') else "⏳",
+                "✅" if output_exists('src/tokyo_weather_complex.json') else "⏳",
+                "✅" if table_exists('tokyo_weather_summary') else "⏳",
+                "✅" if table_exists('parsed_weather_data') else "⏳",
+                "✅" if table_exists('extracted_weather_data') else "⏳"
             ]
         }
         
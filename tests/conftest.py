@@ -0,0 +1,30 @@
+"""
+Shared fixtures for the test suite.
+"""
+import pytest
+
+
+def _json_day(date, max_temp=30.0, description="Cloudy"):
+    return {"date": date, "max_temperature": max_temp, "min_temperature": 20.0, "precipitation": 1.5,
+            "wind_speed": 10.0, "humidity": 60, "weather_description": description}
+
+
+@pytest.fixture
+def json_day():
+    """Build one day of the ``daily`` array of a single-city JSON file: ``json_day(date, max_temp, description)``."""
+    return _json_day
+
+
+@pytest.fixture
+def sample_daily():
+    """A ``daily`` array of four days with different weather."""
+    return [
+        {"date": "2024-08-18", "max_temperature": 32.5, "min_temperature": 22.5, "precipitation": 0.0,
+         "wind_speed": 15.5, "humidity": 65, "weather_description": "Clear sky"},
+        {"date": "2024-08-19", "max_temperature": 30.0, "min_temperature": 21.0, "precipitation": 5.0,
+         "wind_speed": 10.0, "humidity": 70, "weather_description": "Light rain"},
+        {"date": "2024-08-20", "max_temperature": 28.0, "min_temperature": 20.0, "precipitation": 10.0,
+         "wind_speed": 8.0, "humidity": 80, "weather_description": "Moderate rain"},
+        {"date": "2024-08-21", "max_temperature": 33.0, "min_temperature": 24.0, "precipitation": 0.0,
+         "wind_speed": 20.0, "humidity": 60, "weather_description": "Sunny"},
+    ]
@@ -0,0 +1,117 @@
+"""
+Test suite for the typed Parquet/Feather exports.
+"""
+import pytest
+import datetime
+from src.arrow_export import write_table
+from src.task4_weather_summary_export import export_to_arrow
+from src.task5_parse_weather_xml import save_to_arrow as save_parsed_to_arrow
+from src.task6_extract_weather_data import save_to_arrow as save_extracted_to_arrow
+from src import task5_parse_weather_xml as task5
+from src import task6_extract_weather_data as task6
+
+pa = pytest.importorskip("pyarrow")
+import pyarrow.feather as feather  # noqa: E402
+import pyarrow.parquet as pq  # noqa: E402
+
+
+def test_export_to_arrow_parquet(tmpdir, sample_daily):
+    temp_file = str(tmpdir.join("summary.parquet"))
+
+    export_to_arrow(iter(sample_daily), temp_file)
+
+    table = pq.read_table(temp_file)
+    assert table.schema.field("Date").type == pa.date32()
+    assert table.schema.field("Max Temperature").type == pa.float32()
+    assert table.schema.field("Humidity").type == pa.float32()
+    assert table.schema.field("Is Hot Day").type == pa.bool_()
+    assert table.column("Date").to_pylist() == [datetime.date(2024, 8, day) for day in range(18, 22)]
+    assert table.column("Is Hot Day").to_pylist() == [True, False, False, True]
+    assert table.column("Is Rainy Day").to_pylist() == [False, True, True, False]
+
+
+def test_export_to_arrow_feather(tmpdir, sample_daily):
+    temp_file = str(tmpdir.join("summary.feather"))
+
+    export_to_arrow(sample_daily, temp_file, file_format="feather")
+
+    # Arrow IPC files can be memory-mapped for zero-copy reloading
+    table = feather.read_table(temp_file, memory_map=True)
+    assert table.num_rows == 4
+    assert table.column("Weather Description").to_pylist() == ["Clear sky", "Light rain", "Moderate rain", "Sunny"]
+
+
+def test_save_to_arrow_task5_and_task6(tmpdir):
+    parsed_file = str(tmpdir.join("parsed.parquet"))
+    extracted_file = str(tmpdir.join("extracted.feather"))
+
+    save_parsed_to_arrow([{"date": "2024-08-18", "temperature": 32.9, "humidity": 65, "precipitation": 0.0}],
+                         parsed_file)
+    save_extracted_to_arrow([{"date": "2024-08-18", "max_temperature": 32.9, "min_temperature": 22.5,
+                              "humidity": 65, "precipitation": 0.0}], extracted_file, file_format="feather")
+
+    assert pq.read_table(parsed_file).column_names == ["Date", "Temperature", "Humidity", "Precipitation"]
+    assert feather.read_table(extracted_file).column("Min Temperature").to_pylist() == [22.5]
+
+
+def test_full_runs_parse_each_input_once(tmpdir, monkeypatch):
+    xml_file = tmpdir.join("weather.xml")
+    xml_file.write("<weather>\n<day><date>2024-08-18</date><temperature>32.9</temperature>"
+                   "<humidity>65</humidity><precipitation>0.0</precipitation></day>\n</weather>\n")
+    text_file = tmpdir.join("weather.txt")
+    text_file.write("Date: 2024-08-18, Max Temp: 32.9°C, Min Temp: 22.5°C, Humidity: 65%, Precipitation: 0.0mm\n")
+    calls = []
+
+    def counting(parse):
+        def wrapper(*args, **kwargs):
+            calls.append(parse.__name__)
+            return parse(*args, **kwargs)
+        return wrapper
+
+    monkeypatch.setattr(task5, "iter_weather_xml", counting(task5.iter_weather_xml))
+    monkeypatch.setattr(task6, "iter_weather_records", counting(task6.iter_weather_records))
+    task5.run(str(xml_file), str(tmpdir.join("parsed.csv")))
+    task6.run(str(text_file), str(tmpdir.join("extracted.csv")))
+
+    assert calls == ["iter_weather_xml", "iter_weather_records"]
+    assert pq.read_table(str(tmpdir.join("parsed.parquet"))).num_rows == 1
+    assert pq.read_table(str(tmpdir.join("extracted.parquet"))).num_rows == 1
+    assert tmpdir.join("extracted.csv").read().count("\n") == 2
+
+
+def test_write_table_batches(tmpdir):
+    temp_file = str(tmpdir.join("batches.parquet"))
+    rows = ((f"2024-01-{i % 28 + 1:02d}", float(i)) for i in range(1000))
+
+    write_table(rows, [("Date", "date32"), ("Value", "float32")], temp_file, batch_size=128)
+
+    table = pq.read_table(temp_file)
+    assert table.num_rows == 1000
+    assert table.column("Value").to_pylist()[-1] == 999.0
+
+
+def test_export_to_arrow_keeps_fractional_humidity(tmpdir, sample_daily):
+    temp_file = str(tmpdir.join("summary.parquet"))
+    sample_daily[0]["humidity"] = 65.5
+
+    export_to_arrow(sample_daily, temp_file)
+
+    assert pq.read_table(temp_file).column("Humidity").to_pylist() == [65.5, 70.0, 80.0, 60.0]
+
+
+def test_write_table_rejects_fractional_int32(tmpdir):
+    with pytest.raises(ValueError, match="Humidity"):
+        write_table([(60,), (65.5,)], [("Humidity", "int32")], str(tmpdir.join("out.parquet")))
+    write_table([(60,), (65.0,)], [("Humidity", "int32")], str(tmpdir.join("out.parquet")))
+    assert pq.read_table(str(tmpdir.join("out.parquet"))).column("Humidity").to_pylist() == [60, 65]
+
+
+def test_write_table_rejects_unknown_format(tmpdir):
+    with pytest.raises(ValueError):
+        write_table([], [("Date", "date32")], str(tmpdir.join("out.xlsx")), file_format="xlsx")
+    with pytest.raises(ValueError):
+        write_table([], [("Date", "datetime")], str(tmpdir.join("out.parquet")))
+
+
+if __name__ == "__main__":
+    pytest.main()
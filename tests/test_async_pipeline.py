@@ -0,0 +1,149 @@
+"""
+Test suite for the async HTTP client and the async pipeline, against a local aiohttp stub server.
+"""
+import pytest
+import asyncio
+import json
+import os
+from src.pipeline import Task
+from src.task1_scrape import extract_page_fields
+
+aiohttp = pytest.importorskip("aiohttp")
+from aiohttp import web  # noqa: E402
+from src.async_http import AsyncHTTPClient  # noqa: E402
+from src.async_pipeline import run_pipeline_async, scrape_pages  # noqa: E402
+from src.task1_scrape import afetch_wikipedia_page  # noqa: E402
+from src.task2_fetch_tokyo_weather import afetch_weather_data  # noqa: E402
+
+PAGE = ('<html><body><h1 id="firstHeading">{title}</h1>'
+        '<div class="mw-parser-output"><p>{title} is a topic. More text.</p></div></body></html>')
+
+
+class StubServer:
+    """A local aiohttp server serving wiki pages and a forecast, with optional failures and delays."""
+
+    def __init__(self, failures=0, delay=0.0):
+        self.failures = failures
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests = 0
+
+    async def page(self, request):
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.failures:
+                self.failures -= 1
+                return web.Response(status=503)
+            return web.Response(text=PAGE.format(title=request.match_info["title"]), content_type="text/html")
+        finally:
+            self.in_flight -= 1
+
+    async def forecast(self, request):
+        self.requests += 1
+        assert request.query["latitude"] == "35.6895"
+        return web.json_response({"daily": {"time": ["2024-08-18"], "temperature_2m_max": [32.5]}})
+
+    async def __aenter__(self):
+        app = web.Application()
+        app.router.add_get("/wiki/{title}", self.page)
+        app.router.add_get("/v1/forecast", self.forecast)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        self.url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.runner.cleanup()
+
+
+def test_afetch_wikipedia_page_and_weather_data():
+    async def main():
+        async with StubServer() as server:
+            html = await afetch_wikipedia_page(f"{server.url}/wiki/Web_scraping")
+            weather = await afetch_weather_data(base_url=f"{server.url}/v1/forecast")
+        return html, weather
+
+    html, weather = asyncio.run(main())
+
+    assert extract_page_fields(html)["title"] == "Web_scraping"
+    assert weather == {"date": "2024-08-18", "max_temperature": 32.5}
+
+
+def test_client_retries_and_raises():
+    async def main():
+        async with StubServer(failures=2) as server:
+            async with AsyncHTTPClient(backoff=0.01) as client:
+                html = await client.get_text(f"{server.url}/wiki/Retry")
+            retried = server.requests
+            server.failures = 5
+            async with AsyncHTTPClient(retries=1, backoff=0.01) as client:
+                with pytest.raises(aiohttp.ClientResponseError):
+                    await client.get_text(f"{server.url}/wiki/Down")
+        return html, retried
+
+    html, retried = asyncio.run(main())
+
+    assert "Retry" in html
+    assert retried == 3
+
+
+def test_client_must_be_opened():
+    with pytest.raises(RuntimeError):
+        asyncio.run(AsyncHTTPClient().get("http://127.0.0.1/"))
+
+
+def test_scrape_pages_limits_concurrency():
+    titles = [f"Page_{i}" for i in range(12)]
+
+    async def main():
+        async with StubServer(delay=0.05) as server:
+            async with AsyncHTTPClient(max_concurrency=3) as client:
+                pages = await scrape_pages([f"{server.url}/wiki/{title}" for title in titles], client)
+        return server, pages
+
+    server, pages = asyncio.run(main())
+
+    assert server.max_in_flight == 3
+    assert [fields["title"] for fields in pages.values()] == titles
+    assert pages[next(iter(pages))]["first_sentence"] == "Page_0 is a topic."
+
+
+def test_run_pipeline_async(tmpdir):
+    wiki_json, weather_json = str(tmpdir.join("wiki.json")), str(tmpdir.join("weather.json"))
+    report = str(tmpdir.join("report.txt"))
+
+    def summarize(task, options):
+        with open(task.inputs[0]) as f:
+            weather = json.load(f)
+        with open(task.outputs[0], 'w') as f:
+            f.write(f"{weather['date']}: {weather['max_temperature']}")
+
+    def fail(task, options):
+        raise ValueError("broken")
+
+    tasks = [
+        Task("report", summarize, [weather_json], [report]),
+        Task("task1", None, outputs=[wiki_json]),
+        Task("task2", None, outputs=[weather_json]),
+        Task("broken", fail, outputs=[str(tmpdir.join("broken.txt"))]),
+        Task("after_broken", summarize, [str(tmpdir.join("broken.txt"))], [str(tmpdir.join("after.txt"))]),
+    ]
+
+    async def main():
+        async with StubServer() as server:
+            return await run_pipeline_async(tasks, wikipedia_url=f"{server.url}/wiki/Web_scraping",
+                                            weather_url=f"{server.url}/v1/forecast")
+
+    results = asyncio.run(main())
+
+    assert [(result.name, result.status) for result in results] == [
+        ("report", "ran"), ("task1", "ran"), ("task2", "ran"), ("broken", "failed"), ("after_broken", "blocked")]
+    assert json.loads(tmpdir.join("wiki.json").read())["first_sentence"] == "Web_scraping is a topic."
+    assert tmpdir.join("report.txt").read() == "2024-08-18: 32.5"
+    assert not os.path.exists(str(tmpdir.join("after.txt")))
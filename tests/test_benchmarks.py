@@ -0,0 +1,51 @@
+"""
+Test suite for the benchmark generators and the regression check.
+"""
+import pytest
+import json
+from benchmarks import suite
+from benchmarks.generators import generate_daily_records, write_weather_json, write_weather_xml
+from src.task5_parse_weather_xml import parse_weather_xml
+from src.utils import load_json
+
+
+def test_generators_are_deterministic(tmpdir):
+    assert list(generate_daily_records(5)) == list(generate_daily_records(5))
+    assert list(generate_daily_records(5)) != list(generate_daily_records(5, seed=1))
+
+    json_file = write_weather_json(str(tmpdir.join("weather.json")), 20)
+    xml_file = write_weather_xml(str(tmpdir.join("weather.xml")), 20)
+
+    days = load_json(json_file)["daily"]
+    assert days == list(generate_daily_records(20))
+    assert [day["date"] for day in parse_weather_xml(xml_file)] == [day["date"] for day in days]
+
+
+def test_find_regressions():
+    baselines = {"task6.extract_weather_data": {"1M": 1.0, "1K": 0.001}}
+    results = {"task6.extract_weather_data": {"1M": 1.6, "1K": 0.004}, "utils.load_json": {"1M": 9.0}}
+
+    regressions = suite.find_regressions(results, baselines, tolerance=0.5)
+
+    # 1K stays within the noise floor and load_json has no baseline
+    assert len(regressions) == 1
+    assert regressions[0].startswith("task6.extract_weather_data @ 1M")
+
+
+def test_run_suite_and_record(tmpdir, monkeypatch):
+    monkeypatch.setitem(suite.SIZES, "tiny", 50)
+    baseline_file = str(tmpdir.join("baselines.json"))
+
+    results = suite.run_suite(["tiny"], only=["task5", "task6"], repeat=1)
+    suite.save_baselines(results, baseline_file)
+
+    assert set(results) == {"task5.iter_weather_xml", "task5.parse_weather_xml",
+                            "task6.extract_weather_data", "task6.iter_weather_records"}
+    with open(baseline_file) as f:
+        assert set(json.load(f)["results"]["task5.parse_weather_xml"]) == {"tiny"}
+    assert suite.main(["--sizes", "tiny", "--only", "task6", "--repeat", "1",
+                       "--check", "--tolerance", "1000", "--baselines", baseline_file]) == 0
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,128 @@
+"""
+Test suite for the rolling-window and climatology analytics.
+"""
+import pytest
+import numpy as np
+import pandas as pd
+from src.climatology import (analyze_climatology, anomalies, day_of_year_climatology, day_of_year_slots,
+                             find_heatwaves, heatwave_mask, rolling_mean, rolling_sums)
+
+
+def iso_dates(start, days):
+    return pd.date_range(start, periods=days, freq="D").strftime("%Y-%m-%d").to_numpy()
+
+
+def daily_columns(dates, max_temperature):
+    days = len(dates)
+    return {"date": dates, "max_temperature": np.asarray(max_temperature, dtype=float),
+            "min_temperature": np.full(days, 20.0), "precipitation": np.zeros(days),
+            "wind_speed": np.full(days, 10.0), "humidity": np.full(days, 60),
+            "weather_description": np.full(days, "Clear sky")}
+
+
+def test_rolling_mean_matches_pandas():
+    dates = iso_dates("2000-01-01", 1000)
+    values = np.random.default_rng(0).normal(25, 5, 1000)
+
+    for window in (1, 7, 30, 365):
+        expected = pd.Series(values).rolling(window).mean().to_numpy()
+        np.testing.assert_allclose(rolling_mean(dates, values, window), expected, rtol=1e-12)
+
+
+def test_rolling_windows_are_calendar_days():
+    # 2024-01-04 and 2024-01-05 are missing
+    dates = ["2024-01-01", "2024-01-02", "2024-01-03", "2024-01-06", "2024-01-07"]
+    values = [1.0, 2.0, 3.0, 4.0, 5.0]
+
+    sums, counts = rolling_sums(dates, values, 3)
+
+    assert sums.tolist() == [1.0, 3.0, 6.0, 4.0, 9.0]
+    assert counts.tolist() == [1, 2, 3, 1, 2]
+    # Incomplete windows have no mean unless fewer values are allowed
+    assert np.isnan(rolling_mean(dates, values, 3)).tolist() == [True, True, False, True, True]
+    assert rolling_mean(dates, values, 3, min_periods=1).tolist() == [1.0, 1.5, 2.0, 4.0, 4.5]
+
+
+def test_rolling_mean_skips_nan_and_handles_stations():
+    dates = iso_dates("2024-01-01", 4)
+    values = np.array([[1.0, 10.0], [np.nan, 20.0], [3.0, 30.0], [5.0, 40.0]])
+
+    means = rolling_mean(dates, values, 2, min_periods=1)
+
+    assert means[:, 0].tolist() == [1.0, 1.0, 3.0, 4.0]
+    assert means[:, 1].tolist() == [10.0, 15.0, 25.0, 35.0]
+
+
+def test_rolling_rejects_unsorted_dates():
+    with pytest.raises(ValueError):
+        rolling_mean(["2024-01-02", "2024-01-01"], [1.0, 2.0], 2)
+    with pytest.raises(ValueError):
+        rolling_mean(["2024-01-01"], [1.0], 0)
+
+
+def test_find_heatwaves():
+    dates = iso_dates("2024-07-01", 12)
+    hot = [True, True, True, False, True, True, False, True, True, True, True, False]
+
+    heatwaves = find_heatwaves(dates, hot, min_days=3)
+
+    assert heatwaves["start"].tolist() == [0, 7]
+    assert heatwaves["end"].tolist() == [2, 10]
+    assert heatwaves["days"].tolist() == [3, 4]
+    assert heatwave_mask(dates, hot, 3).tolist() == [True] * 3 + [False] * 4 + [True] * 4 + [False]
+
+
+def test_missing_day_breaks_a_heatwave():
+    dates = ["2024-07-01", "2024-07-02", "2024-07-04", "2024-07-05"]
+
+    assert len(find_heatwaves(dates, [True] * 4, min_days=3)["start"]) == 0
+    assert find_heatwaves(dates, [True] * 4, min_days=2)["days"].tolist() == [2, 2]
+
+
+def test_day_of_year_slots_align_leap_years():
+    slots = day_of_year_slots(["2023-01-01", "2023-03-01", "2024-02-29", "2024-03-01", "2024-12-31"])
+
+    assert slots.tolist() == [0, 60, 59, 60, 365]
+
+
+def test_climatology_and_anomalies():
+    dates = iso_dates("1990-01-01", 30 * 365)
+    slots = day_of_year_slots(dates)
+    seasonal = 20 + 10 * np.sin(2 * np.pi * slots / 366)
+    values = seasonal + np.where(dates >= "2015", 1.5, 0.0)
+
+    climatology = day_of_year_climatology(dates, values, smoothing=1)
+    # Each slot averages the same seasonal value and the shift of the last years
+    np.testing.assert_allclose(climatology[slots], seasonal + values.mean() - seasonal.mean(), atol=0.1)
+
+    recent = anomalies(dates, values, base_period=(1990, 2014), smoothing=1)
+    np.testing.assert_allclose(recent[dates >= "2015"], 1.5, atol=1e-9)
+    np.testing.assert_allclose(recent[dates < "2015"], 0.0, atol=1e-9)
+
+
+def test_climatology_smoothing_wraps_the_new_year():
+    dates = ["2023-12-31", "2024-01-01"]
+
+    climatology = day_of_year_climatology(dates, [10.0, 20.0], smoothing=3)
+
+    assert climatology[0] == climatology[365] == 15.0
+    assert np.isnan(climatology[180])
+    with pytest.raises(ValueError):
+        day_of_year_climatology(dates, [10.0, 20.0], smoothing=4)
+
+
+def test_analyze_climatology_reuses_thresholds():
+    dates = iso_dates("2024-07-01", 10)
+    max_temperature = [31, 32, 33, 25, 31, 31, 29, 29, 29, 29]
+
+    result = analyze_climatology(daily_columns(dates, max_temperature), temp_threshold=30, windows=(3,))
+
+    assert result["is_hot_day"].tolist() == [t > 30 for t in max_temperature]
+    assert result["hot_days_3d"].tolist() == [1, 2, 3, 2, 2, 2, 2, 1, 0, 0]
+    assert result["in_heatwave"].tolist() == [True] * 3 + [False] * 7
+    assert result["max_temperature_mean_3d"][2] == 32.0
+    assert "max_temperature_anomaly" in result
+
+    # A lower threshold turns the second run into a heatwave too
+    cooler = analyze_climatology(daily_columns(dates, max_temperature), temp_threshold=28, windows=(3,))
+    assert cooler["in_heatwave"].tolist() == [True] * 3 + [False] + [True] * 6
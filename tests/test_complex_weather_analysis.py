@@ -1,6 +1,8 @@
 import pytest
 import json
-from src.task3_complex_weather_analysis import analyze_daily_weather, generate_daily_report, summarize_weather_analysis
+import pandas as pd
+from src.task3_complex_weather_analysis import (analyze_daily_weather, generate_daily_report, summarize_weather_analysis,
+                                                analyze_weather_columns, columns_to_analyses, summarize_weather_columns)
 from src.utils import load_json
 
 
@@ -135,5 +137,26 @@ def test_summarize_weather_analysis():
     assert "5.0 mm" in summary
 
 
+def test_analyze_weather_columns_matches_per_day(sample_daily):
+    expected = [analyze_daily_weather(day) for day in sample_daily]
+
+    # List of dicts and DataFrame inputs give the same per-day results
+    assert columns_to_analyses(analyze_weather_columns(sample_daily)) == expected
+    assert columns_to_analyses(analyze_weather_columns(pd.DataFrame(sample_daily))) == expected
+
+
+def test_analyze_weather_columns_thresholds(sample_daily):
+    analysis = analyze_weather_columns(sample_daily, temp_threshold=32, wind_threshold=9)
+    assert analysis["is_hot_day"].tolist() == [True, False, False, True]
+    assert analysis["is_windy_day"].tolist() == [True, True, False, True]
+
+
+def test_summarize_weather_columns_matches_per_day(sample_daily):
+    expected = summarize_weather_analysis([analyze_daily_weather(day) for day in sample_daily])
+
+    assert summarize_weather_columns(analyze_weather_columns(sample_daily)) == expected
+    assert "Hottest day: 2024-08-21 with a maximum temperature of 33.0°C" in expected
+
+
 if __name__ == "__main__":
     pytest.main()
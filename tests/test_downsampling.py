@@ -0,0 +1,95 @@
+"""
+Test suite for chart downsampling and period aggregation.
+"""
+import pytest
+import numpy as np
+import pandas as pd
+from src.downsampling import aggregate, choose_period, downsample, lttb_indices, minmax_indices
+
+
+def daily_frame(days, start="2024-01-01"):
+    return pd.DataFrame({
+        "date": pd.date_range(start, periods=days, freq="D"),
+        "max_temperature": np.arange(days, dtype=float),
+        "precipitation": np.ones(days),
+    })
+
+
+def test_choose_period_fits_point_budget():
+    assert choose_period(365, max_points=2000) == "daily"
+    assert choose_period(5000, max_points=2000) == "weekly"
+    assert choose_period(40 * 365, max_points=2000) == "monthly"
+    assert choose_period(1000 * 365, max_points=2000) == "yearly"
+    # Yearly is the coarsest period, even if it does not fit
+    assert choose_period(10_000 * 365, max_points=100) == "yearly"
+
+
+def test_aggregate_monthly_means_and_sums():
+    monthly = aggregate(daily_frame(60), "monthly", {"max_temperature": "mean", "precipitation": "sum"})
+
+    assert list(monthly["date"]) == [pd.Timestamp("2024-01-01"), pd.Timestamp("2024-02-01")]
+    assert list(monthly["max_temperature"]) == [15.0, 45.0]
+    assert list(monthly["precipitation"]) == [31.0, 29.0]
+
+
+def test_aggregate_drops_periods_without_days():
+    frame = daily_frame(100)
+    frame = frame[(frame["date"] < "2024-02-01") | (frame["date"] >= "2024-03-01")]
+
+    monthly = aggregate(frame, "monthly", {"precipitation": "sum"})
+
+    assert list(monthly["date"].dt.month) == [1, 3, 4]
+
+
+def test_aggregate_daily_keeps_rows():
+    daily = aggregate(daily_frame(10), "daily", {"max_temperature": "mean"})
+
+    assert list(daily.columns) == ["date", "max_temperature"]
+    assert len(daily) == 10
+
+
+def test_aggregate_unknown_period():
+    with pytest.raises(ValueError):
+        aggregate(daily_frame(10), "hourly", {"max_temperature": "mean"})
+
+
+def test_lttb_keeps_endpoints_and_peaks():
+    y = np.zeros(10_000)
+    y[1234] = 50.0
+    y[7777] = -40.0
+
+    indices = lttb_indices(np.arange(len(y)), y, 100)
+
+    assert len(indices) == 100
+    assert indices[0] == 0 and indices[-1] == len(y) - 1
+    assert np.all(np.diff(indices) > 0)
+    assert 1234 in indices and 7777 in indices
+
+
+def test_lttb_short_series_is_unchanged():
+    assert list(lttb_indices([0, 1, 2], [5, 6, 7], 10)) == [0, 1, 2]
+    with pytest.raises(ValueError):
+        lttb_indices([0, 1, 2], [5, 6, 7], 2)
+
+
+def test_minmax_keeps_extremes_of_every_bucket():
+    y = np.random.default_rng(0).random(1000)
+    y[500] = 10.0
+
+    indices = minmax_indices(y, 10)
+
+    assert len(indices) <= 20
+    assert 500 in indices
+    assert int(np.argmin(y)) in indices
+
+
+def test_downsample_dates_and_methods():
+    frame = daily_frame(5000)
+
+    lttb = downsample(frame["date"], frame["max_temperature"], 500)
+    minmax = downsample(frame["date"], frame["precipitation"], 500, method="minmax")
+
+    assert len(lttb) == 500
+    assert len(minmax) <= 500
+    with pytest.raises(ValueError):
+        downsample(frame["date"], frame["max_temperature"], 500, method="average")
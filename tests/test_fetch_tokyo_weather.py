@@ -1,7 +1,11 @@
 import pytest
 import requests
 import json
-from src.task2_fetch_tokyo_weather import fetch_weather_data
+import math
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from src.task2_fetch_tokyo_weather import fetch_weather_data, fetch_weather_batch
 from src.utils import save_to_json
 
 
@@ -49,5 +53,62 @@ def test_save_to_json(tmpdir):
     assert saved_data == data
 
 
+class MockOpenMeteoHandler(BaseHTTPRequestHandler):
+    """Answer multi-location forecast requests the way Open-Meteo does."""
+    requests_seen = []
+
+    def do_GET(self):
+        query = parse_qs(urlsplit(self.path).query)
+        latitudes = query["latitude"][0].split(",")
+        longitudes = query["longitude"][0].split(",")
+        variables = query["daily"][0].split(",")
+        self.requests_seen.append(len(latitudes))
+        locations = []
+        for lat, lon in zip(latitudes, longitudes):
+            daily = {"time": ["2024-08-18", "2024-08-19"]}
+            for variable in variables:
+                daily[variable] = [float(lat), None] if variable == "precipitation_sum" else [float(lat), float(lon)]
+            locations.append({"latitude": float(lat), "longitude": float(lon), "daily": daily})
+        body = json.dumps(locations[0] if len(locations) == 1 else locations).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def mock_open_meteo():
+    MockOpenMeteoHandler.requests_seen = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockOpenMeteoHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/v1/forecast"
+    server.shutdown()
+    server.server_close()
+
+
+def test_fetch_weather_batch(mock_open_meteo):
+    locations = [(float(i), 100.0 + i) for i in range(25)]
+
+    result = fetch_weather_batch(locations, variables=["temperature_2m_max", "precipitation_sum"],
+                                 chunk_size=10, base_url=mock_open_meteo)
+
+    # 25 locations in chunks of 10 need only 3 requests
+    assert sorted(MockOpenMeteoHandler.requests_seen) == [5, 10, 10]
+    assert list(result) == locations
+    assert result[(7.0, 107.0)]["time"] == ["2024-08-18", "2024-08-19"]
+    assert list(result[(7.0, 107.0)]["temperature_2m_max"]) == [7.0, 107.0]
+    assert math.isnan(result[(7.0, 107.0)]["precipitation_sum"][1])
+
+
+def test_fetch_weather_batch_single_location(mock_open_meteo):
+    result = fetch_weather_batch([(35.6895, 139.6917)], base_url=mock_open_meteo)
+
+    assert list(result[(35.6895, 139.6917)]["temperature_2m_max"]) == [35.6895, 139.6917]
+
+
 if __name__ == "__main__":
     pytest.main()
@@ -0,0 +1,131 @@
+"""
+Test suite for the on-disk HTTP cache in src/http_cache.py
+"""
+import pytest
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from src.http_cache import HTTPCache, cached_get
+from src.task1_scrape import fetch_wikipedia_page
+
+
+class ConditionalHandler(BaseHTTPRequestHandler):
+    """Serve versioned bodies with an ETag and answer matching conditional requests with 304."""
+    version = 1
+    counts = {"200": 0, "304": 0}
+
+    def do_GET(self):
+        etag = f'"v{self.version}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.counts["304"] += 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.counts["200"] += 1
+        body = f"<html><body><p>{self.path} version {self.version}</p></body></html>".encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", "Sun, 18 Aug 2024 00:00:00 GMT")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    ConditionalHandler.version = 1
+    ConditionalHandler.counts = {"200": 0, "304": 0}
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), ConditionalHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_fresh_entry_skips_network(server, tmpdir):
+    cache = HTTPCache(str(tmpdir), ttl=60)
+
+    first = cached_get(f"{server}/page", cache)
+    second = cached_get(f"{server}/page", cache)
+
+    assert not first.from_cache
+    assert second.from_cache
+    assert second.text == first.text
+    assert ConditionalHandler.counts == {"200": 1, "304": 0}
+
+
+def test_stale_entry_is_revalidated(server, tmpdir):
+    cache = HTTPCache(str(tmpdir), ttl=0)
+
+    cached_get(f"{server}/page", cache)
+    unchanged = cached_get(f"{server}/page", cache)
+
+    # Unchanged content costs a 304 and is served from disk
+    assert unchanged.from_cache
+    assert ConditionalHandler.counts == {"200": 1, "304": 1}
+
+    ConditionalHandler.version = 2
+    changed = cached_get(f"{server}/page", cache)
+
+    assert not changed.from_cache
+    assert "version 2" in changed.text
+    assert "version 2" in cached_get(f"{server}/page", cache).text
+
+
+def test_cache_persists_across_instances(server, tmpdir):
+    cached_get(f"{server}/page", HTTPCache(str(tmpdir), ttl=60))
+
+    # A new pipeline run reuses the bodies stored on disk
+    page = fetch_wikipedia_page(f"{server}/page", cache=HTTPCache(str(tmpdir), ttl=60))
+
+    assert "version 1" in page
+    assert ConditionalHandler.counts["200"] == 1
+
+
+def test_lru_eviction(server, tmpdir):
+    cache = HTTPCache(str(tmpdir), ttl=60, max_entries=2)
+
+    cached_get(f"{server}/a", cache)
+    time.sleep(0.01)
+    cached_get(f"{server}/b", cache)
+    cached_get(f"{server}/a", cache)  # touch /a so /b becomes least recently used
+    cached_get(f"{server}/c", cache)
+
+    assert cache.lookup(f"{server}/a") is not None
+    assert cache.lookup(f"{server}/b") is None
+    assert cache.lookup(f"{server}/c") is not None
+    assert len(tmpdir.listdir()) == 4
+
+
+def test_lru_order_persists_across_instances(server, tmpdir):
+    cached_get(f"{server}/a", HTTPCache(str(tmpdir), ttl=60, max_entries=2))
+    time.sleep(0.01)
+    cached_get(f"{server}/b", HTTPCache(str(tmpdir), ttl=60, max_entries=2))
+    time.sleep(0.01)
+    # A later run reads /a, so /b becomes least recently used for the run after it
+    HTTPCache(str(tmpdir), ttl=60, max_entries=2).lookup(f"{server}/a")
+
+    cache = HTTPCache(str(tmpdir), ttl=60, max_entries=2)
+    cached_get(f"{server}/c", cache)
+
+    assert cache.lookup(f"{server}/a") is not None
+    assert cache.lookup(f"{server}/b") is None
+
+
+def test_size_bound_eviction(server, tmpdir):
+    cache = HTTPCache(str(tmpdir), ttl=60, max_bytes=80)
+
+    cached_get(f"{server}/first", cache)
+    cached_get(f"{server}/second", cache)
+
+    assert cache.lookup(f"{server}/first") is None
+    assert cache.lookup(f"{server}/second") is not None
+
+
+if __name__ == "__main__":
+    pytest.main()
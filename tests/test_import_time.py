@@ -0,0 +1,69 @@
+"""
+Startup-cost regression checks based on ``python -X importtime``.
+"""
+import pytest
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Dependencies that must only be imported by the functions that use them
+HEAVY_MODULES = ("requests", "bs4", "numpy", "pandas", "pyarrow", "urllib3")
+
+# Generous budget for the cumulative import time of one module, in microseconds.
+# Eagerly importing requests and bs4 alone costs more than this.
+IMPORT_BUDGET_US = 100_000
+
+MODULES = [
+    "src",
+    "src.climatology",
+    "src.downsampling",
+    "src.multi_station",
+    "src.parse_cache",
+    "src.pipeline",
+    "src.records",
+    "src.task1_scrape",
+    "src.task2_fetch_tokyo_weather",
+    "src.task3_complex_weather_analysis",
+    "src.task4_weather_summary_export",
+    "src.task5_parse_weather_xml",
+    "src.task6_extract_weather_data",
+]
+
+
+def import_times(module):
+    """Import ``module`` in a fresh interpreter and return ``{name: cumulative_us}``."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize("module", MODULES)
+def test_module_does_not_import_heavy_dependencies(module):
+    times = import_times(module)
+
+    assert module in times
+    loaded = sorted(name for name in times if name.split(".")[0] in HEAVY_MODULES)
+    assert loaded == []
+
+
+@pytest.mark.parametrize("module", MODULES)
+def test_module_import_time_budget(module):
+    assert import_times(module)[module] < IMPORT_BUDGET_US
+
+
+def test_package_submodules_load_on_access():
+    code = "import sys, src; assert 'src.utils' not in sys.modules; src.utils; assert 'src.utils' in sys.modules"
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True)
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,217 @@
+"""
+Test suite for incremental pipeline runs.
+"""
+import pytest
+import csv
+import json
+import os
+from src.incremental import IncrementalState, checkpoint, resume_offset, last_boundary, days_after
+from src import task3_complex_weather_analysis as task3
+from src import task4_weather_summary_export as task4
+from src import task5_parse_weather_xml as task5
+from src import task6_extract_weather_data as task6
+
+
+def report_line(date, max_temp=30.0):
+    return f"Date: {date}, Max Temp: {max_temp}°C, Min Temp: 20.0°C, Humidity: 60%, Precipitation: 0.5mm\n"
+
+
+def xml_day(date, temperature=30.0):
+    return (f"    <day>\n        <date>{date}</date>\n        <temperature>{temperature}</temperature>\n"
+            f"        <humidity>60</humidity>\n        <precipitation>0.5</precipitation>\n    </day>\n")
+
+
+def read_csv(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+
+def test_state_round_trip(tmpdir):
+    state_file = str(tmpdir.join("state.json"))
+
+    state = IncrementalState(state_file)
+    assert state.get("task6", "report.txt") == {}
+    state.update("task6", "report.txt", offset=10)
+    state.save()
+
+    assert IncrementalState(state_file).get("task6", "report.txt") == {"offset": 10}
+    assert IncrementalState(state_file).get("task5", "report.txt") == {}
+
+
+def test_corrupt_state_file_starts_over(tmpdir):
+    state_file = tmpdir.join("state.json")
+    state_file.write("{not json")
+
+    assert IncrementalState(str(state_file)).get("task6", "report.txt") == {}
+
+
+def test_resume_offset_detects_rewritten_file(tmpdir):
+    text_file = tmpdir.join("report.txt")
+    text_file.write("first line\nsecond line\n")
+    progress = checkpoint(str(text_file), 11)
+
+    text_file.write("first line\nsecond line\nthird line\n")
+    assert resume_offset(str(text_file), progress) == 11
+
+    # Same length, different history
+    text_file.write("FIRST LINE\nsecond line\nthird line\n")
+    assert resume_offset(str(text_file), progress) == 0
+
+    # Truncated
+    text_file.write("first")
+    assert resume_offset(str(text_file), progress) == 0
+
+
+def test_resume_offset_detects_edit_far_before_offset(tmpdir):
+    text_file = tmpdir.join("report.txt")
+    lines = [report_line(f"{1900 + i // 365}-01-{i % 28 + 1:02d}") for i in range(2000)]
+    text_file.write_text("".join(lines), encoding="utf-8")
+    offset = os.path.getsize(str(text_file))
+    progress = checkpoint(str(text_file), offset)
+
+    # Same length, changed at the very start, far more than 4 KB before the offset
+    text_file.write_text(lines[0].replace("30.0", "31.0") + "".join(lines[1:]) + lines[0], encoding="utf-8")
+
+    assert offset > 2 * 64 * 1024
+    assert resume_offset(str(text_file), progress) == 0
+
+
+def test_last_boundary_skips_partial_record(tmpdir):
+    text_file = tmpdir.join("report.txt")
+    text_file.write_binary(b"one\ntwo\nthr")
+
+    assert last_boundary(str(text_file), 0, b"\n") == 8
+    assert last_boundary(str(text_file), 8, b"\n") == 8
+
+
+def test_days_after(json_day):
+    days = [json_day("2024-08-18"), json_day("2024-08-19"), json_day("2024-08-20")]
+
+    assert [day["date"] for day in days_after(days, "2024-08-18")] == ["2024-08-19", "2024-08-20"]
+    assert len(list(days_after(days, None))) == 3
+
+
+def test_task6_incremental_appends_new_lines(tmpdir):
+    text_file = tmpdir.join("report.txt")
+    csv_file = str(tmpdir.join("extracted.csv"))
+    state_file = str(tmpdir.join("state.json"))
+    text_file.write_text(report_line("2024-08-18") + report_line("2024-08-19"), encoding="utf-8")
+
+    task6.run(str(text_file), csv_file, incremental=True, state_file=state_file)
+    assert [row["Date"] for row in read_csv(csv_file)] == ["2024-08-18", "2024-08-19"]
+
+    # The unfinished last line is left for the next run
+    with open(str(text_file), 'a', encoding='utf-8') as f:
+        f.write(report_line("2024-08-20") + "Date: 2024-08-21, Max Temp: 3")
+    task6.run(str(text_file), csv_file, incremental=True, state_file=state_file)
+    assert [row["Date"] for row in read_csv(csv_file)] == ["2024-08-18", "2024-08-19", "2024-08-20"]
+
+    with open(str(text_file), 'a', encoding='utf-8') as f:
+        f.write("1.0°C, Min Temp: 20.0°C, Humidity: 60%, Precipitation: 0.5mm\n")
+    task6.run(str(text_file), csv_file, incremental=True, state_file=state_file)
+    rows = read_csv(csv_file)
+    assert [row["Date"] for row in rows] == ["2024-08-18", "2024-08-19", "2024-08-20", "2024-08-21"]
+    assert rows[-1]["Max Temperature"] == "31.0"
+
+
+def test_task6_incremental_restarts_after_rewrite(tmpdir):
+    text_file = tmpdir.join("report.txt")
+    csv_file = str(tmpdir.join("extracted.csv"))
+    state_file = str(tmpdir.join("state.json"))
+    text_file.write_text(report_line("2024-08-18") + report_line("2024-08-19"), encoding="utf-8")
+    task6.run(str(text_file), csv_file, incremental=True, state_file=state_file)
+
+    text_file.write_text(report_line("2024-09-01"), encoding="utf-8")
+    task6.run(str(text_file), csv_file, incremental=True, state_file=state_file)
+
+    assert [row["Date"] for row in read_csv(csv_file)] == ["2024-09-01"]
+
+
+def test_task5_incremental_parses_inserted_days(tmpdir):
+    xml_file = tmpdir.join("weather.xml")
+    csv_file = str(tmpdir.join("parsed.csv"))
+    state_file = str(tmpdir.join("state.json"))
+    xml_file.write("<weather>\n" + xml_day("2024-08-18") + xml_day("2024-08-19") + "</weather>\n")
+
+    task5.run(str(xml_file), csv_file, incremental=True, state_file=state_file)
+
+    # New days are inserted before the closing root tag
+    xml_file.write("<weather>\n" + xml_day("2024-08-18") + xml_day("2024-08-19")
+                   + xml_day("2024-08-20", 28.5) + "</weather>\n")
+    task5.run(str(xml_file), csv_file, incremental=True, state_file=state_file)
+    task5.run(str(xml_file), csv_file, incremental=True, state_file=state_file)
+
+    rows = read_csv(csv_file)
+    assert [row["Date"] for row in rows] == ["2024-08-18", "2024-08-19", "2024-08-20"]
+    assert rows[-1]["Temperature"] == "28.5"
+
+
+def test_iter_weather_xml_range_small_chunks(tmpdir):
+    xml_file = tmpdir.join("weather.xml")
+    xml_file.write("<weather>\n" + "".join(xml_day(f"2024-08-{i:02d}") for i in range(1, 11)) + "</weather>\n")
+    end = last_boundary(str(xml_file), 0, b"</day>")
+
+    days = list(task5.iter_weather_xml_range(str(xml_file), 0, end, chunk_size=7))
+
+    assert days == task5.parse_weather_xml(str(xml_file))
+
+
+def test_iter_weather_xml_range_releases_parsed_days(tmpdir, monkeypatch):
+    xml_file = tmpdir.join("weather.xml")
+    xml_file.write("<weather>\n" + "".join(xml_day(f"2024-{i // 28 + 1:02d}-{i % 28 + 1:02d}") for i in range(200))
+                   + "</weather>\n")
+    end = last_boundary(str(xml_file), 0, b"</day>")
+    children = []
+    read_days = task5._read_days
+
+    def counting_read_days(parser, root):
+        for day in read_days(parser, root):
+            children.append(len(root))
+            yield day
+    monkeypatch.setattr(task5, "_read_days", counting_read_days)
+
+    assert len(list(task5.iter_weather_xml_range(str(xml_file), 0, end, chunk_size=64))) == 200
+    # The synthetic root only holds the days of the current chunk
+    assert max(children) <= 2
+
+
+def test_task4_incremental_summary_covers_all_days(tmpdir, json_day):
+    json_file = str(tmpdir.join("weather.json"))
+    csv_file = str(tmpdir.join("summary.csv"))
+    state_file = str(tmpdir.join("state.json"))
+    days = [json_day("2024-08-18", 32.0), json_day("2024-08-19", 28.0)]
+    with open(json_file, 'w') as f:
+        json.dump({"city": "Tokyo", "daily": days}, f)
+
+    task4.run(json_file, csv_file, incremental=True, state_file=state_file)
+    days.append(json_day("2024-08-20", 34.0))
+    with open(json_file, 'w') as f:
+        json.dump({"city": "Tokyo", "daily": days}, f)
+    summary = task4.run(json_file, csv_file, incremental=True, state_file=state_file)
+
+    assert summary == task4.summarize_weather_data(days)
+    assert [row["Date"] for row in read_csv(csv_file)] == ["2024-08-18", "2024-08-19", "2024-08-20"]
+
+
+def test_task3_incremental_reports_new_days_only(tmpdir, json_day):
+    json_file = str(tmpdir.join("weather.json"))
+    state_file = str(tmpdir.join("state.json"))
+    days = [json_day("2024-08-18", 32.0), json_day("2024-08-19", 28.0)]
+    with open(json_file, 'w') as f:
+        json.dump({"daily": days}, f)
+    task3.run(json_file, incremental=True, state_file=state_file)
+
+    days.append(json_day("2024-08-20", 29.0))
+    with open(json_file, 'w') as f:
+        json.dump({"daily": days}, f)
+    report = task3.run(json_file, incremental=True, state_file=state_file)
+
+    assert "Date: 2024-08-18" not in report
+    assert "Date: 2024-08-20" in report
+    # The hottest day comes from the earlier run
+    assert "Hottest day: 2024-08-18" in report
+    assert report.endswith(task3.summarize_weather_analysis([task3.analyze_daily_weather(day) for day in days]))
+
+
+if __name__ == "__main__":
+    pytest.main()
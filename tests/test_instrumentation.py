@@ -0,0 +1,170 @@
+"""
+Test suite for the opt-in instrumentation layer.
+"""
+import pytest
+from src import instrumentation
+from src.instrumentation import collect_metrics, format_prometheus, instrumented, record, write_prometheus_textfile
+from src import task3_complex_weather_analysis as task3
+from src import task4_weather_summary_export as task4
+from src import task5_parse_weather_xml as task5
+from src.utils import load_json, save_to_json
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    instrumentation.disable()
+    instrumentation.reset_metrics()
+    yield
+    instrumentation.disable()
+    instrumentation.reset_metrics()
+
+
+def test_disabled_records_nothing():
+    @instrumented(rows=len)
+    def load():
+        return [1, 2, 3]
+
+    assert load() == [1, 2, 3]
+    assert instrumentation.get_metrics() == {}
+
+
+def test_collect_metrics_records_calls_rows_and_time():
+    @instrumented(rows=len)
+    def load():
+        return [1, 2, 3]
+
+    with collect_metrics() as metrics:
+        load()
+        load()
+
+    values = metrics["test_instrumentation.test_collect_metrics_records_calls_rows_and_time.<locals>.load"]
+    assert values["calls"] == 2
+    assert values["rows"] == 6
+    assert values["seconds"] >= 0
+    assert values["peak_memory"] > 0
+    # The previous state (disabled) is restored
+    assert not instrumentation.is_enabled()
+
+
+def test_collect_metrics_only_reports_calls_made_inside_the_block():
+    @instrumented()
+    def step():
+        pass
+
+    instrumentation.enable()
+    step()
+    with collect_metrics() as metrics:
+        step()
+    assert instrumentation.is_enabled()
+
+    (values,) = metrics.values()
+    assert values["calls"] == 1
+    assert instrumentation.get_metrics()[next(iter(metrics))]["calls"] == 2
+
+
+def test_record_adds_to_innermost_call():
+    @instrumented()
+    def inner():
+        record(rows=5)
+
+    @instrumented()
+    def outer():
+        inner()
+        record(rows=1, bytes_written=10)
+
+    with collect_metrics() as metrics:
+        outer()
+
+    by_function = {name.rsplit(".", 1)[-1]: values for name, values in metrics.items()}
+    assert by_function["inner"]["rows"] == 5
+    assert by_function["outer"]["rows"] == 1
+    assert by_function["outer"]["bytes_written"] == 10
+
+
+def test_failed_calls_are_still_timed():
+    @instrumented()
+    def fail():
+        raise ValueError("boom")
+
+    with collect_metrics() as metrics:
+        with pytest.raises(ValueError):
+            fail()
+
+    (values,) = metrics.values()
+    assert values["calls"] == 1
+
+
+def test_trace_memory_measures_allocations():
+    @instrumented()
+    def allocate():
+        return bytearray(4 * 1024 * 1024)
+
+    with collect_metrics(trace_memory=True) as metrics:
+        allocate()
+
+    (values,) = metrics.values()
+    assert values["peak_memory"] >= 4 * 1024 * 1024
+
+
+def test_file_functions_record_rows_and_bytes(tmpdir, json_day):
+    xml_file = tmpdir.join("weather.xml")
+    xml_file.write("<weather>\n"
+                   + "".join(f"<day><date>2024-01-0{i}</date><temperature>30.0</temperature>"
+                             f"<humidity>60</humidity><precipitation>0.5</precipitation></day>\n"
+                             for i in range(1, 4))
+                   + "</weather>\n")
+    csv_file = tmpdir.join("weather.csv")
+    json_file = tmpdir.join("weather.json")
+
+    with collect_metrics() as metrics:
+        data = task5.parse_weather_xml(str(xml_file))
+        task5.save_to_csv(data, str(csv_file))
+        task5.save_to_csv(data, str(csv_file), append=True)
+        save_to_json({"daily": [json_day("2024-01-01")]}, str(json_file))
+        load_json(str(json_file))
+
+    parse = metrics["task5_parse_weather_xml.parse_weather_xml"]
+    assert parse["rows"] == 3
+    assert parse["bytes_read"] == xml_file.size()
+    # The appending call only counts the bytes it added
+    save = metrics["task5_parse_weather_xml.save_to_csv"]
+    assert save["calls"] == 2
+    assert save["bytes_written"] == csv_file.size()
+    assert metrics["utils.save_to_json"]["bytes_written"] == json_file.size()
+    assert metrics["utils.load_json"]["bytes_read"] == json_file.size()
+
+
+def test_batch_functions_record_rows(tmpdir, json_day):
+    days = [json_day(f"2024-01-{i:02d}") for i in range(1, 11)]
+
+    with collect_metrics() as metrics:
+        task4.summarize_weather_data(days)
+        task4.export_to_csv(days, str(tmpdir.join("summary.csv")), buffer_size=3)
+
+    assert metrics["task4_weather_summary_export.summarize_weather_data"]["rows"] == 10
+    assert metrics["task4_weather_summary_export.export_to_csv"]["rows"] == 10
+
+
+def test_task_run_counts_analyzed_days(tmpdir, json_day):
+    json_file = tmpdir.join("weather.json")
+    save_to_json({"daily": [json_day("2024-01-01"), json_day("2024-01-02")]}, str(json_file))
+
+    with collect_metrics() as metrics:
+        task3.run(str(json_file))
+
+    assert metrics["task3_complex_weather_analysis.run"]["rows"] == 2
+    assert metrics["task3_complex_weather_analysis.summarize_weather_analysis"]["calls"] == 1
+
+
+def test_prometheus_textfile(tmpdir):
+    metrics = {"task5_parse_weather_xml.parse_weather_xml": {
+        "calls": 1, "seconds": 0.5, "rows": 3, "bytes_read": 100, "bytes_written": 0, "peak_memory": 2048}}
+    path = tmpdir.join("mlds.prom")
+
+    write_prometheus_textfile(str(path), metrics)
+
+    text = path.read()
+    assert text == format_prometheus(metrics)
+    assert "# TYPE mlds_function_calls_total counter" in text
+    assert 'mlds_function_rows_total{function="task5_parse_weather_xml.parse_weather_xml"} 3' in text
+    assert 'mlds_function_peak_memory_bytes{function="task5_parse_weather_xml.parse_weather_xml"} 2048' in text
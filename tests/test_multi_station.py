@@ -0,0 +1,89 @@
+"""
+Test suite for the multi-station analysis.
+"""
+import pytest
+import os
+from src.multi_station import STATION_SUMMARY_COLUMNS, load_stations, station_files, summarize_station, summarize_stations
+from src.task3_complex_weather_analysis import analyze_daily_weather
+from src.task4_weather_summary_export import summarize_weather_data
+from src.utils import load_json, save_to_json
+
+TOKYO_JSON = os.path.join(os.path.dirname(__file__), os.pardir, "src", "tokyo_weather_complex.json")
+
+
+def station_days(offset, count=20):
+    return [{"date": f"2024-08-{day + 1:02d}", "max_temperature": 25.0 + offset + day % 10,
+             "min_temperature": 18.0 + offset, "precipitation": float(day % 3), "wind_speed": 10.0 + day % 8,
+             "humidity": 60 + day % 20, "weather_description": "Cloudy"} for day in range(count)]
+
+
+def test_summarize_station_matches_task3_and_task4():
+    days = load_json(TOKYO_JSON)["daily"]
+
+    summary = summarize_station(days)
+
+    assert list(summary) == list(STATION_SUMMARY_COLUMNS)
+    for key, value in summarize_weather_data(days).items():
+        assert summary[key] == value
+    analyses = [analyze_daily_weather(day) for day in days]
+    assert summary["uncomfortable_days"] == sum(analysis["is_uncomfortable_day"] for analysis in analyses)
+    assert summary["max_temperature"] == max(day["max_temperature"] for day in days)
+    assert summary["days"] == len(days)
+    assert summary["first_date"] == days[0]["date"]
+
+
+def test_summarize_station_without_days():
+    summary = summarize_station([])
+
+    assert summary["days"] == 0
+    assert summary["hottest_day"] is None
+
+
+def test_load_stations(tmpdir):
+    multi_file = str(tmpdir.join("stations.json"))
+    save_to_json({"stations": [{"station": "a", "city": "A", "daily": station_days(0)},
+                               {"station": "b", "city": "B", "daily": station_days(5, 3)}]}, multi_file)
+
+    stations = load_stations(multi_file)
+
+    assert list(stations) == ["a", "b"]
+    assert stations["b"].to_dicts() == station_days(5, 3)
+    # The single-city format is one station named after its city
+    assert list(load_stations(TOKYO_JSON)) == ["Tokyo"]
+
+
+def test_load_stations_rejects_duplicates(tmpdir):
+    multi_file = str(tmpdir.join("stations.json"))
+    save_to_json({"stations": [{"station": "a", "daily": []}, {"station": "a", "daily": []}]}, multi_file)
+
+    with pytest.raises(ValueError):
+        load_stations(multi_file)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_summarize_stations_directory(tmpdir, workers):
+    for offset in range(6):
+        save_to_json({"city": f"Station {offset}", "daily": station_days(offset)},
+                     str(tmpdir.join(f"st{offset}.json")))
+
+    table = summarize_stations(str(tmpdir), workers=workers, temp_threshold=28)
+
+    assert list(station_files(str(tmpdir))) == [f"st{offset}" for offset in range(6)]
+    assert table.index.name == "station"
+    assert list(table.index) == [f"st{offset}" for offset in range(6)]
+    assert list(table.columns) == list(STATION_SUMMARY_COLUMNS)
+    for offset in range(6):
+        expected = summarize_station(station_days(offset), temp_threshold=28)
+        assert table.loc[f"st{offset}"].to_dict() == expected
+
+
+def test_summarize_stations_mapping_and_file(tmpdir):
+    stations = {"north": station_days(-10), "south": station_days(10)}
+    multi_file = str(tmpdir.join("stations.json"))
+    save_to_json({"stations": [{"station": name, "daily": days} for name, days in stations.items()]}, multi_file)
+
+    from_mapping = summarize_stations(stations, workers=2)
+    from_file = summarize_stations(multi_file, workers=1)
+
+    assert from_mapping.equals(from_file)
+    assert from_mapping.loc["south", "hot_days"] > from_mapping.loc["north", "hot_days"] == 0
@@ -0,0 +1,187 @@
+"""
+Test suite for the binary cache of parsed inputs.
+"""
+import json
+import os
+import pytest
+from src.parse_cache import ParseCache
+from src.records import DailyWeatherBatch
+from src import task3_complex_weather_analysis as task3
+from src import task5_parse_weather_xml as task5
+from src import task6_extract_weather_data as task6
+
+XML_DAY = ("<day><date>2024-08-{day:02d}</date><temperature>32.9</temperature>"
+           "<humidity>65</humidity><precipitation>0.0</precipitation></day>\n")
+
+
+def write_xml(path, days):
+    path.write("<weather>\n" + "".join(XML_DAY.format(day=day) for day in range(1, days + 1)) + "</weather>\n")
+
+
+class CountingParser:
+    """Wrap a parser and count its calls."""
+
+    def __init__(self, parse):
+        self.parse = parse
+        self.calls = 0
+
+    def __call__(self, source):
+        self.calls += 1
+        return self.parse(source)
+
+
+def test_unchanged_source_is_not_reparsed(tmpdir):
+    xml_file = tmpdir.join("weather.xml")
+    write_xml(xml_file, 5)
+    cache = ParseCache(str(tmpdir.join("cache")))
+    parser = CountingParser(task5.parse_weather_xml_batch)
+
+    first = cache.parse(str(xml_file), "xml", parser)
+    second = cache.parse(str(xml_file), "xml", parser)
+
+    assert parser.calls == 1
+    assert second.to_dicts() == first.to_dicts() == task5.parse_weather_xml(str(xml_file))
+
+
+def test_round_trip_keeps_every_column_type(tmpdir):
+    source = tmpdir.join("source.txt")
+    source.write("x")
+    batch = DailyWeatherBatch.from_records([
+        {"date": "2024-08-18", "max_temperature": 32.5, "humidity": 65, "weather_description": "Clear sky"},
+        {"date": "2024-08-19", "max_temperature": 30.0, "humidity": 70, "weather_description": "Rain"},
+    ])
+    cache = ParseCache(str(tmpdir.join("cache")))
+
+    cache.store(str(source), "test", batch)
+    loaded = cache.load(str(source), "test")
+
+    assert loaded.to_dicts() == batch.to_dicts()
+    assert loaded.column("humidity").typecode == 'q'
+    assert loaded.column("max_temperature").typecode == 'd'
+
+
+def test_changed_source_is_reparsed(tmpdir):
+    xml_file = tmpdir.join("weather.xml")
+    write_xml(xml_file, 5)
+    cache = ParseCache(str(tmpdir.join("cache")))
+    cache.parse(str(xml_file), "xml", task5.parse_weather_xml_batch)
+
+    write_xml(xml_file, 7)
+
+    assert cache.load(str(xml_file), "xml") is None
+    assert len(cache.parse(str(xml_file), "xml", task5.parse_weather_xml_batch)) == 7
+
+
+def test_same_size_change_is_detected(tmpdir):
+    xml_file = tmpdir.join("weather.xml")
+    write_xml(xml_file, 5)
+    cache = ParseCache(str(tmpdir.join("cache")))
+    cache.parse(str(xml_file), "xml", task5.parse_weather_xml_batch)
+    stat = os.stat(str(xml_file))
+
+    xml_file.write(xml_file.read().replace("32.9", "33.9"))
+    # Even with the old modification time restored, the content hash differs
+    os.utime(str(xml_file), ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+
+    assert cache.load(str(xml_file), "xml") is None
+
+
+def test_source_changed_while_parsing_is_not_cached(tmpdir):
+    xml_file = tmpdir.join("weather.xml")
+    write_xml(xml_file, 5)
+    cache = ParseCache(str(tmpdir.join("cache")))
+
+    def parse_then_rewrite(source):
+        batch = task5.parse_weather_xml_batch(source)
+        write_xml(xml_file, 7)
+        return batch
+
+    assert len(cache.parse(str(xml_file), "xml", parse_then_rewrite)) == 5
+    # The 5-day batch must not be recorded as the parse of the 7-day file
+    assert cache.load(str(xml_file), "xml") is None
+    assert len(cache.parse(str(xml_file), "xml", task5.parse_weather_xml_batch)) == 7
+
+
+def test_touched_source_is_still_a_hit(tmpdir):
+    xml_file = tmpdir.join("weather.xml")
+    write_xml(xml_file, 5)
+    cache = ParseCache(str(tmpdir.join("cache")))
+    cache.parse(str(xml_file), "xml", task5.parse_weather_xml_batch)
+
+    stat = os.stat(str(xml_file))
+    os.utime(str(xml_file), ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    assert cache.parse(str(xml_file), "xml", CountingParser(pytest.fail)) is not None
+
+
+def test_corrupt_cache_file_is_a_miss(tmpdir):
+    xml_file = tmpdir.join("weather.xml")
+    write_xml(xml_file, 5)
+    cache = ParseCache(str(tmpdir.join("cache")))
+    cache.parse(str(xml_file), "xml", task5.parse_weather_xml_batch)
+    path = cache.path(str(xml_file), "xml")
+
+    with open(path, 'r+b') as f:
+        f.truncate(os.path.getsize(path) - 16)
+    assert cache.load(str(xml_file), "xml") is None
+
+    with open(path, 'wb') as f:
+        f.write(b"not a cache file")
+    assert cache.load(str(xml_file), "xml") is None
+
+    open(path, 'wb').close()
+    assert cache.load(str(xml_file), "xml") is None
+
+
+@pytest.mark.parametrize("change", [
+    lambda header: [header],
+    lambda header: {key: value for key, value in header.items() if key != "offsets"},
+    lambda header: dict(header, size=str(header["size"])),
+    lambda header: dict(header, layout=None),
+    lambda header: dict(header, layout={key: value for key, value in header["layout"].items() if key != "typecodes"}),
+    lambda header: dict(header, offsets={field: span[0] for field, span in header["offsets"].items()}),
+    lambda header: dict(header, offsets={"date": header["offsets"]["date"]}),
+    lambda header: dict(header, layout=dict(header["layout"], fields=["date", "pressure"])),
+])
+def test_wrong_shaped_header_is_a_miss(tmpdir, change):
+    xml_file = tmpdir.join("weather.xml")
+    write_xml(xml_file, 5)
+    cache = ParseCache(str(tmpdir.join("cache")))
+    cache.parse(str(xml_file), "xml", task5.parse_weather_xml_batch)
+    path = cache.path(str(xml_file), "xml")
+
+    with open(path, 'rb') as f:
+        magic = f.read(8)
+        length = int.from_bytes(f.read(8), "little")
+        header = json.loads(f.read(length))
+        data = f.read()
+    # Valid JSON that is not a cache header
+    encoded = json.dumps(change(header)).encode("utf-8")
+    with open(path, 'wb') as f:
+        f.write(magic + len(encoded).to_bytes(8, "little") + encoded + data)
+
+    assert cache.load(str(xml_file), "xml") is None
+    assert len(cache.parse(str(xml_file), "xml", task5.parse_weather_xml_batch)) == 5
+
+
+def test_parsers_have_separate_entries(tmpdir):
+    source = str(tmpdir.join("weather.txt"))
+    cache = ParseCache(str(tmpdir.join("cache")))
+
+    assert cache.path(source, "text") != cache.path(source, "xml")
+
+
+def test_runs_with_cache_match_runs_without(tmpdir):
+    text_file = tmpdir.join("weather.txt")
+    text_file.write("Date: 2024-08-18, Max Temp: 32.9°C, Min Temp: 22.5°C, Humidity: 65%, Precipitation: 0.0mm\n"
+                    "Date: 2024-08-19, Max Temp: 31.0°C, Min Temp: 21.0°C, Humidity: 70%, Precipitation: 2.5mm\n")
+    json_file = os.path.join(os.path.dirname(__file__), os.pardir, "src", "tokyo_weather_complex.json")
+    cache = ParseCache(str(tmpdir.join("cache")))
+
+    for _ in range(2):
+        task6.run(str(text_file), str(tmpdir.join("cached.csv")), parse_cache=cache)
+        assert task3.run(json_file, parse_cache=cache) == task3.run(json_file)
+    task6.run(str(text_file), str(tmpdir.join("parsed.csv")))
+
+    assert tmpdir.join("cached.csv").read() == tmpdir.join("parsed.csv").read()
+    assert len(os.listdir(str(tmpdir.join("cache")))) == 2
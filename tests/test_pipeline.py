@@ -0,0 +1,114 @@
+"""
+Test suite for the pipeline runner.
+"""
+import pytest
+import os
+import threading
+import time
+from src.pipeline import Task, default_tasks, dependencies, run_pipeline, format_timings
+from src.__main__ import main
+
+
+def write_task(name, inputs, outputs, log, delay=0.0):
+    def action(task, options):
+        log.append(("start", name))
+        time.sleep(delay)
+        for path in task.outputs:
+            with open(path, 'w') as f:
+                f.write(name)
+        log.append(("end", name))
+    return Task(name, action, inputs, outputs)
+
+
+def test_dependencies_follow_files(tmpdir):
+    raw, clean, report = (str(tmpdir.join(name)) for name in ("raw.txt", "clean.txt", "report.txt"))
+    tasks = [Task("report", None, [clean], [report]), Task("clean", None, [raw], [clean]),
+             Task("fetch", None, [], [raw])]
+
+    assert dependencies(tasks) == {"report": ["clean"], "clean": ["fetch"], "fetch": []}
+
+
+def test_dependency_cycle_is_rejected(tmpdir):
+    a, b = str(tmpdir.join("a")), str(tmpdir.join("b"))
+
+    with pytest.raises(ValueError):
+        dependencies([Task("one", None, [a], [b]), Task("two", None, [b], [a])])
+
+
+def test_run_pipeline_respects_dependencies(tmpdir):
+    log = []
+    raw, clean = str(tmpdir.join("raw.txt")), str(tmpdir.join("clean.txt"))
+    tasks = [write_task("clean", [raw], [clean], log), write_task("fetch", [], [raw], log, delay=0.05)]
+
+    results = run_pipeline(tasks)
+
+    assert [result.status for result in results] == ["ran", "ran"]
+    assert log.index(("end", "fetch")) < log.index(("start", "clean"))
+
+
+def test_run_pipeline_runs_independent_tasks_concurrently(tmpdir):
+    barrier = threading.Barrier(2, timeout=5)
+
+    def action(task, options):
+        # Fails with BrokenBarrierError unless both tasks run at the same time
+        barrier.wait()
+
+    tasks = [Task("network", action, outputs=[str(tmpdir.join("a"))]),
+             Task("files", action, outputs=[str(tmpdir.join("b"))])]
+
+    assert [result.status for result in run_pipeline(tasks, max_workers=2)] == ["ran", "ran"]
+
+
+def test_run_pipeline_skips_up_to_date_tasks(tmpdir):
+    log = []
+    source, target = tmpdir.join("source.txt"), str(tmpdir.join("target.txt"))
+    source.write("data")
+    tasks = [write_task("convert", [str(source)], [target], log)]
+
+    assert run_pipeline(tasks)[0].status == "ran"
+    assert run_pipeline(tasks)[0].status == "skipped"
+    assert run_pipeline(tasks, force=True)[0].status == "ran"
+
+    # A newer input makes the output stale
+    os.utime(str(source), (time.time() + 10, time.time() + 10))
+    assert run_pipeline(tasks)[0].status == "ran"
+
+
+def test_failed_task_blocks_dependents_only(tmpdir):
+    log = []
+    raw, clean = str(tmpdir.join("raw.txt")), str(tmpdir.join("clean.txt"))
+
+    def fail(task, options):
+        raise ConnectionError("offline")
+
+    tasks = [Task("fetch", fail, [], [raw]), write_task("clean", [raw], [clean], log),
+             write_task("other", [], [str(tmpdir.join("other.txt"))], log)]
+
+    results = run_pipeline(tasks)
+
+    assert [result.status for result in results] == ["failed", "blocked", "ran"]
+    assert isinstance(results[0].error, ConnectionError)
+    assert "ConnectionError: offline" in format_timings(results, 0.1)
+
+
+def test_default_file_tasks(tmpdir):
+    tasks = [task for task in default_tasks(str(tmpdir)) if task.name not in ("task1", "task2")]
+
+    results = run_pipeline(tasks, state_file=str(tmpdir.join("state.json")))
+
+    assert [result.status for result in results] == ["ran"] * 4
+    assert tmpdir.join("parsed_weather_data.csv").check()
+    assert "Weather Summary:" in tmpdir.join("weather_analysis_report.txt").read_text("utf-8")
+    assert all(result.status == "skipped" for result in run_pipeline(tasks))
+
+
+def test_main_run_and_list(tmpdir, capsys):
+    assert main(["run", "task6", "--output-dir", str(tmpdir), "--no-cache"]) == 0
+    assert "task6    ran" in capsys.readouterr().out
+
+    assert main(["list"]) == 0
+    assert "task1: -" in capsys.readouterr().out
+
+
+if __name__ == "__main__":
+    pytest.main()
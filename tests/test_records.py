@@ -0,0 +1,206 @@
+"""
+Test suite for the compact daily weather records.
+"""
+import pytest
+import io
+import math
+import tracemalloc
+from src.records import DailyWeather, DailyWeatherBatch
+from src.task3_complex_weather_analysis import analyze_daily_weather, analyze_weather_columns, columns_to_analyses
+from src import task4_weather_summary_export as task4
+from src import task5_parse_weather_xml as task5
+from src import task6_extract_weather_data as task6
+from src.utils import load_json_batch, save_to_json
+
+
+@pytest.fixture
+def json_days(json_day):
+    def days(count):
+        return [json_day(f"{2000 + i // 365:04d}-01-{i % 28 + 1:02d}", 20.0 + i % 15 + 0.5,
+                         ("Sunny", "Cloudy", "Rain")[i % 3]) for i in range(count)]
+    return days
+
+
+def test_daily_weather_behaves_like_a_day_dictionary(json_day):
+    day = DailyWeather.from_dict(json_day("2024-08-18"))
+
+    assert day["max_temperature"] == 30.0
+    assert day.max_temperature == 30.0
+    assert "wind_speed" in day and "temperature" not in day
+    assert day.get("temperature", 0) == 0
+    with pytest.raises(KeyError):
+        day["temperature"]
+    assert day.to_dict() == json_day("2024-08-18")
+    # Code written for dictionaries accepts records
+    assert analyze_daily_weather(day) == analyze_daily_weather(json_day("2024-08-18"))
+
+
+def test_daily_weather_null_fields_behave_like_a_dictionary(json_day):
+    source = dict(json_day("2024-08-18"), wind_speed=None)
+    day = DailyWeather.from_dict(source)
+
+    assert day["wind_speed"] is None and "wind_speed" in day
+    assert day.get("wind_speed", 0) is None
+    with pytest.raises(KeyError):
+        day["temperature"]
+    assert day.to_dict() == source
+
+
+def test_daily_weather_has_no_instance_dict():
+    assert not hasattr(DailyWeather("2024-08-18"), "__dict__")
+
+
+def test_batch_round_trip(json_days):
+    days = json_days(100)
+
+    batch = DailyWeatherBatch.from_records(days)
+
+    assert len(batch) == 100
+    assert batch.fields == ("date", "max_temperature", "min_temperature", "precipitation",
+                            "wind_speed", "humidity", "weather_description")
+    assert batch.to_dicts() == days
+    assert [day.to_dict() for day in batch] == days
+    assert batch[-1].to_dict() == days[-1]
+    assert batch.column("humidity").typecode == 'q'
+    assert batch.column("max_temperature").typecode == 'd'
+
+
+def test_batch_keeps_integers_until_a_float_arrives():
+    batch = DailyWeatherBatch(("date", "humidity"))
+    batch.append({"date": "2024-08-18", "humidity": 60})
+    batch.append({"date": "2024-08-19", "humidity": 61.5})
+
+    assert batch.to_numpy("humidity").dtype.kind == "f"
+    # Values that arrived as integers are read back as integers
+    assert batch.column("humidity") == [60, 61.5]
+    assert [type(day["humidity"]) for day in batch] == [int, float]
+
+
+def test_batch_keeps_integral_floats_of_float_columns():
+    batch = DailyWeatherBatch.from_records([{"date": "2024-08-18", "humidity": 60.0},
+                                            {"date": "2024-08-19", "humidity": 61.5}])
+
+    assert batch.column("humidity").tolist() == [60.0, 61.5]
+    assert type(batch[0]["humidity"]) is float
+
+
+def test_mixed_columns_export_like_days(json_day):
+    days = [json_day(f"2024-08-{i + 1:02d}") for i in range(6)]
+    for i, day in enumerate(days):
+        day["humidity"] = 60 if i % 2 else 60.5
+        day["max_temperature"] = (29.5, 30.0, 31)[i % 3]
+    batch = DailyWeatherBatch.from_records(iter(days[:3])).extend(days[3:])
+
+    from_days, from_batch = io.StringIO(), io.StringIO()
+    task4.export_to_csv(days, from_days)
+    task4.export_to_csv(batch, from_batch)
+    assert from_batch.getvalue() == from_days.getvalue()
+    assert batch.to_dicts() == days
+    assert [type(day["max_temperature"]) for day in batch] == [type(day["max_temperature"]) for day in days]
+    # The mixed columns survive a round trip through the binary buffers
+    layout, buffers = batch.to_buffers()
+    buffers = {field: bytes(buffer) for field, buffer in buffers.items()}
+    assert DailyWeatherBatch.from_buffers(layout, buffers).to_dicts() == days
+
+
+def test_batch_keeps_null_values(json_day):
+    days = [json_day("2024-08-18"), dict(json_day("2024-08-19"), humidity=None, wind_speed=None),
+            json_day("2024-08-20")]
+    batch = DailyWeatherBatch.from_records(days)
+
+    assert batch.to_dicts() == days
+    assert batch[1]["humidity"] is None and "humidity" in batch[1]
+    assert [day.to_dict() for day in batch] == days
+    assert math.isnan(batch.to_numpy("humidity")[1])
+    layout, buffers = batch.to_buffers()
+    buffers = {field: bytes(buffer) for field, buffer in buffers.items()}
+    assert DailyWeatherBatch.from_buffers(layout, buffers).to_dicts() == days
+
+
+def test_batch_rejects_bad_days_without_partial_writes(json_day):
+    batch = DailyWeatherBatch.from_records([json_day("2024-08-18")])
+
+    with pytest.raises(ValueError):
+        batch.append(json_day("2024-8-19"))
+    with pytest.raises(KeyError):
+        batch.append({"date": "2024-08-19"})
+    with pytest.raises(ValueError):
+        DailyWeatherBatch(("max_temperature",))
+
+    assert len(batch) == 1
+    assert len(batch.column("max_temperature")) == 1
+
+
+def test_batch_to_numpy(json_days):
+    batch = DailyWeatherBatch.from_records(json_days(10))
+
+    assert batch.to_numpy("date").tolist() == batch.column("date")
+    assert batch.to_numpy("weather_description").tolist() == batch.column("weather_description")
+    assert batch.to_numpy("max_temperature").tolist() == batch.column("max_temperature").tolist()
+
+
+def test_batch_uses_five_times_less_memory(json_days):
+    days_count = 20_000
+
+    tracemalloc.start()
+    try:
+        days = json_days(days_count)
+        dict_bytes = tracemalloc.get_traced_memory()[0]
+        del days
+        tracemalloc.reset_peak()
+        start = tracemalloc.get_traced_memory()[0]
+        batch = DailyWeatherBatch.from_records(json_days(days_count))
+        # The per-day dictionaries passed in were freed chunk by chunk
+        batch_bytes = tracemalloc.get_traced_memory()[0] - start
+    finally:
+        tracemalloc.stop()
+
+    assert len(batch) == days_count
+    assert dict_bytes >= 5 * batch_bytes
+
+
+def test_analyzers_and_exporters_accept_batches(json_days):
+    days = json_days(1000)
+    batch = DailyWeatherBatch.from_records(days)
+
+    assert task4.summarize_weather_data(batch) == task4.summarize_weather_data(days)
+    assert columns_to_analyses(analyze_weather_columns(batch)) == columns_to_analyses(analyze_weather_columns(days))
+
+    from_days, from_batch = io.StringIO(), io.StringIO()
+    task4.export_to_csv(days, from_days)
+    task4.export_to_csv(batch, from_batch)
+    assert from_batch.getvalue() == from_days.getvalue()
+
+
+def test_parsers_produce_batches(tmpdir):
+    xml_file = tmpdir.join("weather.xml")
+    xml_file.write("<weather>\n"
+                   "<day><date>2024-08-18</date><temperature>32.9</temperature>"
+                   "<humidity>65</humidity><precipitation>0.0</precipitation></day>\n"
+                   "</weather>\n")
+    text_file = tmpdir.join("weather.txt")
+    text_file.write("Date: 2024-08-18, Max Temp: 32.9°C, Min Temp: 22.5°C, Humidity: 65%, Precipitation: 0.0mm\n")
+
+    xml_batch = task5.parse_weather_xml_batch(str(xml_file))
+    text_batch = task6.extract_weather_batch(str(text_file))
+
+    assert xml_batch.to_dicts() == task5.parse_weather_xml(str(xml_file))
+    assert text_batch.to_dicts() == task6.extract_weather_data(str(text_file))
+
+    # Batches are written exactly like the dictionaries they replace
+    for module, batch, days in ((task5, xml_batch, task5.parse_weather_xml(str(xml_file))),
+                                (task6, text_batch, task6.extract_weather_data(str(text_file)))):
+        module.save_to_csv(batch, str(tmpdir.join("batch.csv")))
+        module.save_to_csv(days, str(tmpdir.join("days.csv")))
+        assert tmpdir.join("batch.csv").read() == tmpdir.join("days.csv").read()
+
+
+def test_load_json_batch(tmpdir, json_days):
+    json_file = str(tmpdir.join("weather.json"))
+    save_to_json({"city": "Tokyo", "daily": json_days(50), "source": "test"}, json_file)
+
+    data = load_json_batch(json_file)
+
+    assert data["city"] == "Tokyo"
+    assert data["source"] == "test"
+    assert data["daily"].to_dicts() == json_days(50)
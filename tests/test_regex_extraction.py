@@ -1,6 +1,7 @@
 import pytest
 from io import StringIO
-from src.task6_extract_weather_data import extract_weather_data, save_to_csv  # Import your functions
+from src.task6_extract_weather_data import (extract_weather_data, extract_weather_data_parallel, iter_weather_records,
+                                            clean_text, save_to_csv)  # Import your functions
 
 
 def create_sample_text():
@@ -60,3 +61,42 @@ def test_save_to_csv(tmpdir):
     assert lines[0].strip() == "Date,Max Temperature,Min Temperature,Humidity,Precipitation"
     assert lines[1].strip() == "2024-08-18,32.9,22.5,65,0.0"
     assert lines[2].strip() == "2024-08-19,30.5,21.8,70,1.2"
+
+
+def test_clean_text():
+    assert clean_text("Max\u00a0Temp: 32.9°C\n") == "Max Temp: 32.9C"
+
+
+@pytest.mark.parametrize("use_mmap", [True, False])
+def test_iter_weather_records(tmpdir, use_mmap):
+    text_path = tmpdir.join("weather_report.txt")
+    text_path.write_text(create_sample_text() + "Not a record\nDate: 2024-08-20, Max\u00a0Temp: 28.0°C, "
+                         "Min Temp: 20.0°C, Humidity: 80%, Precipitation: 10.0mm\n", encoding="utf-8")
+
+    records = iter_weather_records(str(text_path), use_mmap=use_mmap)
+
+    assert not isinstance(records, list)
+    assert list(records) == extract_weather_data(str(text_path))
+    assert len(extract_weather_data(str(text_path))) == 3
+
+
+def test_iter_weather_records_empty_file(tmpdir):
+    text_path = tmpdir.join("empty.txt")
+    text_path.write("")
+
+    assert list(iter_weather_records(str(text_path))) == []
+
+
+def test_extract_weather_data_parallel(tmpdir):
+    # Lines out of date order, so the merge has to sort them
+    lines = [
+        f"Date: 2024-{month:02d}-{day:02d}, Max Temp: {day}.5°C, Min Temp: 1.0°C, Humidity: {day}%, Precipitation: 0.0mm\n"
+        for month in (3, 1, 2) for day in range(1, 29)
+    ]
+    text_path = tmpdir.join("large_report.txt")
+    text_path.write_text("".join(lines), encoding="utf-8")
+
+    extracted_data = extract_weather_data_parallel(str(text_path), workers=2)
+
+    assert extracted_data == sorted(extract_weather_data(str(text_path)), key=lambda day: day["date"])
+    assert len(extracted_data) == 84
@@ -1,8 +1,13 @@
 import pytest
 import requests
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from bs4 import BeautifulSoup
 import json
-from src.task1_scrape import fetch_wikipedia_page, extract_title, extract_first_sentence
+from src.task1_scrape import (fetch_wikipedia_page, fetch_wikipedia_pages, scrape_wikipedia_pages,
+                              extract_title, extract_first_sentence, extract_page_fields)
+from src.http_client import HostRateLimiter
 from src.utils import save_to_json
 
 
@@ -67,5 +72,113 @@ def test_save_to_json(tmpdir):
     assert saved_data == data
 
 
+def test_extract_first_sentence_prefers_article_body():
+    html = ('<html><body><p>Site notice.</p><div class="mw-parser-output"><p class="mw-empty-elt"></p>'
+            '<p>Web scraping is data scraping.[1] It is widely used.</p></div></body></html>')
+    soup = BeautifulSoup(html, 'html.parser')
+
+    assert extract_first_sentence(soup) == "Web scraping is data scraping."
+
+
+@pytest.mark.parametrize("html", [
+    '<html><body><h1 id="firstHeading">Web scraping</h1><p>Web scraping is the process. It is used.</p></body></html>',
+    '<html><body><p>Only a paragraph &amp; no title. Second.</p></body></html>',
+    '<html><body><p>Outside.</p><div class="mw-parser-output"><div><p></p><p>Nested <b>bold</b>.[2] Next.</p></div>'
+    '</div><h1 id="firstHeading"><span>Late</span> title</h1></body></html>',
+    '<html><body><div class="mw-parser-output"><p><style>.x{}</style>Styled text. More.</p></div></body></html>',
+    '<html><body><div class="mw-parser-output"></div><p>After the body. Text.</p></body></html>',
+])
+def test_extract_page_fields_matches_soup(html):
+    soup = BeautifulSoup(html, 'html.parser')
+
+    assert extract_page_fields(html) == {
+        "title": extract_title(soup),
+        "first_sentence": extract_first_sentence(soup),
+    }
+
+
+class StubWikipediaHandler(BaseHTTPRequestHandler):
+    """Serve a tiny article per path; paths starting with /flaky fail once with 503."""
+    failed_once = set()
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with self.lock:
+            fail = self.path.startswith("/flaky") and self.path not in self.failed_once
+            self.failed_once.add(self.path)
+        if fail:
+            self.send_response(503)
+            self.end_headers()
+            return
+        if self.path == "/missing":
+            self.send_response(404)
+            self.end_headers()
+            return
+        name = self.path.strip("/")
+        body = (f'<html><body><h1 id="firstHeading">{name}</h1>'
+                f'<div class="mw-parser-output"><p>{name} is an article. More text.</p></div></body></html>')
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.end_headers()
+        self.wfile.write(body.encode("utf-8"))
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubWikipediaHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_fetch_wikipedia_pages(stub_server):
+    urls = [f"{stub_server}/Page{i}" for i in range(20)]
+
+    pages = dict(fetch_wikipedia_pages(urls, max_workers=4, requests_per_second=0))
+
+    assert set(pages) == set(urls)
+    assert '<h1 id="firstHeading">Page7</h1>' in pages[f"{stub_server}/Page7"]
+
+
+def test_fetch_wikipedia_pages_retries(stub_server):
+    urls = [f"{stub_server}/flaky{i}" for i in range(3)]
+
+    pages = dict(fetch_wikipedia_pages(urls, requests_per_second=0, backoff=0.01))
+
+    assert len(pages) == 3
+
+
+def test_fetch_wikipedia_pages_raises_on_http_error(stub_server):
+    with pytest.raises(requests.HTTPError):
+        list(fetch_wikipedia_pages([f"{stub_server}/missing"], requests_per_second=0, retries=0))
+
+
+def test_scrape_wikipedia_pages(stub_server):
+    results = list(scrape_wikipedia_pages([f"{stub_server}/Web_scraping"], requests_per_second=0))
+
+    assert results == [{
+        "url": f"{stub_server}/Web_scraping",
+        "title": "Web_scraping",
+        "first_sentence": "Web_scraping is an article.",
+    }]
+
+
+def test_host_rate_limiter():
+    limiter = HostRateLimiter(requests_per_second=20)
+
+    start = time.monotonic()
+    for _ in range(5):
+        limiter.wait("http://example.org/a")
+    elapsed = time.monotonic() - start
+
+    # Five requests at 20/s need at least four 50 ms intervals
+    assert elapsed >= 0.19
+
+
 if __name__ == "__main__":
     pytest.main()
@@ -3,7 +3,9 @@ Test suite for common utility functions in src/utils.py
 """
 import pytest
 import json
-from src.utils import load_json, save_to_json
+from src.utils import load_json, load_json_stream, save_to_json, split_file_ranges, get_json_backend, JSON_BACKENDS
+from src.task3_complex_weather_analysis import analyze_daily_weather
+from src.task4_weather_summary_export import summarize_weather_data
 
 
 def test_save_to_json(tmpdir):
@@ -76,5 +78,153 @@ def test_save_to_json_io_error(tmpdir):
         save_to_json({"test": "data"}, str(invalid_path))
 
 
+def installed_backends():
+    """Return the JSON backends that can be used in this environment."""
+    backends = []
+    for backend in JSON_BACKENDS:
+        try:
+            get_json_backend(backend)
+        except ImportError:
+            continue
+        backends.append(backend)
+    return backends
+
+
+@pytest.mark.parametrize("backend", installed_backends())
+@pytest.mark.parametrize("pretty", [False, True])
+def test_json_backend_round_trip(tmpdir, backend, pretty):
+    """Test that every installed backend writes files any backend can read."""
+    data = {"city": "Tokyo", "daily": [{"date": "2024-08-18", "max_temperature": 32.5, "note": "32°C"}]}
+    temp_file = tmpdir.join("round_trip.json")
+
+    save_to_json(data, str(temp_file), pretty=pretty, backend=backend)
+
+    content = temp_file.read_text(encoding="utf-8")
+    assert ("\n" in content) == pretty
+    assert "32°C" in content
+    for reader in installed_backends():
+        assert load_json(str(temp_file), backend=reader) == data
+
+
+@pytest.mark.parametrize("backend", installed_backends())
+def test_json_backend_invalid_json(tmpdir, backend):
+    """Test that every backend reports invalid JSON as JSONDecodeError."""
+    temp_file = tmpdir.join("invalid.json")
+    temp_file.write("{invalid json content")
+
+    with pytest.raises(json.JSONDecodeError):
+        load_json(str(temp_file), backend=backend)
+
+
+def test_get_json_backend(monkeypatch):
+    """Test backend selection through the argument and the environment variable."""
+    assert get_json_backend("json") == "json"
+    monkeypatch.setenv("MLDS_JSON_BACKEND", "json")
+    assert get_json_backend() == "json"
+    with pytest.raises(ValueError):
+        get_json_backend("yaml")
+
+
+def create_weather_document(days=50):
+    """Build a tokyo_weather_complex.json-shaped document."""
+    return {
+        "city": "Tokyo",
+        "latitude": 35.6895,
+        "longitude": 139.6917,
+        "timezone": "Asia/Tokyo",
+        "daily": [
+            {
+                "date": f"2024-08-{i % 28 + 1:02d}",
+                "max_temperature": 25.0 + i % 10,
+                "min_temperature": 18.5,
+                "precipitation": float(i % 3),
+                "wind_speed": 10.0 + i % 8,
+                "humidity": 60 + i % 20,
+                "weather_description": "Clear sky ☀",
+            }
+            for i in range(days)
+        ],
+    }
+
+
+def test_load_json_stream(tmpdir):
+    """Test that header fields are available up front and days are streamed lazily."""
+    document = create_weather_document()
+    temp_file = tmpdir.join("weather.json")
+    save_to_json(document, str(temp_file))
+
+    data = load_json_stream(str(temp_file))
+
+    assert data["city"] == "Tokyo"
+    assert data["latitude"] == 35.6895
+    assert data["timezone"] == "Asia/Tokyo"
+    assert not isinstance(data["daily"], list)
+    assert list(data["daily"]) == document["daily"]
+
+
+def test_load_json_stream_small_chunks(tmpdir):
+    """Test values that straddle chunk boundaries, including multi-byte characters and numbers."""
+    document = create_weather_document(days=5)
+    document["station_height"] = 40.125
+    temp_file = tmpdir.join("weather.json")
+    save_to_json(document, str(temp_file))
+
+    data = load_json_stream(str(temp_file), chunk_size=3)
+    days = list(data["daily"])
+
+    assert days == document["daily"]
+    # Fields after the array become available once the stream is exhausted
+    assert data["station_height"] == 40.125
+
+
+def test_load_json_stream_feeds_analysis(tmpdir):
+    """Test that the analysis and summary functions consume the stream directly."""
+    document = create_weather_document()
+    temp_file = tmpdir.join("weather.json")
+    save_to_json(document, str(temp_file))
+
+    analyses = [analyze_daily_weather(day) for day in load_json_stream(str(temp_file))["daily"]]
+    summary = summarize_weather_data(load_json_stream(str(temp_file))["daily"])
+
+    assert analyses == [analyze_daily_weather(day) for day in document["daily"]]
+    assert summary == summarize_weather_data(document["daily"])
+
+
+def test_load_json_stream_invalid_json(tmpdir):
+    """Test that malformed documents raise JSONDecodeError."""
+    temp_file = tmpdir.join("invalid.json")
+    temp_file.write('{"city": "Tokyo", "daily": [{"date": "2024-08-18"} {"date": "2024-08-19"}]}')
+
+    data = load_json_stream(str(temp_file))
+    with pytest.raises(json.JSONDecodeError):
+        list(data["daily"])
+
+    with pytest.raises(FileNotFoundError):
+        load_json_stream("nonexistent_file.json")
+
+
+@pytest.mark.parametrize("boundary", [b"\n", b"</day>"])
+@pytest.mark.parametrize("parts", [1, 3, 16, 500])
+def test_split_file_ranges(tmpdir, boundary, parts):
+    """Test that ranges cover the file exactly and only end on record boundaries."""
+    content = b"<weather>" + b"".join(b"<day>%d</day>\n" % i for i in range(200)) + b"</weather>"
+    temp_file = tmpdir.join("records.xml")
+    temp_file.write_binary(content)
+
+    ranges = split_file_ranges(str(temp_file), parts, boundary)
+
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(content)
+    assert all(end == next_start for (_, end), (next_start, _) in zip(ranges, ranges[1:]))
+    assert all(content[:end].endswith(boundary) for _, end in ranges[:-1])
+    assert len(ranges) <= parts
+
+
+def test_split_file_ranges_empty_file(tmpdir):
+    temp_file = tmpdir.join("empty.txt")
+    temp_file.write("")
+
+    assert split_file_ranges(str(temp_file), 4) == []
+
+
 if __name__ == "__main__":
     pytest.main()
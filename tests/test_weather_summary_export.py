@@ -1,8 +1,11 @@
 import pytest
 import json
 import csv
+import gzip
+import tracemalloc
 from io import StringIO
-from src.task4_weather_summary_export import summarize_weather_data, export_to_csv
+import statistics
+from src.task4_weather_summary_export import summarize_weather_data, export_to_csv, WeatherSummaryAggregator
 from src.utils import load_json
 
 
@@ -113,6 +116,134 @@ def test_export_to_csv():
     assert rows[0]["Is Rainy Day"] == "False"
 
 
+def generate_days(count):
+    """Yield ``count`` synthetic days without materializing them."""
+    for i in range(count):
+        yield {
+            "date": f"2024-08-{i % 28 + 1:02d}",
+            "max_temperature": 25.0 + i % 10,
+            "min_temperature": 20.0,
+            "precipitation": float(i % 2),
+            "wind_speed": 10.0 + i % 10,
+            "humidity": 65,
+            "weather_description": "Clear sky",
+        }
+
+
+def test_export_to_csv_from_generator_in_batches():
+    mock_file = StringIO()
+
+    export_to_csv(generate_days(25), mock_file, buffer_size=10)
+
+    mock_file.seek(0)
+    rows = list(csv.DictReader(mock_file))
+    assert len(rows) == 25
+    assert rows[-1]["Date"] == "2024-08-25"
+    assert rows[9]["Is Hot Day"] == "True"
+
+
+def test_export_to_csv_constant_memory(tmpdir):
+    temp_file = tmpdir.join("large_summary.csv")
+
+    tracemalloc.start()
+    export_to_csv(generate_days(50000), str(temp_file), buffer_size=100)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # 50K rows held in a list would need well over 10 MB
+    assert peak < 3 * 1024 * 1024
+    assert len(temp_file.readlines()) == 50001
+
+
+def test_export_to_csv_gzip(tmpdir):
+    temp_file = tmpdir.join("summary.csv.gz")
+
+    export_to_csv(generate_days(3), str(temp_file))
+
+    with gzip.open(str(temp_file), 'rt', encoding='utf-8', newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert [row["Date"] for row in rows] == ["2024-08-01", "2024-08-02", "2024-08-03"]
+
+
+def test_export_to_csv_zstd(tmpdir):
+    zstandard = pytest.importorskip("zstandard")
+    temp_file = tmpdir.join("summary.csv.zst")
+
+    export_to_csv(generate_days(3), str(temp_file))
+
+    with zstandard.open(str(temp_file), 'rt', encoding='utf-8', newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 3
+
+
+def test_aggregator_matches_summarize_weather_data():
+    days = list(generate_days(100))
+
+    aggregator = WeatherSummaryAggregator()
+    for day in days:
+        aggregator.update(day)
+
+    assert aggregator.count == 100
+    assert aggregator.result() == summarize_weather_data(days)
+
+
+def test_aggregator_statistics():
+    days = list(generate_days(50))
+    temperatures = [day["max_temperature"] for day in days]
+
+    stats = WeatherSummaryAggregator().update(days[0]).statistics()
+    assert stats["max_temperature"]["variance"] == 0.0
+
+    aggregator = WeatherSummaryAggregator()
+    for day in days:
+        aggregator.update(day)
+    stats = aggregator.statistics()["max_temperature"]
+
+    assert stats["min"] == min(temperatures)
+    assert stats["max"] == max(temperatures)
+    assert stats["variance"] == pytest.approx(statistics.variance(temperatures))
+    assert stats["std"] == pytest.approx(statistics.stdev(temperatures))
+
+
+def test_aggregator_merge_partial_results():
+    days = list(generate_days(101))
+
+    # Partial aggregators, as built by parallel workers over chunks of days
+    merged = WeatherSummaryAggregator()
+    for start in range(0, len(days), 30):
+        partial = WeatherSummaryAggregator()
+        for day in days[start:start + 30]:
+            partial.update(day)
+        merged.merge(partial)
+    merged.merge(WeatherSummaryAggregator())
+
+    expected = WeatherSummaryAggregator()
+    for day in days:
+        expected.update(day)
+
+    assert merged.count == 101
+    assert merged.result() == pytest.approx(expected.result())
+    assert merged.statistics()["wind_speed"]["variance"] == pytest.approx(
+        expected.statistics()["wind_speed"]["variance"])
+
+
+def test_aggregator_update_many_matches_update():
+    days = list(generate_days(250))
+
+    single = WeatherSummaryAggregator()
+    for day in days:
+        single.update(day)
+    batched = WeatherSummaryAggregator().update_many(iter(days), batch_size=64)
+
+    assert batched.result() == pytest.approx(single.result())
+    for field, stats in batched.statistics().items():
+        assert stats == pytest.approx(single.statistics()[field])
+
+
+def test_aggregator_merge_rejects_different_thresholds():
+    with pytest.raises(ValueError):
+        WeatherSummaryAggregator(temp_threshold=30).merge(WeatherSummaryAggregator(temp_threshold=25))
+
 
 if __name__ == "__main__":
     pytest.main()
@@ -3,7 +3,7 @@ from xml.etree.ElementTree import Element, SubElement, tostring
 from xml.etree.ElementTree import ElementTree
 import os
 from io import StringIO
-from src.task5_parse_weather_xml import parse_weather_xml, save_to_csv  # Import your functions
+from src.task5_parse_weather_xml import parse_weather_xml, parse_weather_xml_parallel, iter_weather_xml, save_to_csv  # Import your functions
 
 
 def create_sample_xml():
@@ -74,3 +74,48 @@ def test_save_to_csv(tmpdir):
     assert lines[0].strip() == "Date,Temperature,Humidity,Precipitation"
     assert lines[1].strip() == "2024-08-18,32.9,65,0.0"
     assert lines[2].strip() == "2024-08-19,30.5,70,1.2"
+
+
+def test_iter_weather_xml(tmpdir):
+    # Write the sample XML to disk
+    xml_path = tmpdir.join("weather.xml")
+    xml_path.write(create_sample_xml())
+
+    # The generator yields the same records as the list-based parser
+    days = iter_weather_xml(str(xml_path))
+    assert not isinstance(days, list)
+    assert next(days) == {"date": "2024-08-18", "temperature": 32.9, "humidity": 65, "precipitation": 0.0}
+    assert list(days) == [{"date": "2024-08-19", "temperature": 30.5, "humidity": 70, "precipitation": 1.2}]
+
+
+def test_save_to_csv_from_iterator(tmpdir):
+    xml_path = tmpdir.join("weather.xml")
+    xml_path.write(create_sample_xml())
+    temp_csv_file = tmpdir.join("streamed_weather_data.csv")
+
+    # The CSV writer consumes the generator directly
+    save_to_csv(iter_weather_xml(str(xml_path)), filename=str(temp_csv_file))
+
+    with open(temp_csv_file, 'r') as file:
+        lines = file.readlines()
+
+    assert len(lines) == 3
+    assert lines[1].strip() == "2024-08-18,32.9,65,0.0"
+    assert lines[2].strip() == "2024-08-19,30.5,70,1.2"
+
+
+def test_parse_weather_xml_parallel(tmpdir):
+    # Write days out of order, with a declaration and a comment between records
+    days = "".join(
+        f"<day><date>2024-{month:02d}-{day:02d}</date><temperature>{day}.5</temperature>"
+        f"<humidity>{day}</humidity><precipitation>0.{day % 10}</precipitation></day>\n<!-- note -->\n"
+        for month in (3, 1, 2) for day in range(1, 29)
+    )
+    xml_path = tmpdir.join("large_weather.xml")
+    xml_path.write('<?xml version="1.0" encoding="UTF-8"?>\n<weather>\n' + days + "</weather>\n")
+
+    parsed_data = parse_weather_xml_parallel(str(xml_path), workers=2)
+
+    assert parsed_data == sorted(parse_weather_xml(str(xml_path)), key=lambda day: day["date"])
+    assert len(parsed_data) == 84
+    assert parsed_data[0]["date"] == "2024-01-01"